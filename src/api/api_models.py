@@ -1,4 +1,5 @@
 from enum import Enum
+from datetime import date
 from typing import Optional
 from pydantic import BaseModel
 
@@ -20,6 +21,22 @@ class Model(Enum):
     RandomWinnerModel: str = 'RandomWinnerModel'
     RandomForestModel: str = 'RandomForestModel'
     RandomForestModel_tuned: str = 'RandomForestModel_tuned'
+    HistGradientBoostingModel: str = 'HistGradientBoostingModel'
+    HistGradientBoostingModel_tuned: str = 'HistGradientBoostingModel_tuned'
+
+class ResponseFormat(Enum):
+    json: str = 'json'
+    ndjson: str = 'ndjson'
+    arrow: str = 'arrow'
+
+class TimeControl(Enum):
+    classic: str = 'classic'
+    rapid: str = 'rapid'
+
+class TournamentType(Enum):
+    knockout: str = 'knockout'
+    swiss: str = 'swiss'
+    round_robin: str = 'round_robin'
 
 class Params(BaseModel):
     n_epochs: int = 100
@@ -29,22 +46,60 @@ class Params(BaseModel):
     min_samples_split: Optional[int] = 2
     min_samples_leaf: Optional[int] = 1
 
+class BoostingParams(BaseModel):
+    learning_rate: float = 0.1
+    max_iter: int = 200
+    max_leaf_nodes: Optional[int] = 31
+    max_depth: Optional[int]
+    min_samples_leaf: int = 20
+    l2_regularization: float = 0.0
+    early_stopping: bool = True
+
 class TrainModelsRequest(BaseModel):
     data_path: str
+    compact: bool = False
+    time_features: bool = False
     models: list[Model]
     params: Params
+    boosting_params: BoostingParams = BoostingParams()
 
 class TuneModelsRequest(BaseModel):
     data_path: str
+    compact: bool = False
+    time_features: bool = False
     models: list[Model]
 
 class EvaluateModelsRequest(BaseModel):
     data_path: str
+    compact: bool = False
+    time_features: bool = False
     models: list[Model]
     metrics: list[Metric]
     output_file: Optional[str] = f'{OUTPUT_DIR}/evaluations.xlsx'
+    response_format: ResponseFormat = 'json'
 
 class PredictModelsRequest(BaseModel):
     data_path: str
+    compact: bool = False
+    time_features: bool = False
     models: list[Model]
-    save_to_files: bool
\ No newline at end of file
+    save_to_files: bool
+    compact_files: bool = False
+    probabilities: bool = False
+    response_format: ResponseFormat = 'json'
+
+class Game(BaseModel):
+    white: str
+    black: str
+    time_control: TimeControl
+    tournament_type: Optional[TournamentType] = 'swiss'
+    tour: int
+    num_tours: int
+    date: date
+    start_date: date
+    end_date: date
+
+class PredictGamesRequest(BaseModel):
+    model: Model
+    games: list[Game]
+    probabilities: bool = False
\ No newline at end of file
@@ -1,83 +1,150 @@
 import os
 import json
-import uvicorn
-from fastapi import FastAPI, Body
+from fastapi import FastAPI, Body, Request
+from fastapi.responses import PlainTextResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
 
-from preprocessing.data_pipeline import process_data
+from configs.constants import PREDICTION_BATCH_SIZE, PREDICTION_BATCH_DELAY_SECONDS
 
-from models.baseline_models.white_wins import WhiteWinsModel
-from models.baseline_models.black_wins import BlackWinsModel
-from models.baseline_models.draw import DrawModel
-from models.baseline_models.random_winner import RandomWinnerModel
+from api.api_models import TrainModelsRequest, TuneModelsRequest, \
+                            EvaluateModelsRequest, PredictModelsRequest, PredictGamesRequest
+from api.batching import MicroBatcher
+from api.readiness import Warmup, DEFERRED_MODULES
+from api.jobs import job_queue
+from utils.error_codes import NoModelsFoundException, JobNotFoundException, JobNotFinishedException
+from utils.instrumentation import configure_logging, render_metrics, stage
 
-from models.advanced_models.random_forest import RandomForestModel
+app = FastAPI()
+batcher = MicroBatcher(PREDICTION_BATCH_SIZE, PREDICTION_BATCH_DELAY_SECONDS)
+warmup = Warmup(DEFERRED_MODULES)
 
-from models.operations.saving import save_models, save_evaluations_to_excel, save_predictions_to_jsons
-from models.operations.loading import load_models
-from models.operations.training import train_models
-from models.operations.tuning import tune_models
-from models.operations.evaluation import evaluate_models
-from models.operations.predicting import predict_models
+@app.exception_handler(JobNotFoundException)
+def job_not_found_handler(request: Request, exception: JobNotFoundException) -> JSONResponse:
+    return JSONResponse({'detail': str(exception)}, status_code=404)
 
-from api.api_models import TrainModelsRequest, TuneModelsRequest, \
-                            EvaluateModelsRequest, PredictModelsRequest
+@app.exception_handler(JobNotFinishedException)
+def job_not_finished_handler(request: Request, exception: JobNotFinishedException) -> JSONResponse:
+    return JSONResponse({'detail': str(exception)}, status_code=409)
 
-app = FastAPI()
+@app.on_event('startup')
+def warm_models() -> None:
+    configure_logging()
+    warmup.start()
 
-@app.post('/train-models')
+@app.on_event('startup')
+def start_job_queue() -> None:
+    job_queue.start()
+
+@app.on_event('shutdown')
+def stop_job_queue() -> None:
+    job_queue.stop()
+
+@app.post('/train-models', response_model = dict)
 def train_models_endpoint(request: TrainModelsRequest = Body(...)):
     request_data = json.loads(request.json())
-    baseline_models = []
-    advanced_models = []
-    if 'WhiteWinsModel' in request_data['models']:
-        baseline_models.append(WhiteWinsModel())
-    if 'BlackWinsModel' in request_data['models']:
-        baseline_models.append(BlackWinsModel())
-    if 'DrawModel' in request_data['models']:
-        baseline_models.append(DrawModel())
-    if 'RandomWinnerModel' in request_data['models']:
-        baseline_models.append(RandomWinnerModel())
-
-    if 'RandomForestModel' in request_data['models']:
-        baseline_models.append(RandomForestModel(**request_data['params']))
-
-    models = baseline_models + advanced_models
-
-    X, y = process_data(request.data_path)
-    train_models(models, X, y)
-    save_models(models)
-
-@app.post('/tune-models')
+    job_id = job_queue.submit('train', request_data)
+    return {'job_id': job_id}
+
+@app.post('/tune-models', response_model = dict)
 def tune_models_endpoint(request: TuneModelsRequest = Body(...)):
     request_data = json.loads(request.json())
-    models = load_models(request_data['models'])
-    X, y = process_data(request_data['data_path'])
-    tuned_models = tune_models(models, X, y)
-    save_models(tuned_models)
+    job_id = job_queue.submit('tune', request_data)
+    return {'job_id': job_id}
+
+@app.get('/jobs/{job_id}', response_model = dict)
+def get_job_endpoint(job_id: str):
+    return job_queue.get(job_id)
+
+@app.get('/jobs/{job_id}/result', response_model = dict)
+def get_job_result_endpoint(job_id: str):
+    return job_queue.get_result(job_id)
+
+@app.post('/jobs/{job_id}/cancel', response_model = dict)
+def cancel_job_endpoint(job_id: str):
+    return job_queue.cancel(job_id)
 
 @app.post('/evaluate-models', response_model = list[dict])
 def evaluate_models_endpoint(request: EvaluateModelsRequest = Body(...)):
+    from preprocessing.data_pipeline import process_data
+    from models.operations.loading import load_models
+    from models.operations.evaluation import evaluate_models
+    from models.operations.saving import save_evaluations_to_excel
+    from api.streaming import stream_frame
     request_data = json.loads(request.json())
     models = load_models(request_data['models'])
-    X, y = process_data(request_data['data_path'])
+    X, y = process_data(request_data['data_path'], compact=request_data['compact'], time_features=request_data['time_features'],
+                        fit_time_features=False)
     evaluations = evaluate_models(models, X, y, request_data['metrics'])
     if request_data['output_file'] is not None:
         save_evaluations_to_excel(evaluations, request_data['output_file'])
+    if request_data['response_format'] != 'json':
+        return stream_frame(evaluations.reset_index(), request_data['response_format'])
     evaluations = evaluations.reset_index().to_dict(orient='records')
     return evaluations
 
 @app.post('/predict-models', response_model = list[dict])
 def predict_models_endpoint(request: PredictModelsRequest = Body(...)):
+    import pandas as pd
+    from preprocessing.data_pipeline import process_data, process_game_ids
+    from models.model_classes import ADVANCED_MODELS
+    from models.operations.loading import load_models
+    from models.operations.predicting import predict_models, get_labels
+    from models.operations.saving import save_predictions_to_jsons
+    from api.streaming import stream_frame
     request_data = json.loads(request.json())
     models = load_models(request_data['models'])
-    X, _ = process_data(request_data['data_path'])
-    predictions = predict_models(models, X)
-    if request_data['save_to_files'] and len(models) == 1 and isinstance(models[0], RandomForestModel):
-        save_predictions_to_jsons(predictions, request_data['data_path'])
+    X, _ = process_data(request_data['data_path'], compact=request_data['compact'], time_features=request_data['time_features'],
+                        fit_time_features=False)
+    predictions = predict_models(models, X, request_data['probabilities'])
+    if request_data['save_to_files'] and len(models) == 1 and models[0].__class__.__name__ in ADVANCED_MODELS:
+        labels = get_labels(predictions, models) if request_data['probabilities'] else predictions
+        save_predictions_to_jsons(labels, request_data['data_path'], request_data['compact_files'])
+    if request_data['response_format'] != 'json':
+        predictions = pd.concat([process_game_ids(request_data['data_path']), predictions.reset_index(drop=True)], axis=1)
+        return stream_frame(predictions, request_data['response_format'])
     predictions = predictions.to_dict(orient='records')
     return predictions
 
+@app.post('/predict-games', response_model = list[float] | list[dict[str, float]])
+async def predict_games_endpoint(request: PredictGamesRequest = Body(...)):
+    import pandas as pd
+    from preprocessing.game_features import get_feature_builder
+    from postprocessing.data_pipeline import process_data as postprocess_data, OUTCOME_NAMES
+    from models.operations.loading import registry
+    request_data = json.loads(request.json())
+    model = await run_in_threadpool(registry.get, request_data['model'])
+    if model is None:
+        raise NoModelsFoundException
+    feature_builder = get_feature_builder(getattr(model, 'feature_names', []))
+    with stage('predict_games', model=model.name) as current:
+        X = feature_builder.build(request_data['games'])
+        if request_data['probabilities']:
+            proba = await batcher.predict(model, X, 'predict_proba_array')
+        else:
+            y_hat = await batcher.predict(model, X)
+        current.rows = X.shape[0]
+    if request_data['probabilities']:
+        df_proba = pd.DataFrame(proba, columns=model.classes).reindex(columns=list(OUTCOME_NAMES), fill_value=0.0)
+        return df_proba.rename(columns=OUTCOME_NAMES).to_dict(orient='records')
+    predictions = postprocess_data(pd.Series(y_hat)).tolist()
+    return predictions
+
+@app.get('/ready', response_model = dict)
+def ready_endpoint():
+    status = warmup.status()
+    return JSONResponse(status, status_code=200 if status['ready'] else 503)
+
+@app.get('/metrics', response_class = PlainTextResponse)
+def metrics_endpoint():
+    return render_metrics()
+
 if __name__ == "__main__":
     host = os.getenv('HOST', '0.0.0.0')
     port = int(os.getenv('PORT', 8000))
-    uvicorn.run(app, host=host, port=port)
\ No newline at end of file
+    workers = int(os.getenv('WORKERS', 1))
+    import uvicorn
+    from configs.paths import NAME_INDEX_PATH
+    from utils.name_mapping import get_name_index
+    if os.path.isfile(NAME_INDEX_PATH):
+        get_name_index()
+    uvicorn.run('api.app:app', host=host, port=port, workers=workers)
\ No newline at end of file
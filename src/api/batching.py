@@ -0,0 +1,49 @@
+from __future__ import annotations
+import asyncio
+import numpy as np
+from typing import Callable, TYPE_CHECKING
+from starlette.concurrency import run_in_threadpool
+
+if TYPE_CHECKING:
+    from models.base_model import BaseModel
+
+class MicroBatcher:
+    def __init__(self, max_batch_size: int, max_delay: float) -> None:
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: dict[tuple[int, str], tuple[BaseModel, list[tuple[np.ndarray, asyncio.Future]], asyncio.TimerHandle]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def predict(self, model: BaseModel, X: np.ndarray, method: str = 'predict_array') -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (id(model), method)
+        if key not in self._pending:
+            self._pending[key] = (model, [], loop.call_later(self.max_delay, self._flush, key))
+        requests = self._pending[key][1]
+        requests.append((X, future))
+        if sum(X_request.shape[0] for X_request, _ in requests) >= self.max_batch_size:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: tuple[int, str]) -> None:
+        if key not in self._pending:
+            return
+        model, requests, timer = self._pending.pop(key)
+        timer.cancel()
+        task = asyncio.ensure_future(self._predict_batch(getattr(model, key[1]), requests))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _predict_batch(self, predict: Callable[[np.ndarray], np.ndarray], requests: list[tuple[np.ndarray, asyncio.Future]]) -> None:
+        try:
+            y_hat = await run_in_threadpool(predict, np.vstack([X for X, _ in requests]))
+        except Exception as e:
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        offsets = np.cumsum([X.shape[0] for X, _ in requests])[:-1]
+        for (_, future), y_hat_request in zip(requests, np.split(y_hat, offsets)):
+            if not future.done():
+                future.set_result(y_hat_request)
@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import uuid
+import signal
+import sqlite3
+import traceback
+import multiprocessing
+from threading import Thread, Event
+from typing import Optional
+
+from configs.paths import JOBS_DB_PATH
+from configs.constants import JOB_LIMITS, JOB_POLL_SECONDS, JOB_PROGRESS_SECONDS
+from utils.instrumentation import configure_logging, get_stats
+from utils.error_codes import JobNotFoundException, JobNotFinishedException
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FINISHED = 'finished'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+JOB_COLUMNS = ['id', 'kind', 'status', 'request', 'progress', 'result', 'error', 'pid', 'created_at', 'started_at', 'finished_at',
+               'process', 'owner']
+BOOT_ID_PATH = '/proc/sys/kernel/random/boot_id'
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    connection.execute('PRAGMA journal_mode=WAL')
+    return connection
+
+def _update_job(db_path: str, job_id: str, **values) -> None:
+    assignments = ', '.join(f'{column} = ?' for column in values)
+    with _connect(db_path) as connection:
+        connection.execute(f'UPDATE jobs SET {assignments} WHERE id = ?', [*values.values(), job_id])
+
+def _finish_job(db_path: str, job_id: str, **values) -> None:
+    assignments = ', '.join(f'{column} = ?' for column in values)
+    with _connect(db_path) as connection:
+        connection.execute(f'UPDATE jobs SET {assignments} WHERE id = ? AND status = ?', [*values.values(), job_id, RUNNING])
+
+def _report_progress(db_path: str, job_id: str):
+    last_update = 0.0
+    def callback(desc: str, n: int, total: Optional[int]) -> None:
+        nonlocal last_update
+        if time.monotonic() - last_update < JOB_PROGRESS_SECONDS and n != total:
+            return
+        last_update = time.monotonic()
+        _update_job(db_path, job_id, progress=json.dumps({'desc': desc, 'n': n, 'total': total}))
+    return callback
+
+def _run_job(db_path: str, job_id: str, kind: str, request: str) -> None:
+    os.setsid()
+    from api.tasks import TASKS
+    from utils.progress import set_progress_callback
+    configure_logging()
+    set_progress_callback(_report_progress(db_path, job_id))
+    try:
+        result = TASKS[kind](json.loads(request))
+        result['stages'] = get_stats()
+        _finish_job(db_path, job_id, status=FINISHED, result=json.dumps(result), finished_at=time.time())
+    except Exception:
+        _finish_job(db_path, job_id, status=FAILED, error=traceback.format_exc(), finished_at=time.time())
+
+def _get_process_identity(pid: int) -> Optional[str]:
+    try:
+        with open(BOOT_ID_PATH, 'r', encoding='utf-8') as f:
+            boot_id = f.read().strip()
+        with open(f'/proc/{pid}/stat', 'r', encoding='utf-8') as f:
+            start_time = f.read().rsplit(')', 1)[1].split()[19]
+    except OSError:
+        return None
+    return f'{pid}:{boot_id}:{start_time}'
+
+def _is_alive(identity: Optional[str]) -> bool:
+    return identity is not None and _get_process_identity(int(identity.split(':', 1)[0])) == identity
+
+def _terminate(pid: int) -> None:
+    try:
+        os.killpg(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+class JobQueue:
+    def __init__(self, db_path: str, limits: dict[str, int], poll_seconds: float) -> None:
+        self.db_path = db_path
+        self.limits = limits
+        self.poll_seconds = poll_seconds
+        self._context = multiprocessing.get_context('spawn')
+        self._processes: dict[str, multiprocessing.Process] = {}
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def _initialize(self) -> None:
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with _connect(self.db_path) as connection:
+            connection.execute(f'CREATE TABLE IF NOT EXISTS jobs ({", ".join(JOB_COLUMNS)}, PRIMARY KEY (id))')
+            existing = {row[1] for row in connection.execute('PRAGMA table_info(jobs)').fetchall()}
+            for column in JOB_COLUMNS:
+                if column not in existing:
+                    connection.execute(f'ALTER TABLE jobs ADD COLUMN {column}')
+
+    def submit(self, kind: str, request_data: dict) -> str:
+        self._initialize()
+        job_id = uuid.uuid4().hex
+        with _connect(self.db_path) as connection:
+            connection.execute('INSERT INTO jobs (id, kind, status, request, created_at) VALUES (?, ?, ?, ?, ?)',
+                               [job_id, kind, QUEUED, json.dumps(request_data), time.time()])
+        self.dispatch()
+        return job_id
+
+    def get(self, job_id: str) -> dict:
+        self._initialize()
+        with _connect(self.db_path) as connection:
+            row = connection.execute(f'SELECT {", ".join(JOB_COLUMNS)} FROM jobs WHERE id = ?', [job_id]).fetchone()
+        if row is None:
+            raise JobNotFoundException
+        job = dict(zip(JOB_COLUMNS, row))
+        for column in ['request', 'progress', 'result']:
+            job[column] = json.loads(job[column]) if job[column] is not None else None
+        return job
+
+    def get_result(self, job_id: str) -> dict:
+        job = self.get(job_id)
+        if job['status'] not in [FINISHED, FAILED, CANCELLED]:
+            raise JobNotFinishedException
+        return {'status': job['status'], 'result': job['result'], 'error': job['error']}
+
+    def cancel(self, job_id: str) -> dict:
+        self.get(job_id)
+        with _connect(self.db_path) as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            status, pid, process = connection.execute('SELECT status, pid, process FROM jobs WHERE id = ?', [job_id]).fetchone()
+            if status in [QUEUED, RUNNING]:
+                connection.execute('UPDATE jobs SET status = ?, finished_at = ? WHERE id = ?', [CANCELLED, time.time(), job_id])
+            connection.execute('COMMIT')
+        if status == RUNNING and _is_alive(process):
+            _terminate(pid)
+        return self.get(job_id)
+
+    def _reap(self, connection: sqlite3.Connection) -> None:
+        for job_id, process in list(self._processes.items()):
+            if not process.is_alive():
+                process.join()
+                del self._processes[job_id]
+        jobs = connection.execute('SELECT id, pid, process, owner FROM jobs WHERE status = ?', [RUNNING]).fetchall()
+        for job_id, pid, process, owner in jobs:
+            if job_id in self._processes or _is_alive(process) or (pid is None and _is_alive(owner)):
+                continue
+            connection.execute('UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?',
+                               [FAILED, 'Job process exited unexpectedly', time.time(), job_id])
+
+    def _claim(self, connection: sqlite3.Connection) -> list[tuple[str, str, str]]:
+        claimed = []
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            running = dict(connection.execute('SELECT kind, COUNT(*) FROM jobs WHERE status = ? GROUP BY kind', [RUNNING]).fetchall())
+            queued = connection.execute('SELECT id, kind, request FROM jobs WHERE status = ? ORDER BY created_at', [QUEUED]).fetchall()
+            for job_id, kind, request in queued:
+                if running.get(kind, 0) >= self.limits.get(kind, 1):
+                    continue
+                running[kind] = running.get(kind, 0) + 1
+                connection.execute('UPDATE jobs SET status = ?, started_at = ?, owner = ? WHERE id = ?',
+                                   [RUNNING, time.time(), _get_process_identity(os.getpid()), job_id])
+                claimed.append((job_id, kind, request))
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return claimed
+
+    def dispatch(self) -> None:
+        self._initialize()
+        with _connect(self.db_path) as connection:
+            self._reap(connection)
+            for job_id, kind, request in self._claim(connection):
+                process = self._context.Process(target=_run_job, args=(self.db_path, job_id, kind, request))
+                process.start()
+                self._processes[job_id] = process
+                connection.execute('BEGIN IMMEDIATE')
+                connection.execute('UPDATE jobs SET pid = ?, process = ? WHERE id = ?', [process.pid, _get_process_identity(process.pid), job_id])
+                status, = connection.execute('SELECT status FROM jobs WHERE id = ?', [job_id]).fetchone()
+                connection.execute('COMMIT')
+                if status == CANCELLED:
+                    _terminate(process.pid)
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            self.dispatch()
+
+    def start(self) -> None:
+        self._initialize()
+        with _connect(self.db_path) as connection:
+            self._reap(connection)
+        self._stop.clear()
+        self._thread = Thread(target=self._poll, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+job_queue = JobQueue(JOBS_DB_PATH, JOB_LIMITS, JOB_POLL_SECONDS)
@@ -0,0 +1,44 @@
+import os
+import importlib
+import traceback
+from threading import Thread
+from typing import Optional
+
+DEFERRED_MODULES = [
+    'preprocessing.data_pipeline',
+    'postprocessing.data_pipeline',
+    'tournaments.data_cleaning',
+    'models.operations.saving',
+    'models.operations.evaluation',
+    'models.operations.predicting',
+    'api.streaming',
+]
+
+class Warmup:
+    def __init__(self, modules: list[str]) -> None:
+        self.modules = modules
+        self.ready = False
+        self.models: list[str] = []
+        self.error: Optional[str] = None
+        self._thread: Optional[Thread] = None
+
+    def _run(self) -> None:
+        try:
+            from models.operations.loading import registry
+            from preprocessing.game_features import get_feature_builder
+            models = registry.warm()
+            for model_name in models:
+                get_feature_builder(getattr(registry.get(model_name), 'feature_names', []))
+            for module in self.modules:
+                importlib.import_module(module)
+            self.models = models
+            self.ready = True
+        except Exception:
+            self.error = traceback.format_exc()
+
+    def start(self) -> None:
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def status(self) -> dict:
+        return {'ready': self.ready, 'pid': os.getpid(), 'models': self.models, 'error': self.error}
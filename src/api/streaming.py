@@ -0,0 +1,47 @@
+import io
+import pandas as pd
+import pyarrow as pa
+from typing import Iterator
+from fastapi.responses import StreamingResponse
+
+from configs.constants import STREAMING_CHUNK_SIZE
+
+MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+class _ChunkSink(io.RawIOBase):
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def iter_ndjson(df: pd.DataFrame, chunk_size: int = STREAMING_CHUNK_SIZE) -> Iterator[bytes]:
+    for start in range(0, df.shape[0], chunk_size):
+        lines = df.iloc[start:start + chunk_size].to_json(orient='records', lines=True, force_ascii=False)
+        yield lines.rstrip('\n').encode('utf-8') + b'\n'
+
+def iter_arrow(df: pd.DataFrame, chunk_size: int = STREAMING_CHUNK_SIZE) -> Iterator[bytes]:
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        yield sink.pop()
+        for start in range(0, df.shape[0], chunk_size):
+            writer.write_batch(pa.RecordBatch.from_pandas(df.iloc[start:start + chunk_size], schema=schema, preserve_index=False))
+            yield sink.pop()
+    yield sink.pop()
+
+def stream_frame(df: pd.DataFrame, response_format: str) -> StreamingResponse:
+    iterator = iter_arrow(df) if response_format == 'arrow' else iter_ndjson(df)
+    return StreamingResponse(iterator, media_type=MEDIA_TYPES[response_format])
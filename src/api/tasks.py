@@ -0,0 +1,31 @@
+from preprocessing.data_pipeline import process_data
+
+from models.model_classes import create_models
+from models.operations.saving import save_models
+from models.operations.loading import load_models
+from models.operations.training import train_models
+from models.operations.tuning import tune_models
+
+def train_task(request_data: dict) -> dict:
+    params = {
+        'RandomForestModel': request_data['params'],
+        'HistGradientBoostingModel': request_data['boosting_params'],
+    }
+    models = create_models(request_data['models'], params)
+
+    X, y = process_data(request_data['data_path'], compact=request_data['compact'], time_features=request_data['time_features'])
+    train_models(models, X, y)
+    paths = save_models(models)
+    return {'models': paths}
+
+def tune_task(request_data: dict) -> dict:
+    models = load_models(request_data['models'])
+    X, y = process_data(request_data['data_path'], compact=request_data['compact'], time_features=request_data['time_features'])
+    tuned_models = tune_models(models, X, y)
+    paths = save_models(tuned_models)
+    return {'models': paths}
+
+TASKS = {
+    'train': train_task,
+    'tune': tune_task,
+}
@@ -0,0 +1,30 @@
+import sys
+import json
+import argparse
+import pandas as pd
+
+def load_results(path: str) -> pd.DataFrame:
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    df = pd.DataFrame(report['results']).drop_duplicates('stage', keep='last').set_index('stage')
+    return df['seconds'].rename(report['commit'] or path)
+
+def compare(baseline_path: str, candidate_path: str, threshold: float) -> pd.DataFrame:
+    baseline = load_results(baseline_path)
+    candidate = load_results(candidate_path)
+    df = pd.concat([baseline.rename('baseline_seconds'), candidate.rename('candidate_seconds')], axis=1)
+    df['ratio'] = df['candidate_seconds'] / df['baseline_seconds']
+    df['regression'] = df['ratio'] > threshold
+    return df
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('baseline', type=str, help='Results JSON of the baseline commit')
+    argparser.add_argument('candidate', type=str, help='Results JSON of the candidate commit')
+    argparser.add_argument('--threshold', type=float, default=1.2, help='Slowdown ratio reported as a regression')
+
+    args = argparser.parse_args()
+
+    df = compare(args.baseline, args.candidate, args.threshold)
+    print(df.to_string(float_format='{:.3f}'.format))
+    sys.exit(1 if df['regression'].any() else 0)
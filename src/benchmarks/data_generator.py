@@ -0,0 +1,119 @@
+import os
+import json
+import pinyin
+import argparse
+import numpy as np
+import pandas as pd
+
+from configs.constants import RANDOM_SEED
+
+SURNAMES = '王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈姚卢姜崔钟谭陆汪范金石廖贾夏韦付方白邹孟熊秦邱江尹薛闫段雷侯龙史陶黎贺顾毛郝龚邵万钱严覃武戴莫孔向汤'
+GIVEN_NAMES = '伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华玉兰辉鹏宇浩凯晨欣怡嘉琪雪梅丹婷俊峰建国志红亚光辰妮叶珍爵慧倩景晶'
+ACCENTS = {'a': 'á', 'e': 'é', 'i': 'í', 'o': 'ó', 'u': 'ü'}
+TOURS_KNOCKOUT = (3, 7)
+TOURS_SWISS = (5, 12)
+
+def _to_pinyin_name(cjk_name: str) -> str:
+    surname = pinyin.get(cjk_name[0], format='strip').capitalize()
+    given_name = pinyin.get(cjk_name[1:], format='strip', delimiter='').capitalize()
+    return f'{surname}, {given_name}'
+
+def _add_accent(name: str, rng: np.random.Generator) -> str:
+    positions = [i for i, c in enumerate(name) if c in ACCENTS]
+    if not positions:
+        return name
+    i = positions[rng.integers(0, len(positions))]
+    return name[:i] + ACCENTS[name[i]] + name[i + 1:]
+
+def generate_players(n_players: int, rng: np.random.Generator) -> pd.DataFrame:
+    surnames = rng.choice(list(SURNAMES), n_players)
+    given_lengths = rng.integers(1, 3, n_players)
+    given_names = [''.join(rng.choice(list(GIVEN_NAMES), length)) for length in given_lengths]
+    cjk_names = [surname + given_name for surname, given_name in zip(surnames, given_names)]
+    df = pd.DataFrame({
+        'cjk_name': cjk_names,
+        'pinyin_name': [_to_pinyin_name(name) for name in cjk_names],
+        'rating': np.clip(rng.normal(2000, 250, n_players), 1000, 2850).round().astype(int),
+    })
+    df['accented_name'] = [_add_accent(name, rng) for name in df['pinyin_name']]
+    return df
+
+def _get_result(white_rating: int, black_rating: int, rng: np.random.Generator) -> float:
+    expected = 1 / (1 + 10 ** ((black_rating - white_rating) / 400))
+    draw = 0.35 * (1 - abs(2 * expected - 1))
+    return float(rng.choice([1.0, 0.5, 0.0], p=[expected * (1 - draw), draw, (1 - expected) * (1 - draw)]))
+
+def generate_tournament(name: str, players: pd.DataFrame, with_results: bool, rng: np.random.Generator) -> dict:
+    is_knockout = rng.random() < 0.2
+    num_tours = int(rng.integers(*TOURS_KNOCKOUT)) if is_knockout else int(rng.integers(*TOURS_SWISS))
+    num_players = 2 ** num_tours if is_knockout else int(rng.integers(4, 11)) * 2
+    num_players = min(num_players, players.shape[0] - players.shape[0] % 2)
+    start_date = pd.Timestamp('2014-01-01') + pd.Timedelta(days=int(rng.integers(0, 2500)))
+    duration = num_tours + int(rng.integers(0, 4))
+    name_column = rng.choice(['cjk_name', 'pinyin_name', 'accented_name'], p=[0.6, 0.25, 0.15])
+
+    participants = players.iloc[rng.choice(players.shape[0], num_players, replace=False)]
+    entrants = list(zip(participants[name_column], participants['rating']))
+    games, game_id = {}, 1
+    for tour_id in range(1, num_tours + 1):
+        order = rng.permutation(len(entrants))
+        entrants = [entrants[i] for i in order]
+        date = (start_date + pd.Timedelta(days=min(tour_id - 1, duration - 1))).strftime('%Y-%m-%d')
+        tour_games, winners = [], []
+        for (white, white_rating), (black, black_rating) in zip(entrants[0::2], entrants[1::2]):
+            game = {'white': white, 'black': black, 'date': date}
+            result = _get_result(white_rating, black_rating, rng)
+            if with_results:
+                game['result'] = result
+            game['id'] = f'{name}_{game_id}'
+            tour_games.append(game)
+            winners.append((white, white_rating) if result >= 0.5 else (black, black_rating))
+            game_id += 1
+        games[f'tour_{tour_id}'] = tour_games
+        if is_knockout:
+            entrants = winners
+
+    tournament = {
+        'name': name,
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': (start_date + pd.Timedelta(days=duration - 1)).strftime('%Y-%m-%d'),
+        'games': games,
+        'tours': num_tours,
+        'time_control': str(rng.choice(['classic', 'rapid'])),
+    }
+    return tournament
+
+def _write_tournaments(path: str, prefix: str, n_tournaments: int, players: pd.DataFrame, with_results: bool, rng: np.random.Generator) -> None:
+    os.makedirs(path, exist_ok=True)
+    for i in range(n_tournaments):
+        name = f'{prefix}_{i}'
+        tournament = generate_tournament(name, players, with_results, rng)
+        with open(f'{path}/{name}.json', 'w', encoding='utf-8') as f:
+            json.dump(tournament, f, indent=4, ensure_ascii=False)
+
+def _write_ratings(path: str, players: pd.DataFrame, n_ratings: int, drift: float, rng: np.random.Generator) -> None:
+    rated = players.iloc[rng.choice(players.shape[0], min(n_ratings, players.shape[0]), replace=False)]
+    ratings = (rated['rating'] + rng.normal(0, drift, rated.shape[0])).round().astype(int)
+    df = pd.DataFrame({'name': rated['pinyin_name'], 'rating': ratings}).sort_values('rating', ascending=False)
+    df.to_csv(path, sep='\t', header=False, index=False)
+
+def generate_dataset(data_path: str, n_train: int, n_test: int, n_players: int, n_ratings: int, seed: int = RANDOM_SEED) -> None:
+    rng = np.random.default_rng(seed)
+    players = generate_players(n_players, rng)
+    _write_tournaments(f'{data_path}/train', 'tournament', n_train, players, True, rng)
+    _write_tournaments(f'{data_path}/test', 'tournament_test', n_test, players, False, rng)
+    _write_ratings(f'{data_path}/rating_2014.txt', players, n_ratings, 0, rng)
+    _write_ratings(f'{data_path}/rating_2020.txt', players, n_ratings, 50, rng)
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--data-path', type=str, required=True, help='Directory the train and test tournaments and rating files are written to')
+    argparser.add_argument('--n-train', type=int, default=1_000, help='Number of training tournaments')
+    argparser.add_argument('--n-test', type=int, default=100, help='Number of testing tournaments')
+    argparser.add_argument('--n-players', type=int, default=5_000, help='Number of distinct players')
+    argparser.add_argument('--n-ratings', type=int, default=2_000, help='Number of players in each rating file')
+    argparser.add_argument('--seed', type=int, default=RANDOM_SEED, help='Random seed')
+
+    args = argparser.parse_args()
+
+    generate_dataset(args.data_path, args.n_train, args.n_test, args.n_players, args.n_ratings, args.seed)
@@ -0,0 +1,47 @@
+import time
+import argparse
+import pandas as pd
+
+from configs.paths import TRAIN_DATA_PATH, TRAIN_DATASET_PATH
+from tournaments.data_cleaning import get_all_tournament_data
+from tournaments.dataset import DATASET_SCHEME, list_dataset_files
+
+def _time_call(function, *args) -> tuple[float, pd.DataFrame]:
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+def benchmark(data_path: str, dataset_path: str, year: int, tournament_ids: list[int], repeats: int) -> pd.DataFrame:
+    uri = f'{DATASET_SCHEME}://{dataset_path}'
+    sources = {
+        'json': data_path,
+        'dataset': uri,
+        'dataset_classic': f'{uri}?time_control=classic',
+        'dataset_year': f'{uri}?date_from={year}-01-01&date_to={year}-12-31',
+        'dataset_year_classic': f'{uri}?date_from={year}-01-01&date_to={year}-12-31&time_control=classic',
+        'dataset_tournaments': f"{uri}?tournament_id={','.join(map(str, tournament_ids))}",
+    }
+    results = []
+    for name, source in sources.items():
+        timings = [_time_call(get_all_tournament_data, source, True) for _ in range(repeats)]
+        seconds, df = min(timings, key=lambda timing: timing[0])
+        results.append({
+            'source': name,
+            'files': len(list_dataset_files(source)) if source != data_path else None,
+            'games': df.shape[0],
+            'seconds': seconds,
+            'games_per_second': df.shape[0] / seconds,
+        })
+    return pd.DataFrame(results)
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--data-path', type=str, default=TRAIN_DATA_PATH, help='Directory of tournament JSON files')
+    argparser.add_argument('--dataset-path', type=str, default=TRAIN_DATASET_PATH, help='Dataset written from it by tools/import_dataset.py')
+    argparser.add_argument('--year', type=int, default=2019, help='Year of the date range filter')
+    argparser.add_argument('--tournament-ids', type=int, nargs='+', default=[1, 2, 3, 4, 5], help='Tournament ids of the id filter')
+    argparser.add_argument('--repeats', type=int, default=3, help='Number of timed loads per source (the fastest is reported)')
+
+    args = argparser.parse_args()
+
+    print(benchmark(args.data_path, args.dataset_path, args.year, args.tournament_ids, args.repeats).to_string(index=False))
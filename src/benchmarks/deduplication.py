@@ -0,0 +1,80 @@
+import time
+import pinyin
+import argparse
+import numpy as np
+import pandas as pd
+
+from configs.constants import RANDOM_SEED
+from benchmarks.data_generator import generate_players
+from utils.deduplication import find_duplicates
+from utils.name_mapping import get_name_key, get_match_key
+
+def _add_typo(name: str, rng: np.random.Generator) -> str:
+    surname, given_name = name.split(', ')
+    i = int(rng.integers(0, len(given_name)))
+    kind = rng.integers(0, 3)
+    if kind == 0:
+        given_name = given_name[:i] + chr(ord('a') + int(rng.integers(0, 26))) + given_name[i + 1:]
+    elif kind == 1 and len(given_name) > 2:
+        given_name = given_name[:i] + given_name[i + 1:]
+    elif i + 1 < len(given_name):
+        given_name = given_name[:i] + given_name[i + 1] + given_name[i] + given_name[i + 2:]
+    return f'{surname}, {given_name}'
+
+def generate_names(n_players: int, typo_rate: float) -> pd.DataFrame:
+    rng = np.random.default_rng(RANDOM_SEED)
+    df_players = generate_players(n_players, rng).drop_duplicates('cjk_name').reset_index(drop=True)
+    variants = []
+    for player, (cjk_name, pinyin_name) in enumerate(zip(df_players['cjk_name'], df_players['pinyin_name'])):
+        surname, given_name = pinyin_name.split(', ')
+        spaced = pinyin.get(cjk_name[1:], format='strip', delimiter=' ').title()
+        names = [pinyin_name, f'{surname} {given_name}', f'{surname} {spaced}', f'{given_name} {surname}', cjk_name]
+        if rng.random() < typo_rate:
+            names.append(_add_typo(pinyin_name, rng))
+        variants += [(name, player) for name in names]
+    return pd.DataFrame(variants, columns=['name', 'player']).drop_duplicates('name').reset_index(drop=True)
+
+def _count_pairs(counts: pd.Series) -> int:
+    return int((counts * (counts - 1) // 2).sum())
+
+def score_clusters(labels: np.ndarray, players: np.ndarray) -> dict[str, float]:
+    df = pd.DataFrame({'label': labels, 'player': players})
+    true_positives = _count_pairs(df.groupby(['label', 'player']).size())
+    predicted = _count_pairs(df.groupby('label').size())
+    actual = _count_pairs(df.groupby('player').size())
+    return {
+        'clusters': df['label'].nunique(),
+        'precision': true_positives / predicted if predicted else 1.0,
+        'recall': true_positives / actual if actual else 1.0,
+    }
+
+def benchmark(n_players: int, typo_rate: float, thresholds: list[float], n_jobs: int) -> pd.DataFrame:
+    df = generate_names(n_players, typo_rate)
+    names, players = df['name'].tolist(), df['player'].to_numpy()
+    results = []
+
+    start = time.perf_counter()
+    labels = pd.factorize(pd.Series([get_name_key(name) for name in names]))[0]
+    results.append({'method': 'name_key', 'seconds': time.perf_counter() - start, **score_clusters(labels, players)})
+
+    for threshold in thresholds:
+        start = time.perf_counter()
+        labels = find_duplicates([get_match_key(name) for name in names], threshold, n_jobs)
+        results.append({'method': f'match_key_{threshold}' if threshold >= 1 else f'minhash_{threshold}', 'seconds': time.perf_counter() - start, **score_clusters(labels, players)})
+
+    df_results = pd.DataFrame(results)
+    df_results.insert(1, 'names', len(names))
+    df_results.insert(2, 'players', df['player'].nunique())
+    df_results['names_per_second'] = len(names) / df_results['seconds']
+    return df_results
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--n-players', type=int, default=200_000, help='Number of synthetic players (each is written in up to 6 ways)')
+    argparser.add_argument('--typo-rate', type=float, default=0.3, help='Share of players with an additional misspelled name')
+    argparser.add_argument('--thresholds', type=float, nargs='+', default=[1.0, 0.95, 0.9], help='Similarity thresholds of the MinHash deduplication')
+    argparser.add_argument('--n-jobs', type=int, default=None, help='Number of worker processes (default: all cores)')
+
+    args = argparser.parse_args()
+
+    print(benchmark(args.n_players, args.typo_rate, args.thresholds, args.n_jobs).to_string(index=False))
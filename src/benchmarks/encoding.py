@@ -0,0 +1,96 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from configs.constants import RANDOM_SEED
+from preprocessing.encoding import PLAYER_COLUMNS, get_player_codes, get_sparse_feature_names, to_sparse
+from models.advanced_models.random_forest import RandomForestModel
+
+NUMERIC_COLUMNS = [
+    'is_classic', 'is_knockout',
+    'tour_completion', 'tournament_completion',
+    'white_score_2014', 'white_score_2020',
+    'black_score_2014', 'black_score_2020'
+]
+
+def generate_feature_frame(n_games: int, n_players: int, seed: int = RANDOM_SEED) -> tuple[pd.DataFrame, pd.Series, list[str]]:
+    rng = np.random.default_rng(seed)
+    vocabulary = [f'player_{i}' for i in range(n_players)]
+    df = pd.DataFrame({
+        'is_classic': rng.integers(0, 2, n_games),
+        'is_knockout': rng.integers(0, 2, n_games),
+        'tour_completion': rng.random(n_games),
+        'tournament_completion': rng.random(n_games),
+        'white_score_2014': rng.integers(1000, 2900, n_games),
+        'white_score_2020': rng.integers(1000, 2900, n_games),
+        'black_score_2014': rng.integers(1000, 2900, n_games),
+        'black_score_2020': rng.integers(1000, 2900, n_games),
+    })
+    for column in PLAYER_COLUMNS:
+        df[column] = np.array(vocabulary, dtype=object)[rng.integers(0, n_players, n_games)]
+    y = pd.Series(rng.choice([-1, 0, 1], n_games), name='result')
+    return df, y, vocabulary
+
+def _get_nbytes(X: np.ndarray | sparse.csr_matrix) -> int:
+    if sparse.issparse(X):
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    return X.nbytes
+
+def _encode_one_hot(df: pd.DataFrame, vocabulary: list[str]) -> np.ndarray:
+    return pd.get_dummies(df).to_numpy(dtype=np.float32)
+
+def _encode_sparse(df: pd.DataFrame, vocabulary: list[str]) -> sparse.csr_matrix:
+    df_codes = df.copy()
+    for column in PLAYER_COLUMNS:
+        df_codes[column] = get_player_codes(df_codes[column], vocabulary)
+    return to_sparse(df_codes, get_sparse_feature_names(df_codes, vocabulary), vocabulary)
+
+def _run(encoder, df: pd.DataFrame, y: pd.Series, vocabulary: list[str], n_epochs: int, batch_size: int) -> dict[str, float]:
+    start = time.perf_counter()
+    X = encoder(df, vocabulary)
+    encode_seconds = time.perf_counter() - start
+
+    model = RandomForestModel(n_epochs=n_epochs, batch_size=batch_size)
+    start = time.perf_counter()
+    model.fit_array(X, y.to_numpy())
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model.predict_array(X)
+    predict_seconds = time.perf_counter() - start
+    return {
+        'features': X.shape[1],
+        'matrix_mb': _get_nbytes(X) / 2 ** 20,
+        'encode_seconds': encode_seconds,
+        'fit_seconds': fit_seconds,
+        'predict_seconds': predict_seconds,
+    }
+
+def benchmark(n_games: int, player_counts: list[int], n_epochs: int, batch_size: int, max_dense_mb: float) -> pd.DataFrame:
+    results = []
+    for n_players in player_counts:
+        df, y, vocabulary = generate_feature_frame(n_games, n_players)
+        dense_mb = n_games * (len(NUMERIC_COLUMNS) + 2 * n_players) * 4 / 2 ** 20
+        encoders = {'sparse': _encode_sparse}
+        if dense_mb <= max_dense_mb:
+            encoders['one_hot'] = _encode_one_hot
+        else:
+            results.append({'players': n_players, 'encoding': 'one_hot', 'matrix_mb': dense_mb})
+        for encoding, encoder in encoders.items():
+            results.append({'players': n_players, 'encoding': encoding, **_run(encoder, df, y, vocabulary, n_epochs, batch_size)})
+    df_results = pd.DataFrame(results).sort_values(['players', 'encoding'])
+    return df_results
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--n-games', type=int, default=20_000, help='Number of synthetic games')
+    argparser.add_argument('--players', type=int, nargs='+', default=[1_000, 10_000, 20_000], help='Numbers of distinct players to benchmark')
+    argparser.add_argument('--n-epochs', type=int, default=2, help='Number of random forest epochs')
+    argparser.add_argument('--batch-size', type=int, default=1024, help='Random forest batch size')
+    argparser.add_argument('--max-dense-mb', type=float, default=2048, help='Skip the one-hot run when its dense matrix would be larger (only its size is reported)')
+
+    args = argparser.parse_args()
+
+    print(benchmark(args.n_games, args.players, args.n_epochs, args.batch_size, args.max_dense_mb).to_string(index=False))
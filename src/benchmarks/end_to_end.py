@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import subprocess
+import numpy as np
+from typing import Callable, Optional
+from datetime import datetime as dt
+
+METRICS = ['accuracy', 'recall_macro', 'f1_macro']
+BASELINE_MODELS = ['WhiteWinsModel', 'BlackWinsModel', 'DrawModel', 'RandomWinnerModel']
+
+def _get_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+def _time(results: list[dict], stage: str, function: Callable, *args, **kwargs):
+    from utils.instrumentation import count_rows
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    results.append({'stage': stage, 'seconds': time.perf_counter() - start, 'rows': count_rows(result)})
+    return result
+
+def _build_name_index() -> None:
+    from configs.paths import SCORES_PATHS, TRAIN_DATA_PATH, TEST_DATA_PATH, MODEL_DIR, NAME_INDEX_PATH
+    from utils.name_mapping import build_name_index
+    from tournaments.data_cleaning import get_all_tournament_data
+    from scores.data_cleaning import get_combined_scores
+
+    names = get_all_tournament_data(TRAIN_DATA_PATH, True).reindex(columns=['white', 'black']).stack().unique().tolist() \
+          + get_all_tournament_data(TEST_DATA_PATH, True).reindex(columns=['white', 'black']).stack().unique().tolist() \
+          + get_combined_scores(SCORES_PATHS).index.tolist()
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    build_name_index(names).save(NAME_INDEX_PATH)
+
+def run_pipeline(results: list[dict], n_epochs: int, batch_size: int) -> None:
+    from configs.paths import TRAIN_DATA_PATH, TEST_DATA_PATH
+    from preprocessing.data_pipeline import process_data
+    from models.baseline_models.white_wins import WhiteWinsModel
+    from models.baseline_models.black_wins import BlackWinsModel
+    from models.baseline_models.draw import DrawModel
+    from models.baseline_models.random_winner import RandomWinnerModel
+    from models.advanced_models.random_forest import RandomForestModel
+    from models.operations.training import train_models
+    from models.operations.evaluation import evaluate_models
+    from models.operations.predicting import predict_models
+    from models.operations.saving import save_models, save_predictions_to_jsons
+    from models.operations.loading import load_models
+
+    _time(results, 'build_name_index', _build_name_index)
+    _time(results, 'process_data_uncached', process_data, TRAIN_DATA_PATH, use_cache=False)
+    _time(results, 'process_data_cold_cache', process_data, TRAIN_DATA_PATH)
+    X, y = _time(results, 'process_data_warm_cache', process_data, TRAIN_DATA_PATH)
+
+    models = [WhiteWinsModel(), BlackWinsModel(), DrawModel(), RandomWinnerModel(),
+              RandomForestModel(n_epochs=n_epochs, batch_size=batch_size)]
+    _time(results, 'train_models', train_models, models, X, y)
+    _time(results, 'save_models', save_models, models)
+    model_names = [model.name for model in models]
+    _time(results, 'load_models_cold', load_models, model_names)
+    loaded_models = _time(results, 'load_models_warm', load_models, model_names)
+
+    _time(results, 'evaluate_models', evaluate_models, models, X, y, METRICS)
+    _time(results, 'evaluate_models_cached', evaluate_models, models, X, y, METRICS)
+
+    X_test, _ = _time(results, 'process_data_test', process_data, TEST_DATA_PATH)
+    random_forest = [model for model in loaded_models if isinstance(model, RandomForestModel)]
+    predictions = _time(results, 'predict_models', predict_models, random_forest, X_test)
+    _time(results, 'save_predictions_to_jsons', save_predictions_to_jsons, predictions, TEST_DATA_PATH)
+
+def _request(results: list[dict], stage: str, function: Callable, *args, **kwargs):
+    start = time.perf_counter()
+    response = function(*args, **kwargs)
+    results.append({'stage': stage, 'seconds': time.perf_counter() - start, 'status': response.status_code})
+    return response
+
+def _wait_for_job(results: list[dict], stage: str, client, response, timeout: float) -> None:
+    start = time.perf_counter()
+    job_id = response.json()['job_id']
+    polls = []
+    while time.perf_counter() - start < timeout:
+        job = _request(polls, 'GET /jobs/{job_id}', client.get, f'/jobs/{job_id}').json()
+        if job['status'] not in ['queued', 'running']:
+            break
+        time.sleep(0.5)
+    results.append({'stage': stage, 'seconds': time.perf_counter() - start, 'status': job['status']})
+    results.append({'stage': 'GET /jobs/{job_id}', 'seconds': float(np.median([poll['seconds'] for poll in polls])), 'requests': len(polls)})
+
+def _get_games(n_games: int) -> list[dict]:
+    from configs.paths import TEST_DATA_PATH
+    from tournaments.data_cleaning import get_all_tournament_data
+
+    df = get_all_tournament_data(TEST_DATA_PATH, True).head(n_games)
+    games = [{
+        'white': row.white,
+        'black': row.black,
+        'time_control': row.time_control,
+        'tour': int(row.tour_id),
+        'num_tours': int(row.num_tours),
+        'date': row.date.strftime('%Y-%m-%d'),
+        'start_date': row.start_date.strftime('%Y-%m-%d'),
+        'end_date': row.end_date.strftime('%Y-%m-%d'),
+    } for row in df.itertuples()]
+    return games
+
+def run_api(results: list[dict], n_epochs: int, batch_size: int, n_requests: int, n_games: int, tune: bool, timeout: float) -> None:
+    from fastapi.testclient import TestClient
+    from configs.paths import TRAIN_DATA_PATH, TEST_DATA_PATH
+    from api.app import app
+
+    params = {'n_epochs': n_epochs, 'batch_size': batch_size}
+    with TestClient(app, raise_server_exceptions=False) as client:
+        response = _request(results, 'POST /train-models', client.post, '/train-models',
+                            json={'data_path': TRAIN_DATA_PATH, 'models': BASELINE_MODELS + ['RandomForestModel'], 'params': params})
+        _wait_for_job(results, 'POST /train-models (job)', client, response, timeout)
+        if tune:
+            response = _request(results, 'POST /tune-models', client.post, '/tune-models',
+                                json={'data_path': TRAIN_DATA_PATH, 'models': ['RandomForestModel']})
+            _wait_for_job(results, 'POST /tune-models (job)', client, response, timeout)
+
+        _request(results, 'POST /evaluate-models', client.post, '/evaluate-models',
+                 json={'data_path': TRAIN_DATA_PATH, 'models': BASELINE_MODELS + ['RandomForestModel'], 'metrics': METRICS, 'output_file': None})
+        _request(results, 'POST /predict-models', client.post, '/predict-models',
+                 json={'data_path': TEST_DATA_PATH, 'models': ['RandomForestModel'], 'save_to_files': True})
+
+        games = _get_games(n_games)
+        latencies = []
+        for _ in range(n_requests):
+            response = _request(latencies, 'POST /predict-games', client.post, '/predict-games',
+                                json={'model': 'RandomForestModel', 'games': games})
+        seconds = np.array([latency['seconds'] for latency in latencies])
+        results.append({
+            'stage': 'POST /predict-games',
+            'seconds': float(np.median(seconds)),
+            'p95_seconds': float(np.percentile(seconds, 95)),
+            'rows': len(games),
+            'requests': n_requests,
+            'status': response.status_code,
+        })
+        _request(results, 'GET /metrics', client.get, '/metrics')
+
+if __name__ == '__main__':
+    project_root = os.getenv('PROJECT_ROOT')
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--root', type=str, default=f'{project_root}/cache/benchmark' if project_root else None, help='Project root the synthetic data, models and caches are written to (cleared first), required if PROJECT_ROOT is not set')
+    argparser.add_argument('--results-dir', type=str, default=f'{project_root}/benchmark_results' if project_root else None, help='Directory the JSON results are written to, required if PROJECT_ROOT is not set')
+    argparser.add_argument('--n-train', type=int, default=1_000, help='Number of training tournaments')
+    argparser.add_argument('--n-test', type=int, default=100, help='Number of testing tournaments')
+    argparser.add_argument('--n-players', type=int, default=5_000, help='Number of distinct players')
+    argparser.add_argument('--n-ratings', type=int, default=2_000, help='Number of players in each rating file')
+    argparser.add_argument('--n-epochs', type=int, default=2, help='Number of random forest epochs')
+    argparser.add_argument('--batch-size', type=int, default=1024, help='Random forest batch size')
+    argparser.add_argument('--n-requests', type=int, default=50, help='Number of /predict-games requests')
+    argparser.add_argument('--n-games', type=int, default=64, help='Number of games per /predict-games request')
+    argparser.add_argument('--job-timeout', type=float, default=3600, help='Seconds to wait for a train or tune job')
+    argparser.add_argument('--tune', action='store_true', help='Also benchmark /tune-models')
+    argparser.add_argument('--skip-api', action='store_true', help='Benchmark only the pipeline stages')
+
+    args = argparser.parse_args()
+    if args.root is None or args.results_dir is None:
+        argparser.error('--root and --results-dir are required when PROJECT_ROOT is not set')
+
+    root = os.path.abspath(args.root)
+    shutil.rmtree(root, ignore_errors=True)
+    os.environ['PROJECT_ROOT'] = root
+
+    from benchmarks.data_generator import generate_dataset
+    results = []
+    _time(results, 'generate_dataset', generate_dataset, f'{root}/data', args.n_train, args.n_test, args.n_players, args.n_ratings)
+    run_pipeline(results, args.n_epochs, args.batch_size)
+    if not args.skip_api:
+        run_api(results, args.n_epochs, args.batch_size, args.n_requests, args.n_games, args.tune, args.job_timeout)
+
+    commit = _get_commit()
+    timestamp = dt.now().strftime('%Y-%m-%d_%H%M%S')
+    report = {
+        'commit': commit,
+        'timestamp': timestamp,
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'params': {key: value for key, value in vars(args).items() if key not in ['root', 'results_dir']},
+        'results': results,
+    }
+    os.makedirs(args.results_dir, exist_ok=True)
+    path = f'{args.results_dir}/{timestamp}_{(commit or "unknown")[:8]}.json'
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+
+    for result in report['results']:
+        print(f"{result['stage']:<32} {result['seconds']:>10.3f} s")
+    print(f'Results written to {path}')
@@ -0,0 +1,79 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from configs.constants import RANDOM_SEED
+from tournaments.feature_engineering import create_structure_features
+
+def _generate_tournament(tournament_id: int, rng: np.random.Generator) -> dict[str, list]:
+    is_knockout = rng.random() < 0.2
+    num_tours = int(rng.integers(3, 7)) if is_knockout else int(rng.integers(5, 12))
+    num_players = 2 ** num_tours if is_knockout else int(rng.integers(4, 11)) * 2
+    start_date = pd.Timestamp('2014-01-01') + pd.Timedelta(days=int(rng.integers(0, 2500)))
+    duration = num_tours + int(rng.integers(0, 4))
+    players = [f'player_{i}' for i in rng.choice(100 * num_players, num_players, replace=False)]
+
+    columns = {key: [] for key in ['tour_id', 'game_id', 'date', 'white', 'black', 'result']}
+    game_id = 1
+    for tour_id in range(1, num_tours + 1):
+        rng.shuffle(players)
+        date = start_date + pd.Timedelta(days=min(tour_id - 1, duration - 1))
+        for white, black in zip(players[0::2], players[1::2]):
+            columns['tour_id'].append(tour_id)
+            columns['game_id'].append(game_id)
+            columns['date'].append(date)
+            columns['white'].append(white)
+            columns['black'].append(black)
+            columns['result'].append(rng.choice([0.0, 0.5, 1.0]))
+            game_id += 1
+        if is_knockout:
+            players = players[::2]
+
+    num_games = len(columns['tour_id'])
+    columns['tournament_id'] = [tournament_id] * num_games
+    columns['start_date'] = [start_date] * num_games
+    columns['end_date'] = [start_date + pd.Timedelta(days=duration - 1)] * num_games
+    columns['time_control'] = [rng.choice(['classic', 'rapid'])] * num_games
+    columns['num_tours'] = [num_tours] * num_games
+    return columns
+
+def generate_tournament_frame(n_tournaments: int, seed: int = RANDOM_SEED) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    tournaments = [pd.DataFrame(_generate_tournament(i, rng)) for i in range(1, n_tournaments + 1)]
+    df = pd.concat(tournaments, axis=0, ignore_index=True)
+    df = df.reindex(columns=[
+        'tournament_id', 'tour_id', 'game_id',
+        'start_date', 'end_date', 'date',
+        'time_control',
+        'white', 'black', 'result',
+        'num_tours'
+    ])
+    return df
+
+def benchmark(sizes: list[int], repeats: int) -> pd.DataFrame:
+    results = []
+    for n_tournaments in sizes:
+        df = generate_tournament_frame(n_tournaments)
+        timings = []
+        for _ in range(repeats):
+            df_copy = df.copy()
+            start = time.perf_counter()
+            create_structure_features(df_copy)
+            timings.append(time.perf_counter() - start)
+        results.append({
+            'tournaments': n_tournaments,
+            'games': df.shape[0],
+            'best_seconds': min(timings),
+            'games_per_second': df.shape[0] / min(timings),
+        })
+    return pd.DataFrame(results)
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1_000, 10_000, 100_000], help='Numbers of tournaments to benchmark')
+    argparser.add_argument('--repeats', type=int, default=3, help='Number of timed runs per size')
+
+    args = argparser.parse_args()
+
+    print(benchmark(args.sizes, args.repeats).to_string(index=False))
@@ -0,0 +1,54 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from configs.constants import RANDOM_SEED
+from configs.paths import SCORES_PATHS, TRAIN_DATA_PATH
+from utils.name_mapping import MappedNameIndex, build_name_index, create_name_mapping, get_clean_name, map_name_to_players
+from tournaments.data_cleaning import get_all_tournament_data
+from scores.data_cleaning import get_combined_scores
+
+def _get_names(tournament_path: str) -> list[str]:
+    scores = get_combined_scores(SCORES_PATHS)
+    tournaments = get_all_tournament_data(tournament_path, True)
+    names = tournaments.reindex(columns=['white', 'black']).stack().unique().tolist() + scores.index.tolist()
+    return names
+
+def _time_call(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+def benchmark(names: list[str], n_names: int, n_legacy_names: int) -> pd.DataFrame:
+    rng = np.random.default_rng(RANDOM_SEED)
+    lookups = rng.choice(np.array(names, dtype=object), n_names).tolist()
+    legacy_lookups = lookups[:n_legacy_names]
+
+    name_index = build_name_index(names)
+    mapped_name_index = MappedNameIndex.from_name_index(name_index)
+    name_mapping = create_name_mapping(names)
+
+    get_clean_name.cache_clear()
+    timings = {
+        'index_cold': (n_names, _time_call(name_index.resolve, lookups)),
+        'index_warm': (n_names, _time_call(name_index.resolve, lookups)),
+        'mapped_index': (n_names, _time_call(mapped_name_index.resolve, lookups)),
+        'legacy': (len(legacy_lookups), _time_call(map_name_to_players, legacy_lookups, name_mapping)),
+    }
+    df = pd.DataFrame([
+        {'implementation': name, 'names': count, 'seconds': seconds, 'names_per_second': count / seconds}
+        for name, (count, seconds) in timings.items()
+    ])
+    return df
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--tournament-path', type=str, default=TRAIN_DATA_PATH, help='Path to tournament data the names are sampled from')
+    argparser.add_argument('--n-names', type=int, default=1_000_000, help='Number of names to resolve')
+    argparser.add_argument('--n-legacy-names', type=int, default=1_000_000, help='Number of names to resolve with the permutation based mapping')
+
+    args = argparser.parse_args()
+
+    names = _get_names(args.tournament_path)
+    print(benchmark(names, args.n_names, args.n_legacy_names).to_string(index=False))
@@ -0,0 +1,60 @@
+import copy
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+from benchmarks.encoding import generate_feature_frame, _encode_sparse
+from models.advanced_models.random_forest import RandomForestModel
+from models.flat_forest import FlatForest
+
+def _time_call(function, X) -> tuple[float, np.ndarray]:
+    start = time.perf_counter()
+    result = function(X)
+    return time.perf_counter() - start, result
+
+def benchmark(n_games: int, n_players: int, n_epochs: int, batch_size: int, max_depth: Optional[int], batch_sizes: list[int], repeats: int) -> pd.DataFrame:
+    df, y, vocabulary = generate_feature_frame(n_games, n_players)
+    X = _encode_sparse(df, vocabulary)
+    model = RandomForestModel(n_epochs=n_epochs, batch_size=batch_size, max_depth=max_depth)
+    model.fit_array(X, y.to_numpy())
+    forest = FlatForest.from_estimators(model.model.estimators_, model.model.classes_)
+    engines = {
+        'sklearn': model.model.predict_proba,
+        'sklearn_single_thread': copy.copy(model.model).set_params(n_jobs=1).predict_proba,
+        'flat_forest': forest.predict_proba,
+    }
+
+    results = []
+    for n_rows in batch_sizes:
+        X_batch = X[:n_rows]
+        expected = None
+        for engine, predict_proba in engines.items():
+            seconds = min(_time_call(predict_proba, X_batch)[0] for _ in range(repeats))
+            proba = predict_proba(X_batch)
+            expected = proba if expected is None else expected
+            results.append({
+                'trees': forest.n_trees,
+                'max_depth': max(estimator.tree_.max_depth for estimator in model.model.estimators_),
+                'batch': X_batch.shape[0],
+                'engine': engine,
+                'seconds': seconds,
+                'games_per_second': X_batch.shape[0] / seconds,
+                'max_abs_diff': float(np.abs(proba - expected).max()),
+            })
+    return pd.DataFrame(results)
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--n-games', type=int, default=50_000, help='Number of synthetic games')
+    argparser.add_argument('--n-players', type=int, default=1_000, help='Number of distinct players')
+    argparser.add_argument('--n-epochs', type=int, default=2, help='Number of random forest epochs')
+    argparser.add_argument('--batch-size', type=int, default=1024, help='Random forest batch size')
+    argparser.add_argument('--max-depth', type=int, default=None, help='Maximum depth of the trees')
+    argparser.add_argument('--batches', type=int, nargs='+', default=[1, 64, 1_024, 50_000], help='Numbers of games scored per call')
+    argparser.add_argument('--repeats', type=int, default=3, help='Number of timed calls per batch (the fastest is reported)')
+
+    args = argparser.parse_args()
+
+    print(benchmark(args.n_games, args.n_players, args.n_epochs, args.batch_size, args.max_depth, args.batches, args.repeats).to_string(index=False))
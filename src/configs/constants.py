@@ -6,6 +6,54 @@ BLACK_WIN = -1
 DRAW = 0
 WHITE_WIN = 1
 
-TUNE_BATCH_SPLIT = 50
-TUNE_BATCH_N_ITERATIONS = 100
-TUNE_N_ITERATIONS = 100
\ No newline at end of file
+TUNE_N_CANDIDATES = 81
+TUNE_HALVING_FACTOR = 3
+TUNE_MIN_EPOCHS = 1
+TUNE_MIN_BOOSTING_ITERATIONS = 10
+
+FEATURE_CACHE_VERSION = 2
+FEATURE_CACHE_MEMORY_SIZE = 4
+FEATURE_CACHE_DISK_SIZE = 16
+FILE_HASH_CACHE_SIZE = 4096
+FEATURE_STORE_VERSION = 3
+FEATURE_STORE_MAX_SEGMENTS = 32
+
+ELO_INITIAL = 1500
+ELO_K_FACTOR = 20
+FORM_INITIAL = 0.5
+FORM_ALPHA = 0.2
+
+LOADING_CHUNK_SIZE = 16
+DATASET_ROW_GROUP_SIZE = 2 ** 16
+NAME_CACHE_SIZE = 2 ** 20
+FUZZY_NGRAM_SIZE = 2
+MINHASH_BANDS = 10
+MINHASH_ROWS = 3
+FUZZY_MATCH_THRESHOLD = 1.0
+FUZZY_MAX_BUCKET_SIZE = 32
+FUZZY_CHUNK_SIZE = 2 ** 14
+
+MODEL_CACHE_SIZE = 8
+ARTIFACT_FORMAT_VERSION = 1
+TRAINING_N_JOBS = -1
+MEMMAP_CACHE_SIZE = 4
+EVALUATION_N_JOBS = None
+PREDICTION_CACHE_SIZE = 256
+
+PREDICTION_BATCH_SIZE = 256
+FOREST_MAX_CELLS = 2 ** 15
+FOREST_MAX_DENSE_BYTES = 2 ** 26
+FOREST_COMPACT_STEPS = 8
+PREDICTION_BATCH_DELAY_SECONDS = 0.002
+STREAMING_CHUNK_SIZE = 4096
+
+IMPORT_TIME_BUDGET_SECONDS = 1.0
+IMPORT_MODULE_BUDGET_SECONDS = 0.5
+DEFERRED_IMPORTS = ['sklearn', 'pandas', 'pyarrow', 'uvicorn', 'pinyin', 'tqdm']
+FIRST_REQUEST_BUDGET_SECONDS = 3.0
+
+JOB_LIMITS = {'train': 2, 'tune': 1}
+JOB_POLL_SECONDS = 1.0
+JOB_PROGRESS_SECONDS = 0.5
+
+INSTRUMENTATION_ENABLED = True
\ No newline at end of file
@@ -2,7 +2,22 @@ import os
 DATA_PATH = f"{os.getenv('PROJECT_ROOT')}/data"
 TRAIN_DATA_PATH = f'{DATA_PATH}/train'
 TEST_DATA_PATH = f'{DATA_PATH}/test'
+DATASET_DIR = f'{DATA_PATH}/dataset'
+TRAIN_DATASET_PATH = f'{DATASET_DIR}/train'
+TEST_DATASET_PATH = f'{DATASET_DIR}/test'
 SCORES_2014 = f'{DATA_PATH}/rating_2014.txt'
 SCORES_2020 = f'{DATA_PATH}/rating_2020.txt'
+SCORES_PATHS = {'2014': SCORES_2014, '2020': SCORES_2020}
 MODEL_DIR = f"{os.getenv('PROJECT_ROOT')}/model_files"
-OUTPUT_DIR = f"{os.getenv('PROJECT_ROOT')}/output_files"
\ No newline at end of file
+NAME_INDEX_PATH = f'{MODEL_DIR}/name_index.pickle'
+TIME_FEATURE_STATE_PATH = f'{MODEL_DIR}/time_features.pickle'
+OUTPUT_DIR = f"{os.getenv('PROJECT_ROOT')}/output_files"
+CACHE_DIR = f"{os.getenv('PROJECT_ROOT')}/cache"
+FEATURE_CACHE_DIR = f'{CACHE_DIR}/features'
+FEATURE_STORE_DIR = f'{CACHE_DIR}/feature_store'
+MEMMAP_CACHE_DIR = f'{CACHE_DIR}/memmaps'
+TUNING_DIR = f'{CACHE_DIR}/tuning'
+PREDICTION_CACHE_DIR = f'{CACHE_DIR}/predictions'
+RATING_TABLE_DIR = f'{CACHE_DIR}/ratings'
+NAME_INDEX_MAPPED_DIR = f'{CACHE_DIR}/name_index'
+JOBS_DB_PATH = f'{CACHE_DIR}/jobs.sqlite'
\ No newline at end of file
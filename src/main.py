@@ -1,3 +1,7 @@
+import cProfile
+import argparse
+from datetime import datetime as dt
+
 from configs.paths import TRAIN_DATA_PATH, TEST_DATA_PATH
 
 from preprocessing.data_pipeline import process_data
@@ -8,44 +12,61 @@ from models.baseline_models.draw import DrawModel
 from models.baseline_models.random_winner import RandomWinnerModel
 
 from models.advanced_models.random_forest import RandomForestModel
+from models.advanced_models.hist_gradient_boosting import HistGradientBoostingModel
 
 from models.operations.evaluation import evaluate_models
 from models.operations.training import train_models
 from models.operations.saving import save_models
+from utils.instrumentation import configure_logging
 
-metrics = ['accuracy', 'recall_macro', 'f1_macro']
+def main() -> None:
+    metrics = ['accuracy', 'recall_macro', 'f1_macro']
 
-baseline_models = [
-    WhiteWinsModel(),
-    BlackWinsModel(),
-    DrawModel(),
-    RandomWinnerModel(),
-]
+    baseline_models = [
+        WhiteWinsModel(),
+        BlackWinsModel(),
+        DrawModel(),
+        RandomWinnerModel(),
+    ]
 
-advanced_models = [
-    RandomForestModel(n_epochs = 100, batch_size = 1024),
-]
+    advanced_models = [
+        RandomForestModel(n_epochs = 100, batch_size = 1024),
+        HistGradientBoostingModel(),
+    ]
 
-models = baseline_models + advanced_models
+    models = baseline_models + advanced_models
 
-from datetime import datetime as dt
+    print(f'<<<<<< Processing data: {dt.now()}')
+    X, y = process_data(TRAIN_DATA_PATH)
+
+    print(f'<<<<<< Training models: {dt.now()}')
+    train_models(models, X, y)
+
+    print(f'<<<<<< Tuning hyperparameters: {dt.now()}')
+    tuned_models_and_params = [model.tune_hyperparameters(X, y) for model in models]
+    tuned_models = [model for model, _ in tuned_models_and_params if model is not None]
+    models += tuned_models
 
-print(f'<<<<<< Processing data: {dt.now()}')
-X, y = process_data(TRAIN_DATA_PATH)
+    print(f'<<<<<< Saving models: {dt.now()}')
+    save_models(models)
 
-print(f'<<<<<< Training models: {dt.now()}')
-train_models(models, X, y)
+    print(f'<<<<<< Evaluating models: {dt.now()}')
+    evaluations = evaluate_models(models, X, y, metrics)
 
-print(f'<<<<<< Tuning hyperparameters: {dt.now()}')
-tuned_models_and_params = [model.tune_hyperparameters(X, y) for model in models]
-tuned_models = [model for model, _ in tuned_models_and_params if model is not None]
-models += tuned_models
+    print(evaluations)
+    evaluations.to_excel('./evaluations.xlsx')
 
-print(f'<<<<<< Saving models: {dt.now()}')
-save_models(models)
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--profile', type=str, nargs='?', const='./main.prof', default=None, help='Write cProfile output of the run to this path')
 
-print(f'<<<<<< Evaluating models: {dt.now()}')
-evaluations = evaluate_models(models, X, y, metrics)
+    args = argparser.parse_args()
 
-print(evaluations)
-evaluations.to_excel('./evaluations.xlsx')
\ No newline at end of file
+    configure_logging()
+    if args.profile is None:
+        main()
+    else:
+        profiler = cProfile.Profile()
+        profiler.runcall(main)
+        profiler.dump_stats(args.profile)
+        print(f'Profile written to {args.profile}')
\ No newline at end of file
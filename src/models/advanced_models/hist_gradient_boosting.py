@@ -0,0 +1,163 @@
+from __future__ import annotations
+import time
+import numpy as np
+import pandas as pd
+from typing import Optional
+from sklearn.base import ClassifierMixin, clone
+from sklearn.ensemble import HistGradientBoostingClassifier
+from threadpoolctl import threadpool_limits
+
+from models.base_model import BaseModel
+from models.halving_search import SuccessiveHalvingSearch
+from utils.name_mapping import get_name_index
+from scores.rating_table import PLAYER_PREFIX, get_player_ids
+from preprocessing.encoding import PLAYER_COLUMNS, UNKNOWN_PLAYER, is_compact
+from configs.constants import RANDOM_SEED, TUNE_N_CANDIDATES, TUNE_HALVING_FACTOR, TUNE_MIN_BOOSTING_ITERATIONS
+
+PLAYERS_FILE = 'players.npy'
+
+def _is_player_dummy(column: str) -> bool:
+    return any(column.startswith(f'{color}_{PLAYER_PREFIX}') for color in PLAYER_COLUMNS)
+
+def _get_player_numbers(X: pd.DataFrame, color: str) -> np.ndarray:
+    if is_compact(X):
+        vocabulary = np.append(get_player_ids(get_name_index().players), UNKNOWN_PLAYER)
+        return vocabulary[X[color].to_numpy()]
+    prefix = f'{color}_'
+    dummy_columns = [column for column in X.columns if column.startswith(f'{prefix}{PLAYER_PREFIX}')]
+    if not dummy_columns:
+        return np.full(X.shape[0], UNKNOWN_PLAYER, dtype=np.int64)
+    numbers = get_player_ids([column[len(prefix):] for column in dummy_columns])
+    values = X[dummy_columns].to_numpy()
+    return np.where(values.any(axis=1), numbers[values.argmax(axis=1)], UNKNOWN_PLAYER)
+
+def _get_frequent_players(players: np.ndarray, max_players: int) -> np.ndarray:
+    values, counts = np.unique(players[players >= 0], return_counts=True)
+    return np.sort(values[np.argsort(-counts, kind='stable')[:max_players]])
+
+class HistGradientBoostingModel(BaseModel, ClassifierMixin):
+    def __init__(self,
+            learning_rate: Optional[float] = 0.1,
+            max_iter: Optional[int] = 200,
+            max_leaf_nodes: Optional[int | None] = 31,
+            max_depth: Optional[int | None] = None,
+            min_samples_leaf: Optional[int] = 20,
+            l2_regularization: Optional[float] = 0.0,
+            max_bins: Optional[int] = 255,
+            early_stopping: Optional[bool] = True,
+            validation_fraction: Optional[float] = 0.1,
+            n_iter_no_change: Optional[int] = 10,
+            n_jobs: Optional[int] | None = None,
+            random_state: Optional[int | None] = RANDOM_SEED) -> None:
+        super().__init__()
+        self.learning_rate = learning_rate
+        self.max_iter = max_iter
+        self.max_leaf_nodes = max_leaf_nodes
+        self.max_depth = max_depth
+        self.min_samples_leaf = min_samples_leaf
+        self.l2_regularization = l2_regularization
+        self.max_bins = max_bins
+        self.early_stopping = early_stopping
+        self.validation_fraction = validation_fraction
+        self.n_iter_no_change = n_iter_no_change
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+        self.model = HistGradientBoostingClassifier(**self._get_boosting_params())
+        self.players = np.zeros(0, dtype=np.int64)
+
+    def _get_boosting_params(self) -> dict:
+        return {k: v for k,v in self.get_params().items() if k != 'n_jobs'}
+
+    def _limit_threads(self) -> threadpool_limits:
+        return threadpool_limits(limits=self.n_jobs if self.n_jobs is not None and self.n_jobs > 0 else None, user_api='openmp')
+
+    def encode(self, X: pd.DataFrame) -> pd.DataFrame:
+        numeric_columns = [column for column in X.columns if column not in PLAYER_COLUMNS and not _is_player_dummy(column)]
+        players = pd.DataFrame({color: _get_player_numbers(X, color) for color in PLAYER_COLUMNS}, index=X.index)
+        return pd.concat([X[numeric_columns].astype(np.float32), players], axis=1)
+
+    def _to_categories(self, X: np.ndarray) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        for column in range(X.shape[1] - len(PLAYER_COLUMNS), X.shape[1]):
+            positions = np.searchsorted(self.players, X[:, column])
+            known = positions < self.players.shape[0]
+            known[known] = self.players[positions[known]] == X[known, column]
+            X[:, column] = np.where(known, positions, np.nan)
+        return X
+
+    def fit(self, X: pd.DataFrame, y: pd.Series) -> None:
+        X_encoded = self.encode(X)
+        self.feature_names = X_encoded.columns.tolist()
+        self.fit_array(X_encoded.values, y.to_numpy())
+
+    def fit_array(self, X: np.ndarray, y: np.ndarray) -> None:
+        n_features = X.shape[1]
+        players = np.asarray(X[:, n_features - len(PLAYER_COLUMNS):], dtype=np.int64)
+        self.players = _get_frequent_players(players.ravel(), self.max_bins - 1)
+        categorical_features = list(range(n_features - len(PLAYER_COLUMNS), n_features))
+        self.model = HistGradientBoostingClassifier(**self._get_boosting_params(), categorical_features=categorical_features)
+
+        start = time.perf_counter()
+        with self._limit_threads():
+            self.model.fit(self._to_categories(X), y)
+        elapsed = time.perf_counter() - start
+        self.training_stats = {
+            'n_iterations': self.model.n_iter_,
+            'seconds': elapsed,
+            'samples_per_second': X.shape[0] * self.model.n_iter_ / elapsed,
+        }
+
+    def predict_array(self, X: np.ndarray) -> np.ndarray:
+        with self._limit_threads():
+            return self.model.predict(self._to_categories(X))
+
+    def predict_proba_array(self, X: np.ndarray) -> np.ndarray:
+        with self._limit_threads():
+            return self.model.predict_proba(self._to_categories(X))
+
+    def _encode_features(self, X: pd.DataFrame) -> np.ndarray:
+        return self.encode(X).reindex(columns=self.feature_names).fillna(0).values
+
+    def predict(self, X: pd.DataFrame) -> pd.Series:
+        y_hat = self.predict_array(self._encode_features(X))
+        y_hat = pd.Series(y_hat)
+        return y_hat
+
+    def predict_proba(self, X: pd.DataFrame) -> pd.DataFrame:
+        proba = self.predict_proba_array(self._encode_features(X))
+        return pd.DataFrame(proba, columns=self.classes)
+
+    def _save_artifacts(self, path: str) -> None:
+        super()._save_artifacts(path)
+        np.save(f'{path}/{PLAYERS_FILE}', self.players)
+
+    def _load_artifacts(self, path: str) -> None:
+        super()._load_artifacts(path)
+        self.players = np.load(f'{path}/{PLAYERS_FILE}')
+
+    def _get_initial_search_space(self) -> dict[str, list]:
+        search_space = {
+                    'learning_rate': [0.03, 0.05, 0.1, 0.2],
+                    'max_leaf_nodes': [15, 31, 63, 127],
+                    'min_samples_leaf': [10, 20, 50, 100],
+                    'l2_regularization': [0.0, 0.1, 1.0, 10.0]}
+        return search_space
+
+    def tune_hyperparameters(self, X: pd.DataFrame, y: pd.Series) -> tuple[HistGradientBoostingModel, dict[str, str | int]]:
+        tuning = SuccessiveHalvingSearch(estimator = clone(self),
+                                         param_distributions = self._get_initial_search_space(),
+                                         resource = 'max_iter',
+                                         min_resource = min(TUNE_MIN_BOOSTING_ITERATIONS, self.max_iter),
+                                         max_resource = self.max_iter,
+                                         factor = TUNE_HALVING_FACTOR,
+                                         n_candidates = TUNE_N_CANDIDATES,
+                                         cv = self.sampler,
+                                         random_state = RANDOM_SEED,
+                                         n_jobs = 1,
+                                         refit = False)
+        tuning.fit(X, y)
+        best_estimator = clone(self).set_params(**tuning.best_params_)
+        best_estimator.fit(X, y)
+        best_estimator.name = best_estimator.name + '_tuned'
+        return best_estimator, tuning.best_params_
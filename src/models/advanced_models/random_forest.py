@@ -1,15 +1,25 @@
 from __future__ import annotations
+import os
+import time
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
 from enum import Enum
 from typing import Optional
-from sklearn.base import ClassifierMixin
+from sklearn.base import ClassifierMixin, clone
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import RandomizedSearchCV
+from joblib import hash as joblib_hash
+
+from scipy import sparse
 
 from models.base_model import BaseModel
-from configs.constants import RANDOM_SEED, TUNE_BATCH_SPLIT, TUNE_BATCH_N_ITERATIONS, TUNE_N_ITERATIONS
+from models.flat_forest import FlatForest
+from models.halving_search import SuccessiveHalvingSearch
+from utils.progress import ProgressBar
+from utils.name_mapping import get_name_index
+from preprocessing.encoding import is_compact, get_sparse_feature_names, to_sparse
+from utils.error_codes import UnsupportedParameterException
+from configs.paths import MEMMAP_CACHE_DIR
+from configs.constants import RANDOM_SEED, TRAINING_N_JOBS, MEMMAP_CACHE_SIZE, TUNE_N_CANDIDATES, TUNE_HALVING_FACTOR, TUNE_MIN_EPOCHS
 
 class Criterion(Enum):
     GINI = 'gini'
@@ -70,24 +80,123 @@ class RandomForestModel(BaseModel, ClassifierMixin):
 
         self.model = RandomForestClassifier(**{k: v for k,v in self.get_params().items() if k not in ['n_epochs', 'batch_size']}
         )
+        self.forest = None
+
+    def _get_forest_params(self, n_samples: int) -> dict:
+        if not self.bootstrap:
+            raise UnsupportedParameterException
+        params = {k: v for k,v in self.get_params().items() if k not in ['n_epochs', 'batch_size']}
+        if self.max_samples is None:
+            params['max_samples'] = min(self.batch_size, n_samples)
+        params['n_jobs'] = TRAINING_N_JOBS if self.n_jobs is None else self.n_jobs
+        params['warm_start'] = True
+        return params
+
+    def _to_memmap(self, X: pd.DataFrame) -> np.ndarray:
+        path = f'{MEMMAP_CACHE_DIR}/{joblib_hash(X)}.npy'
+        if os.path.isfile(path):
+            os.utime(path)
+            return np.load(path, mmap_mode='r')
+
+        os.makedirs(MEMMAP_CACHE_DIR, exist_ok=True)
+        path_tmp = f'{path}.{os.getpid()}.tmp.npy'
+        X_mmap = np.lib.format.open_memmap(path_tmp, mode='w+', dtype=np.float32, shape=X.shape)
+        X_mmap[:] = X.to_numpy(dtype=np.float32)
+        X_mmap.flush()
+        del X_mmap
+        os.replace(path_tmp, path)
+        paths = sorted((f'{MEMMAP_CACHE_DIR}/{file}' for file in os.listdir(MEMMAP_CACHE_DIR) if file.endswith('.npy') and '.tmp' not in file),
+                       key=os.path.getmtime, reverse=True)
+        for stale_path in paths[MEMMAP_CACHE_SIZE:]:
+            os.remove(stale_path)
+        return np.load(path, mmap_mode='r')
+
+    def encode(self, X: pd.DataFrame) -> pd.DataFrame | sparse.csr_matrix:
+        if is_compact(X):
+            players = get_name_index().players
+            return to_sparse(X, get_sparse_feature_names(X, players), players)
+        return pd.get_dummies(X)
 
     def fit(self, X: pd.DataFrame, y: pd.Series) -> None:
-        X_one_hot = pd.get_dummies(X)
+        if is_compact(X):
+            players = get_name_index().players
+            self.feature_names = get_sparse_feature_names(X, players)
+            self.fit_array(to_sparse(X, self.feature_names, players), y.to_numpy())
+            return
+
+        X_one_hot = self.encode(X)
         self.feature_names = X_one_hot.columns.tolist()
-        data = np.concatenate([X_one_hot.values, y.values.reshape([-1,1])], axis=1)
-        n_batches = int(np.ceil(data.shape[0] / self.batch_size))
-        for _ in tqdm(range(self.n_epochs)):
-            for data_batch in np.array_split(data, n_batches):
-                X_batch, y_batch = data_batch[:, :-1], data_batch[:, -1]
-                self.model.fit(X_batch, y_batch)
-                self.model.n_estimators += 1
+        self.fit_array(self._to_memmap(X_one_hot), y.to_numpy())
+
+    def fit_array(self, X: np.ndarray | sparse.csr_matrix, y: np.ndarray) -> None:
+        if sparse.issparse(X):
+            X = X.tocsc().astype(np.float32)
+        n_samples = X.shape[0]
+        n_batches = int(np.ceil(n_samples / self.batch_size))
+        self.model = RandomForestClassifier(**self._get_forest_params(n_samples))
+        max_samples = self.model.max_samples
+        samples_per_tree = max_samples if isinstance(max_samples, int) else max(round(n_samples * max_samples), 1)
+
+        start = time.perf_counter()
+        elapsed = 0.0
+        progress = ProgressBar(range(1, self.n_epochs + 1), desc=f'{self.name} epochs')
+        for epoch in progress:
+            self.model.n_estimators = epoch * n_batches * self.n_estimators
+            self.model.fit(X, y)
+            elapsed = time.perf_counter() - start
+            progress.set_postfix(trees_per_second=self.model.n_estimators / elapsed,
+                                 samples_per_second=self.model.n_estimators * samples_per_tree / elapsed)
+
+        n_trees = len(getattr(self.model, 'estimators_', []))
+        self.training_stats = {
+            'n_trees': n_trees,
+            'seconds': elapsed,
+            'trees_per_second': n_trees / elapsed if elapsed else 0.0,
+            'samples_per_second': n_trees * samples_per_tree / elapsed if elapsed else 0.0,
+        }
+        self.forest = None
+
+    def predict_array(self, X: np.ndarray | sparse.csr_matrix) -> np.ndarray:
+        if getattr(self, 'forest', None) is not None:
+            return self.forest.predict(X)
+        return self.model.predict(X)
+
+    def predict_proba_array(self, X: np.ndarray | sparse.csr_matrix) -> np.ndarray:
+        if getattr(self, 'forest', None) is not None:
+            return self.forest.predict_proba(X)
+        return self.model.predict_proba(X)
+
+    @property
+    def classes(self) -> np.ndarray:
+        if getattr(self, 'forest', None) is not None:
+            return self.forest.classes
+        return self.model.classes_
+
+    def _encode_features(self, X: pd.DataFrame) -> np.ndarray | sparse.csr_matrix:
+        if is_compact(X):
+            return to_sparse(X, self.feature_names, get_name_index().players)
+        return self.encode(X).reindex(columns=self.feature_names).fillna(0).values
 
     def predict(self, X: pd.DataFrame) -> pd.Series:
-        X_one_hot = pd.get_dummies(X).reindex(columns=self.feature_names).fillna(0)
-        y_hat = self.model.predict(X_one_hot.values)
+        y_hat = self.predict_array(self._encode_features(X))
         y_hat = pd.Series(y_hat)
         return y_hat
 
+    def predict_proba(self, X: pd.DataFrame) -> pd.DataFrame:
+        proba = self.predict_proba_array(self._encode_features(X))
+        return pd.DataFrame(proba, columns=self.classes)
+
+    def _save_artifacts(self, path: str) -> None:
+        forest = self.forest
+        if forest is None and hasattr(self.model, 'estimators_'):
+            forest = FlatForest.from_estimators(self.model.estimators_, self.model.classes_)
+        if forest is not None:
+            forest.save(path)
+
+    def _load_artifacts(self, path: str) -> None:
+        if FlatForest.exists(path):
+            self.forest = FlatForest.load(path)
+
     def _get_initial_search_space(self) -> dict[str, str]:
         max_features = ['log2', 'sqrt']
         max_depth = [int(x) for x in np.linspace(10, 110, num = 11)] + [None]
@@ -100,41 +209,19 @@ class RandomForestModel(BaseModel, ClassifierMixin):
                     'min_samples_leaf': min_samples_leaf}
         return search_space
 
-    def _batch_tune(self, X: np.ndarray, y: np.ndarray) -> tuple[RandomForestModel, dict[str, str | int]]:
-        search_space_initial = self._get_initial_search_space()
-        params = []
-        data = np.concatenate([X.values, y.values.reshape([-1,1])], axis=1)
-        for data_batch in np.array_split(data, TUNE_BATCH_SPLIT):
-            tuning_initial = RandomizedSearchCV(estimator = self,
-                                            param_distributions = search_space_initial,
-                                            n_iter = TUNE_BATCH_N_ITERATIONS,
-                                            cv = self.sampler,
-                                            verbose = 0,
-                                            random_state = RANDOM_SEED,
-                                            n_jobs = -1)
-            X_batch, y_batch = pd.DataFrame(data_batch[:, :-1]), pd.Series(data_batch[:, -1])
-            tuning_initial.fit(X_batch, y_batch)
-            params.append(tuning_initial.best_params_)
-        return params
-
-    def _get_final_search_space(self, params: list[dict[str, str]]):
-        search_space = pd.DataFrame(params).T.apply(set, axis=1).map(list).to_dict()
-        return search_space
-
-    def tune_hyperparameters(self, X: np.ndarray, y: np.ndarray) -> tuple[RandomForestModel, dict[str, str | int]]:
-        print(X.shape, y.shape)
-        params = self._batch_tune(X, y)
-        print(params)
-        search_space_final = self._get_final_search_space(params)
-        tuning = RandomizedSearchCV(estimator = self,
-                                    param_distributions = search_space_final,
-                                    n_iter = TUNE_N_ITERATIONS,
-                                    cv = self.sampler,
-                                    verbose = 2,
-                                    random_state = RANDOM_SEED,
-                                    n_jobs = -1)
-
+    def tune_hyperparameters(self, X: pd.DataFrame, y: pd.Series) -> tuple[RandomForestModel, dict[str, str | int]]:
+        tuning = SuccessiveHalvingSearch(estimator = clone(self).set_params(n_jobs = 1),
+                                         param_distributions = self._get_initial_search_space(),
+                                         resource = 'n_epochs',
+                                         min_resource = min(TUNE_MIN_EPOCHS, self.n_epochs),
+                                         max_resource = self.n_epochs,
+                                         factor = TUNE_HALVING_FACTOR,
+                                         n_candidates = TUNE_N_CANDIDATES,
+                                         cv = self.sampler,
+                                         random_state = RANDOM_SEED,
+                                         refit = False)
         tuning.fit(X, y)
-        best_estimator = tuning.best_estimator_
+        best_estimator = clone(self).set_params(**tuning.best_params_)
+        best_estimator.fit(X, y)
         best_estimator.name = best_estimator.name + '_tuned'
-        return best_estimator, tuning.best_params_
\ No newline at end of file
+        return best_estimator, tuning.best_params_
@@ -1,32 +1,69 @@
+from __future__ import annotations
+import os
+import json
 import pickle
+import shutil
+import importlib
 import numpy as np
 import pandas as pd
+from typing import TYPE_CHECKING
 
 from sklearn.base import BaseEstimator
 from sklearn.dummy import DummyClassifier
-from sklearn.model_selection import StratifiedShuffleSplit, cross_validate
 
-from configs.constants import CROSS_VALIDATION_SPLITS, RANDOM_SEED, TEST_SAMPLE_SIZE
+from configs.constants import CROSS_VALIDATION_SPLITS, RANDOM_SEED, TEST_SAMPLE_SIZE, ARTIFACT_FORMAT_VERSION
 from models.utils import format_evaluation_scores
 
+if TYPE_CHECKING:
+    from sklearn.model_selection import StratifiedShuffleSplit
+
+MANIFEST_FILE = 'manifest.json'
+ESTIMATOR_FILE = 'estimator.pickle'
+
 class BaseModel(BaseEstimator):
     def __init__(self) -> None:
         self.name = self.__class__.__name__
-        self.sampler = StratifiedShuffleSplit(n_splits=CROSS_VALIDATION_SPLITS, test_size=TEST_SAMPLE_SIZE, random_state=RANDOM_SEED)
         self.model = DummyClassifier()
 
+    @property
+    def sampler(self) -> StratifiedShuffleSplit:
+        from sklearn.model_selection import StratifiedShuffleSplit
+        return StratifiedShuffleSplit(n_splits=CROSS_VALIDATION_SPLITS, test_size=TEST_SAMPLE_SIZE, random_state=RANDOM_SEED)
+
     def __str__(self) -> str:
         return self.name
 
+    def encode(self, X: pd.DataFrame) -> pd.DataFrame:
+        return pd.get_dummies(X)
+
     def fit(self, X: pd.DataFrame, y: pd.Series) -> None:
-        return self.model.fit(X.values, y.values)
+        self.feature_names = X.columns.tolist()
+        return self.fit_array(X.values, y.values)
+
+    def fit_array(self, X: np.ndarray, y: np.ndarray) -> None:
+        return self.model.fit(X, y)
 
     def predict(self, X: pd.DataFrame) -> pd.Series:
         y_hat = self.model.predict(X.values)
         y_hat = pd.Series(y_hat)
         return y_hat
 
+    def predict_array(self, X: np.ndarray) -> np.ndarray:
+        return self.model.predict(X)
+
+    @property
+    def classes(self) -> np.ndarray:
+        return self.model.classes_
+
+    def predict_proba(self, X: pd.DataFrame) -> pd.DataFrame:
+        proba = self.predict_proba_array(X.values)
+        return pd.DataFrame(proba, columns=self.classes)
+
+    def predict_proba_array(self, X: np.ndarray) -> np.ndarray:
+        return self.model.predict_proba(X)
+
     def evaluate(self, X: np.ndarray, y: np.ndarray, metrics: list[str]) -> pd.DataFrame:
+        from sklearn.model_selection import cross_validate
         scores = cross_validate(self, X, y, cv=self.sampler, scoring=metrics, return_train_score=True)
         df_scores = format_evaluation_scores(self.name, scores)
         return df_scores
@@ -34,15 +71,46 @@ class BaseModel(BaseEstimator):
     def tune_hyperparameters(self, X: np.ndarray, y: np.ndarray) -> tuple[None, None]:
         return None, None
 
-    def save(self, path: str) -> None:
-        with open(path, 'wb') as f:
-            pickle.dump(self, f)
+    def _get_manifest(self) -> dict:
+        manifest = {
+            'format_version': ARTIFACT_FORMAT_VERSION,
+            'module': self.__class__.__module__,
+            'class': self.__class__.__name__,
+            'name': self.name,
+            'params': self.get_params(),
+            'feature_names': getattr(self, 'feature_names', []),
+        }
+        return manifest
 
-        path_hyperparams = path.replace('.pickle','_hyperparams.pickle')
-        with open(path_hyperparams, 'wb') as f:
-            pickle.dump(self, f)
+    def _save_artifacts(self, path: str) -> None:
+        with open(f'{path}/{ESTIMATOR_FILE}', 'wb') as f:
+            pickle.dump(self.model, f)
+
+    def _load_artifacts(self, path: str) -> None:
+        with open(f'{path}/{ESTIMATOR_FILE}', 'rb') as f:
+            self.model = pickle.load(f)
+
+    def save(self, path: str) -> None:
+        path_tmp = f'{path}.tmp'
+        shutil.rmtree(path_tmp, ignore_errors=True)
+        os.makedirs(path_tmp)
+        self._save_artifacts(path_tmp)
+        with open(f'{path_tmp}/{MANIFEST_FILE}', 'w', encoding='utf-8') as f:
+            json.dump(self._get_manifest(), f, indent=4, ensure_ascii=False)
+        shutil.rmtree(path, ignore_errors=True)
+        os.rename(path_tmp, path)
 
-    def load(self, path: str) -> None:
-        with open(path, 'rb') as f:
-            return pickle.load(f)
+    @staticmethod
+    def load(path: str) -> BaseModel:
+        if os.path.isfile(path):
+            with open(path, 'rb') as f:
+                return pickle.load(f)
 
+        with open(f'{path}/{MANIFEST_FILE}', 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        model_class = getattr(importlib.import_module(manifest['module']), manifest['class'])
+        model = model_class(**manifest['params'])
+        model.name = manifest['name']
+        model.feature_names = manifest['feature_names']
+        model._load_artifacts(path)
+        return model
@@ -0,0 +1,114 @@
+from __future__ import annotations
+import os
+import numpy as np
+from scipy import sparse
+from sklearn.tree import DecisionTreeClassifier
+
+from configs.constants import FOREST_MAX_CELLS, FOREST_MAX_DENSE_BYTES, FOREST_COMPACT_STEPS
+
+ARRAY_NAMES = ['node_offsets', 'children_left', 'children_right', 'feature', 'threshold', 'value', 'classes']
+KERNEL_ARRAY_NAMES = ['kernel_children', 'kernel_feature', 'kernel_threshold', 'kernel_is_leaf']
+LEAF = -1
+
+class FlatForest:
+    def __init__(self, node_offsets: np.ndarray, children_left: np.ndarray, children_right: np.ndarray,
+            feature: np.ndarray, threshold: np.ndarray, value: np.ndarray, classes: np.ndarray) -> None:
+        self.node_offsets = node_offsets
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.classes = classes
+        self._kernel = None
+
+    @property
+    def n_trees(self) -> int:
+        return self.node_offsets.shape[0] - 1
+
+    @staticmethod
+    def from_estimators(estimators: list[DecisionTreeClassifier], classes: np.ndarray) -> FlatForest:
+        trees = [estimator.tree_ for estimator in estimators]
+        node_offsets = np.concatenate([[0], np.cumsum([tree.node_count for tree in trees])]).astype(np.int64)
+        children_left, children_right, value = [], [], []
+        for offset, tree in zip(node_offsets, trees):
+            is_leaf = tree.children_left == LEAF
+            children_left.append(np.where(is_leaf, LEAF, tree.children_left + offset))
+            children_right.append(np.where(is_leaf, LEAF, tree.children_right + offset))
+            tree_value = tree.value[:, 0, :]
+            normalizer = tree_value.sum(axis=1, keepdims=True)
+            value.append(tree_value / np.where(normalizer == 0, 1, normalizer))
+        return FlatForest(
+            node_offsets,
+            np.concatenate(children_left).astype(np.int64),
+            np.concatenate(children_right).astype(np.int64),
+            np.concatenate([tree.feature for tree in trees]).astype(np.int64),
+            np.concatenate([tree.threshold for tree in trees]).astype(np.float64),
+            np.concatenate(value).astype(np.float64),
+            np.asarray(classes))
+
+    def save(self, path: str) -> None:
+        arrays = {name: getattr(self, name) for name in ARRAY_NAMES} | dict(zip(KERNEL_ARRAY_NAMES, self._get_kernel()))
+        for name, array in arrays.items():
+            np.save(f'{path}/{name}.npy', array, allow_pickle=False)
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return all(os.path.isfile(f'{path}/{name}.npy') for name in ARRAY_NAMES)
+
+    @staticmethod
+    def load(path: str, mmap_mode: str | None = 'r') -> FlatForest:
+        arrays = {name: np.load(f'{path}/{name}.npy', mmap_mode=mmap_mode, allow_pickle=False) for name in ARRAY_NAMES}
+        forest = FlatForest(**arrays)
+        if all(os.path.isfile(f'{path}/{name}.npy') for name in KERNEL_ARRAY_NAMES):
+            forest._kernel = tuple(np.load(f'{path}/{name}.npy', mmap_mode=mmap_mode, allow_pickle=False) for name in KERNEL_ARRAY_NAMES)
+        return forest
+
+    def _get_chunk_size(self, n_features: int) -> int:
+        return max(1, min(FOREST_MAX_CELLS // max(self.n_trees, 1), FOREST_MAX_DENSE_BYTES // (4 * max(n_features, 1))))
+
+    def _get_kernel(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        if self._kernel is None:
+            is_leaf = self.children_left == LEAF
+            nodes = np.arange(is_leaf.shape[0], dtype=np.int64)
+            children = np.column_stack([
+                np.where(is_leaf, nodes, self.children_right),
+                np.where(is_leaf, nodes, self.children_left),
+            ]).ravel()
+            feature = np.where(is_leaf, 0, self.feature)
+            threshold = np.where(is_leaf, np.inf, self.threshold)
+            self._kernel = (children, feature, threshold, is_leaf)
+        return self._kernel
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        children, feature, threshold, is_leaf = self._get_kernel()
+        n_samples, n_features = X.shape
+        X_flat = X.ravel()
+        nodes = np.tile(self.node_offsets[:-1], n_samples)
+        offsets = np.repeat(np.arange(n_samples, dtype=np.int64) * n_features, self.n_trees)
+        positions = np.arange(nodes.shape[0])
+        leaves = np.empty(nodes.shape[0], dtype=np.int64)
+        step = 0
+        while nodes.size:
+            goes_left = X_flat[offsets + feature[nodes]] <= threshold[nodes]
+            nodes = children[2 * nodes + goes_left]
+            step += 1
+            if step % FOREST_COMPACT_STEPS == 0:
+                done = is_leaf[nodes]
+                leaves[positions[done]] = nodes[done]
+                nodes, offsets, positions = nodes[~done], offsets[~done], positions[~done]
+        return leaves.reshape(n_samples, self.n_trees)
+
+    def predict_proba(self, X: np.ndarray | sparse.csr_matrix) -> np.ndarray:
+        X = X.tocsr() if sparse.issparse(X) else np.asarray(X)
+        proba = np.zeros([X.shape[0], self.classes.shape[0]])
+        chunk_size = self._get_chunk_size(X.shape[1])
+        for start in range(0, X.shape[0], chunk_size):
+            X_chunk = X[start:start + chunk_size]
+            X_chunk = X_chunk.toarray() if sparse.issparse(X_chunk) else X_chunk
+            leaves = self.apply(np.ascontiguousarray(X_chunk, dtype=np.float32))
+            proba[start:start + chunk_size] = self.value[leaves].sum(axis=1)
+        return proba / self.n_trees
+
+    def predict(self, X: np.ndarray | sparse.csr_matrix) -> np.ndarray:
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1))
@@ -0,0 +1,105 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from typing import Optional
+from joblib import Parallel, delayed, hash as joblib_hash
+from sklearn.base import BaseEstimator, clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import BaseCrossValidator, ParameterSampler
+
+from configs.paths import TUNING_DIR
+from utils.progress import ProgressBar
+
+def _fit_and_score(estimator: BaseEstimator, params: dict, X: pd.DataFrame, y: pd.Series,
+        train: np.ndarray, test: np.ndarray, scoring: str) -> float:
+    estimator = clone(estimator).set_params(**params)
+    estimator.fit(X.iloc[train], y.iloc[train])
+    return get_scorer(scoring)(estimator, X.iloc[test], y.iloc[test])
+
+class SuccessiveHalvingSearch:
+    def __init__(self,
+            estimator: BaseEstimator,
+            param_distributions: dict[str, list],
+            resource: str,
+            min_resource: int,
+            max_resource: int,
+            factor: int,
+            n_candidates: int,
+            cv: BaseCrossValidator,
+            scoring: str = 'accuracy',
+            n_jobs: Optional[int] = -1,
+            random_state: Optional[int] = None,
+            refit: bool = True) -> None:
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.resource = resource
+        self.min_resource = min_resource
+        self.max_resource = max_resource
+        self.factor = factor
+        self.n_candidates = n_candidates
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.refit = refit
+
+    def _get_resources(self) -> list[int]:
+        resources = []
+        resource = self.min_resource
+        while resource < self.max_resource:
+            resources.append(resource)
+            resource *= self.factor
+        return resources + [self.max_resource]
+
+    def _get_checkpoint_path(self, X: pd.DataFrame, y: pd.Series, candidates: list[dict]) -> str:
+        key = joblib_hash([
+            self.estimator.__class__.__name__, self.estimator.get_params(), candidates, self._get_resources(),
+            self.cv, self.scoring, list(X.columns), X, y.to_numpy()
+        ])
+        return f'{TUNING_DIR}/{key}.json'
+
+    def _load_checkpoint(self, path: str) -> dict[str, list[float]]:
+        if not os.path.isfile(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['scores']
+
+    def _save_checkpoint(self, path: str, candidates: list[dict], scores: dict[str, list[float]]) -> None:
+        os.makedirs(TUNING_DIR, exist_ok=True)
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'candidates': candidates, 'scores': scores}, f, indent=4)
+        os.replace(f'{path}.tmp', path)
+
+    def fit(self, X: pd.DataFrame, y: pd.Series) -> 'SuccessiveHalvingSearch':
+        X = pd.get_dummies(X)
+        splits = list(self.cv.split(X, y))
+        candidates = list(ParameterSampler(self.param_distributions, self.n_candidates, random_state=self.random_state))
+        checkpoint_path = self._get_checkpoint_path(X, y, candidates)
+        scores = self._load_checkpoint(checkpoint_path)
+
+        self.results_ = []
+        survivors = list(range(len(candidates)))
+        with Parallel(n_jobs=self.n_jobs) as parallel:
+            for resource in ProgressBar(self._get_resources(), desc='halving rungs'):
+                pending = [i for i in survivors if f'{i}:{resource}' not in scores]
+                fold_scores = parallel(
+                    delayed(_fit_and_score)(self.estimator, {**candidates[i], self.resource: resource}, X, y, train, test, self.scoring)
+                    for i in pending for train, test in splits
+                )
+                for j, i in enumerate(pending):
+                    scores[f'{i}:{resource}'] = fold_scores[j * len(splits):(j + 1) * len(splits)]
+                self._save_checkpoint(checkpoint_path, candidates, scores)
+
+                mean_scores = {i: float(np.mean(scores[f'{i}:{resource}'])) for i in survivors}
+                self.results_ += [{**candidates[i], self.resource: resource, 'mean_score': mean_scores[i]} for i in survivors]
+                survivors = sorted(survivors, key=lambda i: mean_scores[i], reverse=True)
+                survivors = survivors[:max(int(np.ceil(len(survivors) / self.factor)), 1)]
+
+        best = survivors[0]
+        self.best_params_ = {**candidates[best], self.resource: self.max_resource}
+        self.best_score_ = mean_scores[best]
+        if self.refit:
+            self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_)
+            self.best_estimator_.fit(X, y)
+        return self
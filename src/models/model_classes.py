@@ -0,0 +1,26 @@
+from __future__ import annotations
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from models.base_model import BaseModel
+
+BASELINE_MODELS = {
+    'WhiteWinsModel': 'models.baseline_models.white_wins',
+    'BlackWinsModel': 'models.baseline_models.black_wins',
+    'DrawModel': 'models.baseline_models.draw',
+    'RandomWinnerModel': 'models.baseline_models.random_winner',
+}
+
+ADVANCED_MODELS = {
+    'RandomForestModel': 'models.advanced_models.random_forest',
+    'HistGradientBoostingModel': 'models.advanced_models.hist_gradient_boosting',
+}
+
+MODEL_CLASSES = BASELINE_MODELS | ADVANCED_MODELS
+
+def get_model_class(model_name: str) -> type[BaseModel]:
+    return getattr(importlib.import_module(MODEL_CLASSES[model_name]), model_name)
+
+def create_models(model_names: list[str], params: dict[str, dict]) -> list[BaseModel]:
+    return [get_model_class(model_name)(**params.get(model_name, {})) for model_name in MODEL_CLASSES if model_name in model_names]
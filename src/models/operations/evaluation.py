@@ -1,9 +1,193 @@
+import os
+import sys
+import time
+import inspect
 import numpy as np
 import pandas as pd
+from typing import Optional
+from functools import lru_cache, partial
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from scipy import sparse
+from joblib import hash as joblib_hash
+from sklearn.base import BaseEstimator, clone
+from sklearn.metrics import accuracy_score, recall_score, f1_score
 
+from configs.paths import PREDICTION_CACHE_DIR
+from configs.constants import EVALUATION_N_JOBS, PREDICTION_CACHE_SIZE
 from models.base_model import BaseModel
+from models.utils import format_evaluation_scores
+from utils.instrumentation import instrumented
 
-def evaluate_models(models: list[BaseModel], X: np.ndarray, y: np.ndarray, metrics: list[str]) -> pd.DataFrame:
-    results = [model.evaluate(X, y, metrics) for model in models]
+SPARSE_PARTS = ['data', 'indices', 'indptr']
+METRICS = {
+    'accuracy': accuracy_score,
+    'recall_macro': partial(recall_score, average='macro'),
+    'f1_macro': partial(f1_score, average='macro'),
+}
+
+_arrays: dict[str, np.ndarray | sparse.csr_matrix] = {}
+_shared_memory: list[SharedMemory] = []
+
+def _share_array(array: np.ndarray) -> tuple[SharedMemory, tuple[str, tuple[int, ...], str]]:
+    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+def _share_matrix(matrix: np.ndarray | sparse.csr_matrix, shared: list[SharedMemory]) -> dict:
+    arrays = {part: getattr(matrix, part) for part in SPARSE_PARTS} if sparse.issparse(matrix) else {'array': matrix}
+    spec = {'shape': matrix.shape}
+    for part, array in arrays.items():
+        shm, spec[part] = _share_array(array)
+        shared.append(shm)
+    return spec
+
+def _attach_array(name: str, shape: tuple[int, ...], dtype: str) -> np.ndarray:
+    shm = SharedMemory(name=name)
+    _shared_memory.append(shm)
+    return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+def _attach_arrays(specs: dict[str, dict]) -> None:
+    for key, spec in specs.items():
+        if 'array' in spec:
+            _arrays[key] = _attach_array(*spec['array'])
+        else:
+            parts = tuple(_attach_array(*spec[part]) for part in SPARSE_PARTS)
+            _arrays[key] = sparse.csr_matrix(parts, shape=spec['shape'], copy=False)
+
+def _to_matrix(X: pd.DataFrame | sparse.csr_matrix) -> np.ndarray | sparse.csr_matrix:
+    if sparse.issparse(X):
+        return X.tocsr().astype(np.float32)
+    return X.to_numpy(dtype=np.float32)
+
+def _fit_and_predict(model: BaseModel, encoding: str, train: np.ndarray, test: np.ndarray) -> dict[str, np.ndarray | float]:
+    X, y = _arrays[encoding], _arrays['y']
+    X_train = X[train]
+    start = time.perf_counter()
+    model.fit_array(X_train, y[train])
+    fit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    train_predictions = model.predict_array(X_train)
+    test_predictions = model.predict_array(X[test])
+    score_time = time.perf_counter() - start
+    return {
+        'train': np.asarray(train_predictions),
+        'test': np.asarray(test_predictions),
+        'fit_time': fit_time,
+        'score_time': score_time,
+    }
+
+def _get_cache_path(key: str) -> str:
+    return f'{PREDICTION_CACHE_DIR}/{key}.npz'
+
+def _load_predictions(key: str) -> Optional[dict[str, np.ndarray | float]]:
+    path = _get_cache_path(key)
+    if not os.path.isfile(path):
+        return None
+    with np.load(path, allow_pickle=False) as f:
+        predictions = {name: f[name] for name in f.files}
+    os.utime(path)
+    predictions['fit_time'] = float(predictions['fit_time'])
+    predictions['score_time'] = float(predictions['score_time'])
+    return predictions
+
+def _save_predictions(key: str, predictions: dict[str, np.ndarray | float]) -> None:
+    os.makedirs(PREDICTION_CACHE_DIR, exist_ok=True)
+    path = _get_cache_path(key)
+    path_tmp = f'{path}.{os.getpid()}.tmp.npz'
+    np.savez(path_tmp, **predictions)
+    os.replace(path_tmp, path)
+    paths = [f'{PREDICTION_CACHE_DIR}/{file}' for file in os.listdir(PREDICTION_CACHE_DIR) if file.endswith('.npz')]
+    for path in sorted(paths, key=os.path.getmtime, reverse=True)[PREDICTION_CACHE_SIZE:]:
+        os.remove(path)
+
+@lru_cache(maxsize=None)
+def _get_code_version(model_class: type) -> str:
+    modules = dict.fromkeys(cls.__module__ for cls in model_class.__mro__ if cls.__module__.startswith('models.'))
+    return joblib_hash([inspect.getsource(sys.modules[module]) for module in modules])
+
+def _is_deterministic(model: BaseModel) -> bool:
+    estimators = [model] + ([model.model] if isinstance(getattr(model, 'model', None), BaseEstimator) else [])
+    return all(estimator.get_params(deep=False).get('random_state', 0) is not None for estimator in estimators)
+
+def _get_model_key(model: BaseModel) -> Optional[str]:
+    if not _is_deterministic(model):
+        return None
+    return joblib_hash([model.__class__.__module__, model.__class__.__name__, _get_code_version(model.__class__), model.get_params()])
+
+def _clone_model(model: BaseModel, single_threaded: bool) -> BaseModel:
+    model_clone = clone(model)
+    model_clone.name = model.name
+    if single_threaded and 'n_jobs' in model_clone.get_params():
+        model_clone.set_params(n_jobs=1)
+    return model_clone
+
+def _score_predictions(y_true: np.ndarray, y_pred: np.ndarray, metric: str) -> float:
+    return METRICS[metric](y_true, y_pred)
+
+def _get_scores(predictions: list[dict], splits: list[tuple[np.ndarray, np.ndarray]], y: np.ndarray, metrics: list[str]) -> dict[str, np.ndarray]:
+    scores = {
+        'fit_time': np.array([fold['fit_time'] for fold in predictions]),
+        'score_time': np.array([fold['score_time'] for fold in predictions]),
+    }
+    for metric in metrics:
+        for score_type, index in [('test', 1), ('train', 0)]:
+            scores[f'{score_type}_{metric}'] = np.array([
+                _score_predictions(y[split[index]], fold[score_type], metric) for fold, split in zip(predictions, splits)
+            ])
+    return scores
+
+@instrumented('evaluate_models')
+def evaluate_models(models: list[BaseModel], X: pd.DataFrame, y: pd.Series, metrics: list[str], n_jobs: Optional[int] = EVALUATION_N_JOBS) -> pd.DataFrame:
+    encoders = {}
+    for model in models:
+        encoders.setdefault(f'{model.encode.__module__}.{model.encode.__qualname__}', model.encode)
+    arrays = {encoding: _to_matrix(encode(X)) for encoding, encode in encoders.items()}
+    arrays['y'] = y.to_numpy()
+    splits = list(models[0].sampler.split(arrays['y'], arrays['y']))
+    data_key = joblib_hash([arrays, splits])
+
+    predictions, pending = {}, []
+    for i, model in enumerate(models):
+        encoding = f'{model.encode.__module__}.{model.encode.__qualname__}'
+        model_key = _get_model_key(model)
+        for fold in range(len(splits)):
+            key = joblib_hash([model_key, data_key, encoding, fold]) if model_key is not None else None
+            predictions[i, fold] = _load_predictions(key) if key is not None else None
+            if predictions[i, fold] is None:
+                pending.append((i, fold, key, encoding))
+
+    n_jobs = min(n_jobs or os.cpu_count() or 1, max(len(pending), 1))
+    if n_jobs == 1:
+        _arrays.update(arrays)
+        try:
+            results = [_fit_and_predict(_clone_model(models[i], False), encoding, *splits[fold])
+                       for i, fold, _, encoding in pending]
+        finally:
+            _arrays.clear()
+    else:
+        shared, specs = [], {}
+        try:
+            for key, array in arrays.items():
+                specs[key] = _share_matrix(array, shared)
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_attach_arrays, initargs=(specs,)) as executor:
+                futures = [executor.submit(_fit_and_predict, _clone_model(models[i], True), encoding, *splits[fold])
+                           for i, fold, _, encoding in pending]
+                results = [future.result() for future in futures]
+        finally:
+            for shm in shared:
+                shm.close()
+                shm.unlink()
+
+    for (i, fold, key, _), result in zip(pending, results):
+        if key is not None:
+            _save_predictions(key, result)
+        predictions[i, fold] = result
+
+    results = []
+    for i, model in enumerate(models):
+        model_predictions = [predictions[i, fold] for fold in range(len(splits))]
+        scores = _get_scores(model_predictions, splits, arrays['y'], metrics)
+        results.append(format_evaluation_scores(model.name, scores))
     df = pd.concat(results, axis=0)
-    return df
\ No newline at end of file
+    return df
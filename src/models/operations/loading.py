@@ -1,24 +1,92 @@
 import os
 import re
+from threading import Lock
+from typing import Optional
+from collections import OrderedDict
+
 from configs.paths import MODEL_DIR
-from models.base_model import BaseModel
+from configs.constants import MODEL_CACHE_SIZE
+from models.base_model import BaseModel, MANIFEST_FILE
 from utils.error_codes import NoModelsFoundException
 
-def load_models(model_names: list[str]) -> list[BaseModel]:
-    folders = [name for name in os.listdir(MODEL_DIR) if re.match(r'^\d{4}-\d{2}-\d{2}_\d{6}$', name)]
-    folders = sorted(folders, reverse=True)
+MODEL_FOLDER_PATTERN = r'^\d{4}-\d{2}-\d{2}_\d{6}$'
+MODEL_FILE_SUFFIX = '.pickle'
+HYPERPARAMS_FILE_SUFFIX = '_hyperparams.pickle'
+
+class ModelRegistry:
+    def __init__(self, model_dir: str, max_models: int) -> None:
+        self.model_dir = model_dir
+        self.max_models = max_models
+        self._lock = Lock()
+        self._models: OrderedDict[str, BaseModel] = OrderedDict()
+        self._latest: dict[str, str] = {}
+        self._fingerprint: Optional[tuple] = None
+
+    def _get_fingerprint(self) -> tuple:
+        if not os.path.isdir(self.model_dir):
+            return ()
+        folders = [name for name in os.listdir(self.model_dir) if re.match(MODEL_FOLDER_PATTERN, name)]
+        return tuple(sorted((name, os.stat(f'{self.model_dir}/{name}').st_mtime_ns) for name in folders))
+
+    def _find_latest_models(self, fingerprint: tuple) -> dict[str, str]:
+        latest = {}
+        for folder_name, _ in reversed(fingerprint):
+            for file in sorted(os.listdir(f'{self.model_dir}/{folder_name}')):
+                path = f'{self.model_dir}/{folder_name}/{file}'
+                if os.path.isfile(f'{path}/{MANIFEST_FILE}'):
+                    latest.setdefault(file, path)
+                elif file.endswith(MODEL_FILE_SUFFIX) and not file.endswith(HYPERPARAMS_FILE_SUFFIX):
+                    latest.setdefault(file[:-len(MODEL_FILE_SUFFIX)], path)
+        return latest
+
+    def refresh(self) -> None:
+        fingerprint = self._get_fingerprint()
+        if fingerprint == self._fingerprint:
+            return
+        latest = self._find_latest_models(fingerprint)
+        with self._lock:
+            self._latest = latest
+            self._fingerprint = fingerprint
+
+    def _remember(self, path: str, model: BaseModel) -> None:
+        with self._lock:
+            self._models[path] = model
+            self._models.move_to_end(path)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
 
+    def get(self, model_name: str) -> Optional[BaseModel]:
+        self.refresh()
+        with self._lock:
+            path = self._latest.get(model_name)
+            if path is None:
+                return None
+            if path in self._models:
+                self._models.move_to_end(path)
+                return self._models[path]
+
+        model = BaseModel.load(path)
+        self._remember(path, model)
+        return model
+
+    def warm(self, model_names: Optional[list[str]] = None) -> list[str]:
+        self.refresh()
+        model_names = model_names or list(self._latest)
+        return [model_name for model_name in model_names[:self.max_models] if self.get(model_name) is not None]
+
+    @property
+    def loaded_models(self) -> list[str]:
+        with self._lock:
+            return list(self._models)
+
+registry = ModelRegistry(MODEL_DIR, MODEL_CACHE_SIZE)
+
+def load_models(model_names: list[str]) -> list[BaseModel]:
     models = []
-    selected_models = []
-    for model_name in model_names:
-        if model_name in selected_models:
-            continue
-        for folder_name in folders:
-            path = f'{MODEL_DIR}/{folder_name}/{model_name}.pickle'
-            if os.path.isfile(path):
-                models.append(BaseModel().load(path))
-                selected_models.append(model_name)
-                break
+    for model_name in dict.fromkeys(model_names):
+        model = registry.get(model_name)
+        if model is not None:
+            models.append(model)
     if not models:
         raise NoModelsFoundException
-    return models
\ No newline at end of file
+    return models
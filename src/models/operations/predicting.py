@@ -2,9 +2,26 @@ import numpy as np
 import pandas as pd
 
 from models.base_model import BaseModel
-from postprocessing.data_pipeline import process_data
+from postprocessing.data_pipeline import OUTCOME_NAMES, process_data, process_probabilities
+from utils.instrumentation import stage
 
-def predict_models(models: list[BaseModel], X: np.ndarray) -> pd.DataFrame:
-    results = [process_data(model.predict(X).rename(model.name)) for model in models]
-    df = pd.concat(results, axis=1) if len(results) > 1 else results[0].to_frame()
-    return df
\ No newline at end of file
+def predict_models(models: list[BaseModel], X: np.ndarray, probabilities: bool = False) -> pd.DataFrame:
+    results = []
+    for model in models:
+        with stage('predict_proba' if probabilities else 'predict', model=model.name) as current:
+            if probabilities:
+                results.append(process_probabilities(model.predict_proba(X), model.name))
+            else:
+                results.append(process_data(model.predict(X).rename(model.name)))
+            current.rows = X.shape[0]
+    df = pd.concat(results, axis=1) if len(results) > 1 else pd.DataFrame(results[0])
+    return df
+
+def get_labels(probabilities: pd.DataFrame, models: list[BaseModel]) -> pd.DataFrame:
+    results = []
+    for model in models:
+        columns = [f'{model.name}_{OUTCOME_NAMES[result]}' for result in model.classes]
+        labels = np.asarray(model.classes)[probabilities[columns].to_numpy().argmax(axis=1)]
+        results.append(process_data(pd.Series(labels, index=probabilities.index, name=model.name)))
+    df = pd.concat(results, axis=1) if len(results) > 1 else pd.DataFrame(results[0])
+    return df
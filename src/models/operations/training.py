@@ -1,7 +1,10 @@
 import pandas as pd
 
 from models.base_model import BaseModel
+from utils.instrumentation import stage
 
 def train_models(models: list[BaseModel], X: pd.DataFrame, y: pd.Series) -> None:
     for model in models:
-        model.fit(X, y)
\ No newline at end of file
+        with stage('fit', model=model.name) as current:
+            model.fit(X, y)
+            current.rows = X.shape[0]
\ No newline at end of file
@@ -2,11 +2,18 @@ import pandas as pd
 
 from configs.constants import BLACK_WIN, DRAW, WHITE_WIN
 
+OUTCOME_NAMES = {BLACK_WIN: 'black_win', DRAW: 'draw', WHITE_WIN: 'white_win'}
+
 def _map_result(series: pd.Series) -> pd.Series:
     result_map = {BLACK_WIN: 0.0, DRAW: 0.5, WHITE_WIN: 1.0}
     series = series.map(result_map)
     return series
 
+def process_probabilities(df_orig: pd.DataFrame, name: str) -> pd.DataFrame:
+    df = df_orig.reindex(columns=list(OUTCOME_NAMES), fill_value=0.0)
+    df.columns = [f'{name}_{OUTCOME_NAMES[result]}' for result in df.columns]
+    return df
+
 def process_data(series_orig: pd.Series) -> pd.Series:
     series = series_orig.copy()
     series = _map_result(series)
@@ -1,37 +1,173 @@
+import os
 import pandas as pd
+from typing import Optional
 
-from configs.paths import SCORES_2014, SCORES_2020
+from configs.paths import SCORES_PATHS, NAME_INDEX_PATH, TIME_FEATURE_STATE_PATH
+from configs.constants import FEATURE_STORE_VERSION
 
-from tournaments.data_cleaning import get_all_tournament_data
+from tournaments.data_cleaning import get_all_tournament_data, get_tournament_data, list_tournament_files, get_game_ids
 from tournaments.feature_engineering import create_features_tournament, add_scores
+from tournaments.dataset import is_dataset_uri, parse_dataset_uri
+from tournaments.time_features import TimeFeatureState, TIME_FEATURE_COLUMNS, create_features_time
 
-from scores.data_cleaning import get_combined_scores
-from scores.feature_engineering import create_features_scores
+from scores.rating_table import get_rating_table
+
+from utils.name_mapping import get_name_index, extend_name_index
+from utils.instrumentation import stage
+from utils.error_codes import TimeFeatureStateNotFoundException
+
+from preprocessing.encoding import encode_player_codes
+from preprocessing.feature_cache import list_input_files, fingerprint_file, get_cache_key, load_features, save_features, load_frame, save_frame
+from preprocessing.feature_store import FeatureStore, SOURCE_COLUMN, ORDER_COLUMN, DATE_COLUMN
 
 def _keep_features_and_dependent_columns(df: pd.DataFrame) -> pd.DataFrame:
     feature_columns = [
         'white', 'black',
         'is_classic', 'is_knockout',
         'tour_completion', 'tournament_completion',
-        'white_score_2014', 'white_score_2020',
-        'black_score_2014', 'black_score_2020'
-    ]
+    ] + [f'{color}_score_{snapshot}' for color in ['white', 'black'] for snapshot in SCORES_PATHS]
     dependent_column = 'result'
-    columns = feature_columns + [dependent_column]
+    time_feature_columns = [column for column in TIME_FEATURE_COLUMNS if column in df.columns]
+    columns = feature_columns + time_feature_columns + [dependent_column]
     df_filtered = df.reindex(columns=columns)
     return df_filtered
 
-def process_data(data_path: str) -> tuple[pd.DataFrame, pd.Series]:
-    df_scores_raw = get_combined_scores(SCORES_2014, SCORES_2020)
-    df_tournament_raw = get_all_tournament_data(data_path, True)
-
-    df_scores = create_features_scores(df_scores_raw)
+def _create_feature_frame(df_tournament_raw: pd.DataFrame) -> pd.DataFrame:
+    rating_table = get_rating_table()
     df_tournament = create_features_tournament(df_tournament_raw)
-    df = add_scores(df_tournament, df_scores)
+    df = add_scores(df_tournament, rating_table)
+    return df
+
+def _split_features(df_features: pd.DataFrame, compact: bool) -> tuple[pd.DataFrame, pd.Series]:
+    if compact:
+        df_features = encode_player_codes(df_features, get_name_index().players)
 
+    with stage('get_dummies') as current:
+        df_dummies = pd.get_dummies(df_features)
+        X = df_dummies.drop(columns=['result'])
+        y = df_dummies['result']
+        current.rows = X.shape[0]
+    return X, y
+
+def _build_features(data_path: str, compact: bool, time_state: Optional[TimeFeatureState]) -> tuple[pd.DataFrame, pd.Series]:
+    df_tournament_raw = get_all_tournament_data(data_path, True)
+    df = _create_feature_frame(df_tournament_raw)
+    if time_state is not None:
+        df = create_features_time(df, time_state)
     df_features = _keep_features_and_dependent_columns(df)
+    return _split_features(df_features, compact)
+
+def _add_time_features(store: FeatureStore, df_features: pd.DataFrame, is_stale: bool, time_state: TimeFeatureState) -> pd.DataFrame:
+    state = None if is_stale or not os.path.isfile(store.state_path) else TimeFeatureState.load(store.state_path)
+    if state is None or not state.is_before(df_features[DATE_COLUMN]):
+        df_features = pd.concat([store.read(drop_columns=False), df_features], axis=0, ignore_index=True)
+        store.clear()
+        state = time_state
+    df_features = create_features_time(df_features, state)
+    store.state = state
+    return df_features
+
+def _get_store_params(time_features: bool, fit_time_features: bool) -> dict:
+    name_index = get_name_index()
+    params = {
+        'version': FEATURE_STORE_VERSION,
+        'scores': {snapshot: fingerprint_file(path)[1:] for snapshot, path in SCORES_PATHS.items()},
+        'lineage': name_index.lineage,
+        'n_names': int(name_index.names.hashes.shape[0]),
+        'time_features': time_features,
+        'time_state': fingerprint_file(TIME_FEATURE_STATE_PATH)[1:] if time_features and not fit_time_features else None,
+    }
+    return params
+
+def _update_feature_store(data_path: str, time_state: Optional[TimeFeatureState], fit_time_features: bool,
+        extend_names: bool) -> FeatureStore:
+    time_features = time_state is not None
+    store = FeatureStore(data_path, _get_store_params(time_features, fit_time_features))
+    changed, removed = store.get_changes(list_tournament_files(data_path))
+    replaced = removed + [os.path.basename(path) for path in changed]
+    is_stale = any(file in store.manifest['files'] for file in replaced)
+    store.remove(replaced)
+    df_features = pd.DataFrame(columns=[SOURCE_COLUMN, ORDER_COLUMN, DATE_COLUMN])
+    if changed:
+        df_tournament_raw = get_tournament_data(changed, True, source_column=SOURCE_COLUMN)
+        if extend_names and extend_name_index(pd.concat([df_tournament_raw['white'], df_tournament_raw['black']])):
+            store.manifest['params'] = _get_store_params(time_features, fit_time_features)
+        df = _create_feature_frame(df_tournament_raw)
+        df_features = _keep_features_and_dependent_columns(df)
+        df_features[[SOURCE_COLUMN, ORDER_COLUMN, DATE_COLUMN]] = df[[SOURCE_COLUMN, ORDER_COLUMN, 'date']]
+    if time_features and (changed or is_stale):
+        df_features = _add_time_features(store, df_features, is_stale, time_state)
+    store.append(df_features, changed)
+    store.commit()
+    return store
+
+def _build_features_incremental(data_path: str, compact: bool, time_state: Optional[TimeFeatureState], fit_time_features: bool,
+        extend_names: bool) -> tuple[pd.DataFrame, pd.Series, Optional[TimeFeatureState]]:
+    store = _update_feature_store(data_path, time_state, fit_time_features, extend_names)
+    if time_state is not None and store.state is None and os.path.isfile(store.state_path):
+        store.state = TimeFeatureState.load(store.state_path)
+    df_features = _keep_features_and_dependent_columns(store.read())
+    X, y = _split_features(df_features, compact)
+    return X, y, store.state if store.state is not None else time_state
+
+def _build_all_features(data_path: str, compact: bool, incremental: bool, time_features: bool, fit_time_features: bool,
+        extend_names: bool) -> tuple[pd.DataFrame, pd.Series, Optional[TimeFeatureState]]:
+    time_state = None
+    if time_features:
+        time_state = TimeFeatureState() if fit_time_features else TimeFeatureState.load(TIME_FEATURE_STATE_PATH)
+    if incremental:
+        return _build_features_incremental(data_path, compact, time_state, fit_time_features, extend_names)
+    X, y = _build_features(data_path, compact, time_state)
+    return X, y, time_state
+
+def _save_time_state(time_state: Optional[TimeFeatureState], fit_time_features: bool, key: Optional[str] = None) -> None:
+    if time_state is not None and fit_time_features:
+        time_state.data_key = key
+        time_state.save(TIME_FEATURE_STATE_PATH)
+
+def _is_time_state_of(key: str) -> bool:
+    return os.path.isfile(TIME_FEATURE_STATE_PATH) and TimeFeatureState.load(TIME_FEATURE_STATE_PATH).data_key == key
+
+def process_data(data_path: str, use_cache: bool = True, compact: bool = False, incremental: bool = False,
+        time_features: bool = False, extend_names: bool = False, fit_time_features: bool = True) -> tuple[pd.DataFrame, pd.Series]:
+    if time_features and not fit_time_features and not os.path.isfile(TIME_FEATURE_STATE_PATH):
+        raise TimeFeatureStateNotFoundException
+    if not use_cache:
+        X, y, time_state = _build_all_features(data_path, compact, incremental, time_features, fit_time_features, extend_names)
+        _save_time_state(time_state, fit_time_features)
+        return X, y
+
+    input_files = list_input_files(data_path) + list(SCORES_PATHS.values()) + [NAME_INDEX_PATH]
+    params = {'compact': compact, 'time_features': time_features, 'incremental': incremental}
+    if time_features:
+        params['fit_time_features'] = fit_time_features
+        if not fit_time_features:
+            input_files.append(TIME_FEATURE_STATE_PATH)
+    if is_dataset_uri(data_path):
+        params['filters'] = parse_dataset_uri(data_path)[1]
+    key = get_cache_key(input_files, **params)
+    cached = load_features(key)
+    if cached is not None and (not time_features or not fit_time_features or _is_time_state_of(key)):
+        return cached
+
+    X, y, time_state = _build_all_features(data_path, compact, incremental, time_features, fit_time_features, extend_names)
+    key = get_cache_key(input_files, **params)
+    save_features(key, X, y)
+    _save_time_state(time_state, fit_time_features, key)
+    return X, y
+
+def process_game_ids(data_path: str, use_cache: bool = True) -> pd.DataFrame:
+    if not use_cache:
+        return get_game_ids(data_path)
+
+    params = {'game_ids': True}
+    if is_dataset_uri(data_path):
+        params['filters'] = parse_dataset_uri(data_path)[1]
+    key = get_cache_key(list_input_files(data_path), **params)
+    cached = load_frame(key)
+    if cached is not None:
+        return cached
 
-    df_dummies = pd.get_dummies(df_features)
-    X = df_dummies.drop(columns=['result'])
-    y = df_dummies['result']
-    return X, y
\ No newline at end of file
+    df = get_game_ids(data_path)
+    save_frame(key, df)
+    return df
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+PLAYER_COLUMNS = ['white', 'black']
+UNKNOWN_PLAYER = -1
+
+def get_player_codes(players: pd.Series, vocabulary: list[str]) -> np.ndarray:
+    codes = pd.Categorical(players, categories=vocabulary).codes
+    return codes.astype(np.int32)
+
+def encode_player_codes(df: pd.DataFrame, vocabulary: list[str]) -> pd.DataFrame:
+    for column in PLAYER_COLUMNS:
+        df[column] = get_player_codes(df[column], vocabulary)
+    return df
+
+def is_compact(X: pd.DataFrame) -> bool:
+    return all(column in X.columns and pd.api.types.is_integer_dtype(X[column]) for column in PLAYER_COLUMNS)
+
+def get_sparse_feature_names(X: pd.DataFrame, vocabulary: list[str]) -> list[str]:
+    numeric_columns = [column for column in X.columns if column not in PLAYER_COLUMNS]
+    player_columns = [f'{color}_{player}' for color in PLAYER_COLUMNS for player in vocabulary]
+    return numeric_columns + player_columns
+
+def to_sparse(X: pd.DataFrame, feature_names: list[str], vocabulary: list[str], dtype: type = np.float32) -> sparse.csr_matrix:
+    feature_index = {name: i for i, name in enumerate(feature_names)}
+    rows, columns, values = [], [], []
+    for column in X.columns:
+        if column in PLAYER_COLUMNS or column not in feature_index:
+            continue
+        column_values = X[column].to_numpy(dtype=dtype)
+        nonzero = np.flatnonzero(column_values)
+        rows.append(nonzero)
+        columns.append(np.full(nonzero.shape[0], feature_index[column]))
+        values.append(column_values[nonzero])
+
+    for color in PLAYER_COLUMNS:
+        lookup = np.array([feature_index.get(f'{color}_{player}', UNKNOWN_PLAYER) for player in vocabulary] + [UNKNOWN_PLAYER])
+        player_columns = lookup[X[color].to_numpy()]
+        known = np.flatnonzero(player_columns != UNKNOWN_PLAYER)
+        rows.append(known)
+        columns.append(player_columns[known])
+        values.append(np.ones(known.shape[0], dtype=dtype))
+
+    X_sparse = sparse.csr_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+                                 shape=(X.shape[0], len(feature_names)), dtype=dtype)
+    return X_sparse
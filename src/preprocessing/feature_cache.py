@@ -0,0 +1,115 @@
+import os
+import json
+import hashlib
+import pandas as pd
+from threading import Lock
+from collections import OrderedDict
+
+from configs.paths import FEATURE_CACHE_DIR
+from configs.constants import FEATURE_CACHE_VERSION, FEATURE_CACHE_MEMORY_SIZE, FEATURE_CACHE_DISK_SIZE, FILE_HASH_CACHE_SIZE
+from tournaments.dataset import is_dataset_uri, list_dataset_files
+
+DEPENDENT_COLUMN = 'result'
+
+_lock = Lock()
+_file_hashes: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+_memory_cache: OrderedDict[str, tuple[pd.DataFrame, pd.Series]] = OrderedDict()
+
+def _hash_file(path: str, stat: os.stat_result) -> str:
+    with _lock:
+        cached = _file_hashes.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            _file_hashes.move_to_end(path)
+            return cached[2]
+    file_hash = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            file_hash.update(chunk)
+    with _lock:
+        _file_hashes[path] = (stat.st_mtime_ns, stat.st_size, file_hash.hexdigest())
+        _file_hashes.move_to_end(path)
+        while len(_file_hashes) > FILE_HASH_CACHE_SIZE:
+            _file_hashes.popitem(last=False)
+    return file_hash.hexdigest()
+
+def fingerprint_file(path: str) -> list[str | int]:
+    stat = os.stat(path)
+    return [path, stat.st_mtime_ns, stat.st_size, _hash_file(path, stat)]
+
+def list_input_files(data_path: str) -> list[str]:
+    if is_dataset_uri(data_path):
+        return list_dataset_files(data_path)
+    files = sorted(f'{data_path}/{file}' for file in os.listdir(data_path))
+    return [path for path in files if os.path.isfile(path)]
+
+def get_cache_key(paths: list[str], **params) -> str:
+    fingerprint = {
+        'version': FEATURE_CACHE_VERSION,
+        'files': [fingerprint_file(path) for path in paths],
+        'params': params,
+    }
+    key = hashlib.blake2b(json.dumps(fingerprint, sort_keys=True, default=str).encode(), digest_size=16)
+    return key.hexdigest()
+
+def _get_cache_path(key: str) -> str:
+    return f'{FEATURE_CACHE_DIR}/{key}.parquet'
+
+def _remember(key: str, X: pd.DataFrame, y: pd.Series) -> None:
+    with _lock:
+        _memory_cache[key] = (X, y)
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > FEATURE_CACHE_MEMORY_SIZE:
+            _memory_cache.popitem(last=False)
+
+def _prune_disk_cache() -> None:
+    paths = [f'{FEATURE_CACHE_DIR}/{file}' for file in os.listdir(FEATURE_CACHE_DIR) if file.endswith('.parquet')]
+    paths = sorted(paths, key=os.path.getmtime, reverse=True)
+    for path in paths[FEATURE_CACHE_DISK_SIZE:]:
+        os.remove(path)
+
+def load_features(key: str) -> tuple[pd.DataFrame, pd.Series] | None:
+    with _lock:
+        cached = _memory_cache.get(key)
+        if cached is not None:
+            _memory_cache.move_to_end(key)
+    if cached is not None:
+        return cached[0].copy(), cached[1].copy()
+
+    path = _get_cache_path(key)
+    if not os.path.isfile(path):
+        return None
+    df = pd.read_parquet(path, memory_map=True)
+    os.utime(path)
+    X = df.drop(columns=[DEPENDENT_COLUMN])
+    y = df[DEPENDENT_COLUMN]
+    _remember(key, X, y)
+    return X.copy(), y.copy()
+
+def save_features(key: str, X: pd.DataFrame, y: pd.Series) -> None:
+    os.makedirs(FEATURE_CACHE_DIR, exist_ok=True)
+    path = _get_cache_path(key)
+    path_tmp = f'{path}.{os.getpid()}.tmp'
+    X.assign(**{DEPENDENT_COLUMN: y}).to_parquet(path_tmp)
+    os.replace(path_tmp, path)
+    _prune_disk_cache()
+    _remember(key, X.copy(), y.copy())
+
+def load_frame(key: str) -> pd.DataFrame | None:
+    path = _get_cache_path(key)
+    if not os.path.isfile(path):
+        return None
+    df = pd.read_parquet(path, memory_map=True)
+    os.utime(path)
+    return df
+
+def save_frame(key: str, df: pd.DataFrame) -> None:
+    os.makedirs(FEATURE_CACHE_DIR, exist_ok=True)
+    path = _get_cache_path(key)
+    path_tmp = f'{path}.{os.getpid()}.tmp'
+    df.to_parquet(path_tmp)
+    os.replace(path_tmp, path)
+    _prune_disk_cache()
+
+def clear_memory_cache() -> None:
+    with _lock:
+        _memory_cache.clear()
@@ -0,0 +1,112 @@
+import os
+import json
+import uuid
+import shutil
+import hashlib
+import pandas as pd
+from typing import Optional
+
+from configs.paths import FEATURE_STORE_DIR
+from configs.constants import FEATURE_STORE_MAX_SEGMENTS
+from preprocessing.feature_cache import fingerprint_file
+
+MANIFEST_FILE = 'manifest.json'
+STATE_FILE = 'state.pickle'
+SOURCE_COLUMN = 'source'
+ORDER_COLUMN = 'tournament_id'
+DATE_COLUMN = 'date'
+
+class FeatureStore:
+    def __init__(self, data_path: str, params: dict) -> None:
+        key = hashlib.blake2b(os.path.abspath(data_path).encode(), digest_size=16).hexdigest()
+        self.path = f'{FEATURE_STORE_DIR}/{key}'
+        self.state_path = f'{self.path}/{STATE_FILE}'
+        self.manifest = self._load_manifest()
+        self._obsolete_segments: list[str] = []
+        self.state = None
+        if self.manifest is None or self.manifest['params'] != params:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.manifest = {'params': params, 'files': {}, 'segments': {}}
+
+    def _load_manifest(self) -> Optional[dict]:
+        path = f'{self.path}/{MANIFEST_FILE}'
+        if not os.path.isfile(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _get_segment_path(self, segment: str) -> str:
+        return f'{self.path}/{segment}.parquet'
+
+    def _write_segment(self, df: pd.DataFrame) -> None:
+        segment = uuid.uuid4().hex
+        df.reset_index(drop=True).to_parquet(self._get_segment_path(segment))
+        self.manifest['segments'][segment] = sorted(df[SOURCE_COLUMN].unique().tolist())
+
+    def _read_segment(self, segment: str) -> pd.DataFrame:
+        return pd.read_parquet(self._get_segment_path(segment), memory_map=True)
+
+    def _drop_segment(self, segment: str) -> None:
+        del self.manifest['segments'][segment]
+        self._obsolete_segments.append(segment)
+
+    def get_changes(self, paths: list[str]) -> tuple[list[str], list[str]]:
+        fingerprints = {os.path.basename(path): fingerprint_file(path)[1:] for path in paths}
+        changed = [path for path in paths if self.manifest['files'].get(os.path.basename(path)) != fingerprints[os.path.basename(path)]]
+        removed = [file for file in self.manifest['files'] if file not in fingerprints]
+        return changed, removed
+
+    def remove(self, files: list[str]) -> None:
+        files = set(files)
+        for segment, segment_files in list(self.manifest['segments'].items()):
+            if files.isdisjoint(segment_files):
+                continue
+            df = self._read_segment(segment)
+            df = df[~df[SOURCE_COLUMN].isin(files)]
+            self._drop_segment(segment)
+            if not df.empty:
+                self._write_segment(df)
+        for file in files:
+            self.manifest['files'].pop(file, None)
+
+    def append(self, df: pd.DataFrame, paths: list[str]) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        if not df.empty:
+            self._write_segment(df)
+        for path in paths:
+            self.manifest['files'][os.path.basename(path)] = fingerprint_file(path)[1:]
+        if len(self.manifest['segments']) > FEATURE_STORE_MAX_SEGMENTS:
+            self.compact()
+
+    def clear(self) -> None:
+        for segment in list(self.manifest['segments']):
+            self._drop_segment(segment)
+
+    def compact(self) -> None:
+        segments = list(self.manifest['segments'])
+        df = pd.concat([self._read_segment(segment) for segment in segments], axis=0, ignore_index=True)
+        for segment in segments:
+            self._drop_segment(segment)
+        self._write_segment(df.sort_values(ORDER_COLUMN, kind='stable'))
+
+    def commit(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        if self.state is not None:
+            self.state.save(self.state_path)
+        path = f'{self.path}/{MANIFEST_FILE}'
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=4)
+        os.replace(f'{path}.tmp', path)
+        for segment in self._obsolete_segments:
+            os.remove(self._get_segment_path(segment))
+        self._obsolete_segments = []
+
+    def read(self, drop_columns: bool = True) -> pd.DataFrame:
+        segments = [self._read_segment(segment) for segment in self.manifest['segments']]
+        if not segments:
+            return pd.DataFrame()
+        df = pd.concat(segments, axis=0, ignore_index=True)
+        df = df.sort_values(ORDER_COLUMN, kind='stable').reset_index(drop=True)
+        if drop_columns:
+            df = df.drop(columns=[SOURCE_COLUMN, ORDER_COLUMN, DATE_COLUMN])
+        return df
@@ -0,0 +1,72 @@
+import os
+import numpy as np
+from datetime import date
+from typing import Optional
+from functools import lru_cache
+
+from configs.paths import TIME_FEATURE_STATE_PATH
+from scores.rating_table import RatingTable, get_player_ids, get_rating_table
+from tournaments.time_features import TimeFeatureState, TIME_FEATURE_COLUMNS
+from utils.name_mapping import MappedNameIndex, get_name_index
+from utils.error_codes import TimeFeatureStateNotFoundException
+
+class GameFeatureBuilder:
+    def __init__(self, feature_names: list[str], name_index: MappedNameIndex, rating_table: RatingTable,
+            time_state: Optional[TimeFeatureState] = None) -> None:
+        self.feature_index = {name: i for i, name in enumerate(feature_names)}
+        self.n_features = max(len(feature_names), 1)
+        self.name_index = name_index
+        self.rating_table = rating_table
+        self.time_state = time_state
+        self.time_columns = [(i, self.feature_index[column]) for i, column in enumerate(TIME_FEATURE_COLUMNS) if column in self.feature_index]
+
+    def _set(self, row: np.ndarray, feature: str, value: float) -> None:
+        i = self.feature_index.get(feature)
+        if i is not None:
+            row[i] = value
+
+    def _fill_row(self, row: np.ndarray, game: dict, white: str, black: str) -> None:
+        start_date = date.fromisoformat(game['start_date'])
+        end_date = date.fromisoformat(game['end_date'])
+        game_date = date.fromisoformat(game['date'])
+
+        self._set(row, 'is_classic', int(game['time_control'] == 'classic'))
+        self._set(row, 'is_knockout', int(game['tournament_type'] == 'knockout'))
+        self._set(row, 'tour_completion', game['tour'] / game['num_tours'])
+        self._set(row, 'tournament_completion', (game_date - start_date).days / ((end_date - start_date).days + 1))
+        for color, player in [('white', white), ('black', black)]:
+            for column, score in zip(self.rating_table.columns, self.rating_table.lookup(player)):
+                self._set(row, f'{color}_{column}', score)
+            self._set(row, f'{color}_{player}', 1)
+            self._set(row, color, get_player_ids([player])[0])
+
+    def build(self, games: list[dict]) -> np.ndarray:
+        players = self.name_index.resolve([game['white'] for game in games] + [game['black'] for game in games])
+        X = np.zeros([len(games), self.n_features])
+        for i, game in enumerate(games):
+            self._fill_row(X[i], game, players[i], players[len(games) + i])
+        if self.time_columns:
+            player_ids = get_player_ids(players)
+            features = self.time_state.get_features(player_ids[:len(games)], player_ids[len(games):])
+            sources, targets = zip(*self.time_columns)
+            X[:, list(targets)] = features[:, list(sources)]
+        return X
+
+@lru_cache(maxsize=1)
+def _load_time_state(path: str, mtime_ns: int, size: int) -> TimeFeatureState:
+    return TimeFeatureState.load(path)
+
+def get_time_state() -> TimeFeatureState:
+    if not os.path.isfile(TIME_FEATURE_STATE_PATH):
+        raise TimeFeatureStateNotFoundException
+    stat = os.stat(TIME_FEATURE_STATE_PATH)
+    return _load_time_state(TIME_FEATURE_STATE_PATH, stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=8)
+def _get_feature_builder(feature_names: tuple[str], name_index: MappedNameIndex, rating_table: RatingTable,
+        time_state: Optional[TimeFeatureState]) -> GameFeatureBuilder:
+    return GameFeatureBuilder(list(feature_names), name_index, rating_table, time_state)
+
+def get_feature_builder(feature_names: list[str]) -> GameFeatureBuilder:
+    time_state = get_time_state() if any(column in feature_names for column in TIME_FEATURE_COLUMNS) else None
+    return _get_feature_builder(tuple(feature_names), get_name_index(), get_rating_table(), time_state)
@@ -1,19 +1,13 @@
 import pandas as pd
 
 def read_scores(path: str) -> pd.Series:
-    df = pd.read_csv(path, sep='\t', header=None) \
-           .rename(columns={0:'name', 1:'score'})
-    df = df.sort_values('score', ascending=False)
-    df = df.reset_index(drop=True)
-    df = df.groupby('name')['score'].max()
+    df = pd.read_csv(path, sep='\t', header=None, usecols=[0, 1], names=['name', 'score'])
+    df = df.groupby('name', sort=False)['score'].max()
     return df
 
-def get_combined_scores(path_2014: str, path_2020: str) -> pd.DataFrame:
-    scores_2014 = read_scores(path_2014)
-    scores_2020 = read_scores(path_2020)
-
+def get_combined_scores(paths: dict[str, str]) -> pd.DataFrame:
     df_scores = pd.concat([
-        scores_2014.rename('score_2014'),
-        scores_2020.rename('score_2020')
+        read_scores(path).rename(f'score_{snapshot}')
+        for snapshot, path in paths.items()
     ], axis=1)
     return df_scores
@@ -1,12 +1,15 @@
 import pandas as pd
-from utils.name_mapping import map_name_to_players, get_name_mapping
+from utils.name_mapping import MappedNameIndex, get_name_index
+from utils.instrumentation import instrumented
 
-def _map_names(df: pd.DataFrame, name_mapping: dict[str, str]) -> pd.DataFrame:
-    df.index = map_name_to_players(df.index.tolist(), name_mapping)['mapped']
+def _map_names(df: pd.DataFrame, name_index: MappedNameIndex) -> pd.DataFrame:
+    df.index = name_index.resolve(df.index)
+    df = df.groupby(level=0).max()
     return df
 
+@instrumented('create_features_scores')
 def create_features_scores(df_orig: pd.DataFrame) -> pd.DataFrame:
     df = df_orig.copy()
-    name_mapping = get_name_mapping()
-    df = _map_names(df, name_mapping)
+    name_index = get_name_index()
+    df = _map_names(df, name_index)
     return df
\ No newline at end of file
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+
+from configs.paths import SCORES_PATHS, NAME_INDEX_PATH, RATING_TABLE_DIR
+from scores.data_cleaning import get_combined_scores
+from scores.feature_engineering import create_features_scores
+from utils.instrumentation import instrumented
+
+PLAYER_PREFIX = 'player_'
+
+def get_player_ids(players: pd.Series | list) -> np.ndarray:
+    codes, uniques = pd.factorize(pd.Series(players, dtype=object))
+    ids = np.array([int(player[len(PLAYER_PREFIX):]) if isinstance(player, str) else -1 for player in uniques] + [-1], dtype=np.int64)
+    return ids[codes]
+
+class RatingTable:
+    def __init__(self, snapshots: list[str], ratings: np.ndarray) -> None:
+        self.snapshots = snapshots
+        self.ratings = ratings
+
+    @property
+    def columns(self) -> list[str]:
+        return [f'score_{snapshot}' for snapshot in self.snapshots]
+
+    def gather(self, player_ids: np.ndarray) -> np.ndarray:
+        player_ids = np.where(player_ids < self.ratings.shape[0] - 1, player_ids, -1)
+        return self.ratings[player_ids]
+
+    def lookup(self, player: str | None) -> np.ndarray:
+        return self.gather(get_player_ids([player]))[0]
+
+    def save(self, path: str) -> None:
+        path_tmp = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(path_tmp, snapshots=np.array(self.snapshots), ratings=self.ratings)
+        os.replace(path_tmp, path)
+
+    @staticmethod
+    def load(path: str) -> RatingTable:
+        with np.load(path) as data:
+            return RatingTable(data['snapshots'].tolist(), data['ratings'])
+
+@instrumented('build_rating_table')
+def build_rating_table(paths: dict[str, str]) -> RatingTable:
+    df_scores = create_features_scores(get_combined_scores(paths))
+    df_scores = df_scores[df_scores.index.notna()]
+    player_ids = get_player_ids(df_scores.index.to_series())
+    n_players = int(player_ids.max()) + 1 if player_ids.size else 0
+    ratings = np.zeros([n_players + 1, len(paths)], dtype=np.int32)
+    ratings[player_ids] = df_scores.reindex(columns=[f'score_{snapshot}' for snapshot in paths]).fillna(0).astype(int).values
+    return RatingTable(list(paths), ratings)
+
+def _get_signature(paths: dict[str, str]) -> tuple:
+    files = [(snapshot, path) for snapshot, path in paths.items()] + [('name_index', NAME_INDEX_PATH)]
+    return tuple((snapshot, path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for snapshot, path in files)
+
+@lru_cache(maxsize=1)
+def _load_rating_table(signature: tuple) -> RatingTable:
+    key = hashlib.blake2b(json.dumps(signature).encode(), digest_size=16).hexdigest()
+    path = f'{RATING_TABLE_DIR}/{key}.npz'
+    if os.path.isfile(path):
+        return RatingTable.load(path)
+    table = build_rating_table({snapshot: path for snapshot, path, _, _ in signature[:-1]})
+    os.makedirs(RATING_TABLE_DIR, exist_ok=True)
+    table.save(path)
+    return table
+
+def get_rating_table(paths: dict[str, str] = SCORES_PATHS) -> RatingTable:
+    return _load_rating_table(_get_signature(paths))
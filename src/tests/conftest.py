@@ -0,0 +1,4 @@
+import os
+import tempfile
+
+os.environ['PROJECT_ROOT'] = tempfile.mkdtemp(prefix='chess_tests_')
@@ -0,0 +1,62 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+import pytest
+
+from configs.paths import DATA_PATH, SCORES_2014, SCORES_2020, NAME_INDEX_PATH
+from configs.constants import BLACK_WIN, DRAW, WHITE_WIN
+from utils.name_mapping import build_name_index
+from preprocessing.data_pipeline import process_data
+
+PLAYERS = [f'Player{i}, Name{i}' for i in range(10)]
+
+def _write_tournament(data_path: str, tournament_id: int, start_date: str, rng: np.random.Generator) -> None:
+    dates = pd.date_range(start_date, periods=3).strftime('%Y-%m-%d').tolist()
+    games = {}
+    for tour_id, date in enumerate(dates, start=1):
+        players = rng.permutation(PLAYERS)[:6]
+        games[f'tour_{tour_id}'] = [
+            {'white': white, 'black': black, 'date': date, 'result': int(rng.choice([BLACK_WIN, DRAW, WHITE_WIN])),
+             'id': f'tournament_{tournament_id}_{tour_id}{game_id}'}
+            for game_id, (white, black) in enumerate(zip(players[::2], players[1::2]), start=1)
+        ]
+    tournament = {'name': f'tournament_{tournament_id}', 'start_date': dates[0], 'end_date': dates[-1],
+                  'tours': len(dates), 'time_control': 'classic' if tournament_id % 2 else 'rapid', 'games': games}
+    with open(f'{data_path}/tournament_{tournament_id}.json', 'w', encoding='utf-8') as f:
+        json.dump(tournament, f)
+
+@pytest.fixture(scope='module', autouse=True)
+def project() -> None:
+    os.makedirs(DATA_PATH, exist_ok=True)
+    os.makedirs(os.path.dirname(NAME_INDEX_PATH), exist_ok=True)
+    for i, path in enumerate([SCORES_2014, SCORES_2020]):
+        pd.DataFrame({'name': PLAYERS, 'score': np.arange(2000, 2000 + len(PLAYERS)) + i}).to_csv(path, sep='\t', header=False, index=False)
+    build_name_index(PLAYERS).save(NAME_INDEX_PATH)
+
+@pytest.fixture
+def data_path(tmp_path) -> str:
+    rng = np.random.default_rng(0)
+    for tournament_id in range(1, 5):
+        _write_tournament(str(tmp_path), tournament_id, f'2020-0{tournament_id}-01', rng)
+    return str(tmp_path)
+
+def _assert_incremental_equals_full(data_path: str, time_features: bool) -> None:
+    X_full, y_full = process_data(data_path, use_cache=False, time_features=time_features)
+    X_incremental, y_incremental = process_data(data_path, use_cache=False, incremental=True, time_features=time_features)
+    pd.testing.assert_frame_equal(X_incremental, X_full, check_dtype=False)
+    pd.testing.assert_series_equal(y_incremental, y_full, check_dtype=False)
+
+@pytest.mark.parametrize('time_features', [False, True])
+def test_incremental_equals_full(data_path, time_features):
+    _assert_incremental_equals_full(data_path, time_features)
+
+@pytest.mark.parametrize('time_features', [False, True])
+def test_incremental_after_changes_equals_full(data_path, time_features):
+    rng = np.random.default_rng(1)
+    _assert_incremental_equals_full(data_path, time_features)
+    _write_tournament(data_path, 5, '2020-06-01', rng)
+    _assert_incremental_equals_full(data_path, time_features)
+    _write_tournament(data_path, 2, '2020-02-01', rng)
+    os.remove(f'{data_path}/tournament_3.json')
+    _assert_incremental_equals_full(data_path, time_features)
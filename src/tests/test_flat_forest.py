@@ -0,0 +1,31 @@
+import numpy as np
+from scipy import sparse
+from sklearn.ensemble import RandomForestClassifier
+
+from models.flat_forest import FlatForest
+
+def _fit_forest() -> tuple[RandomForestClassifier, np.ndarray]:
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 2, size=(300, 12)).astype(np.float32)
+    X[:, :3] = rng.normal(size=(300, 3))
+    y = np.where(X[:, 0] + X[:, 3] > 0.5, 1, np.where(X[:, 1] > 0, 0, -1))
+    forest = RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0).fit(X, y)
+    return forest, X
+
+def test_predict_proba_matches_sklearn():
+    forest, X = _fit_forest()
+    flat = FlatForest.from_estimators(forest.estimators_, forest.classes_)
+    np.testing.assert_allclose(flat.predict_proba(X), forest.predict_proba(X))
+    np.testing.assert_array_equal(flat.predict(X), forest.predict(X))
+
+def test_sparse_input_matches_dense():
+    forest, X = _fit_forest()
+    flat = FlatForest.from_estimators(forest.estimators_, forest.classes_)
+    np.testing.assert_allclose(flat.predict_proba(sparse.csr_matrix(X)), flat.predict_proba(X))
+
+def test_save_and_load(tmp_path):
+    forest, X = _fit_forest()
+    flat = FlatForest.from_estimators(forest.estimators_, forest.classes_)
+    flat.save(str(tmp_path))
+    assert FlatForest.exists(str(tmp_path))
+    np.testing.assert_allclose(FlatForest.load(str(tmp_path)).predict_proba(X), forest.predict_proba(X))
@@ -0,0 +1,25 @@
+import pytest
+import pandas as pd
+
+from configs.constants import IMPORT_TIME_BUDGET_SECONDS, IMPORT_MODULE_BUDGET_SECONDS, DEFERRED_IMPORTS
+from tools.import_budget import measure_imports, get_breakdown, get_total
+
+MODULE = 'api.app'
+REPEATS = 3
+
+@pytest.fixture(scope='module')
+def imports() -> pd.DataFrame:
+    runs = [measure_imports(MODULE) for _ in range(REPEATS)]
+    return min(runs, key=lambda run: get_total(run, MODULE))
+
+def test_import_time_within_budget(imports):
+    assert get_total(imports, MODULE) <= IMPORT_TIME_BUDGET_SECONDS
+
+def test_direct_imports_within_budget(imports):
+    direct, _ = get_breakdown(imports, MODULE)
+    over_budget = direct[direct['cumulative_seconds'] > IMPORT_MODULE_BUDGET_SECONDS]
+    assert over_budget.empty, over_budget.to_string(index=False)
+
+def test_heavy_packages_are_deferred(imports):
+    _, packages = get_breakdown(imports, MODULE)
+    assert not set(packages['package']) & set(DEFERRED_IMPORTS)
@@ -0,0 +1,91 @@
+import os
+import time
+import pytest
+import subprocess
+
+from api.jobs import JobQueue, _connect, _get_process_identity, QUEUED, RUNNING, FINISHED, FAILED, CANCELLED
+from utils.error_codes import JobNotFoundException, JobNotFinishedException
+
+@pytest.fixture
+def job_queue(tmp_path) -> JobQueue:
+    job_queue = JobQueue(f'{tmp_path}/jobs.sqlite', {'train': 1, 'tune': 2}, 1.0)
+    job_queue._initialize()
+    return job_queue
+
+def _queue(job_queue: JobQueue, kind: str, n_jobs: int) -> list[str]:
+    job_ids = []
+    with _connect(job_queue.db_path) as connection:
+        for i in range(n_jobs):
+            job_id = f'{kind}_{i}'
+            connection.execute('INSERT INTO jobs (id, kind, status, request, created_at) VALUES (?, ?, ?, ?, ?)',
+                               [job_id, kind, QUEUED, '{}', time.time() + i])
+            job_ids.append(job_id)
+    return job_ids
+
+def _claim(job_queue: JobQueue) -> list[str]:
+    with _connect(job_queue.db_path) as connection:
+        return [job_id for job_id, _, _ in job_queue._claim(connection)]
+
+def test_claim_respects_limits_per_kind(job_queue):
+    train_ids = _queue(job_queue, 'train', 3)
+    tune_ids = _queue(job_queue, 'tune', 3)
+    assert sorted(_claim(job_queue)) == sorted(train_ids[:1] + tune_ids[:2])
+    assert _claim(job_queue) == []
+    assert job_queue.get(train_ids[0])['status'] == RUNNING
+    assert job_queue.get(train_ids[1])['status'] == QUEUED
+
+def test_claim_after_finish_takes_next_in_order(job_queue):
+    train_ids = _queue(job_queue, 'train', 3)
+    _claim(job_queue)
+    with _connect(job_queue.db_path) as connection:
+        connection.execute('UPDATE jobs SET status = ? WHERE id = ?', [FINISHED, train_ids[0]])
+    assert _claim(job_queue) == [train_ids[1]]
+
+def test_cancelled_job_is_not_claimed(job_queue):
+    train_ids = _queue(job_queue, 'train', 2)
+    assert job_queue.cancel(train_ids[0])['status'] == CANCELLED
+    assert _claim(job_queue) == [train_ids[1]]
+    assert job_queue.get_result(train_ids[0])['status'] == CANCELLED
+
+def test_unknown_and_unfinished_jobs_raise(job_queue):
+    train_ids = _queue(job_queue, 'train', 1)
+    with pytest.raises(JobNotFoundException):
+        job_queue.get('missing')
+    with pytest.raises(JobNotFinishedException):
+        job_queue.get_result(train_ids[0])
+
+def _set_running(job_queue: JobQueue, job_id: str, pid, process, owner) -> None:
+    with _connect(job_queue.db_path) as connection:
+        connection.execute('UPDATE jobs SET status = ?, pid = ?, process = ?, owner = ? WHERE id = ?', [RUNNING, pid, process, owner, job_id])
+
+def test_start_fails_jobs_of_exited_processes(job_queue):
+    own_identity = _get_process_identity(os.getpid())
+    reused_id, live_id, unclaimed_id, claiming_id = _queue(job_queue, 'train', 4)
+    _set_running(job_queue, reused_id, os.getpid(), f'{os.getpid()}:old-boot:0', own_identity)
+    _set_running(job_queue, live_id, os.getpid(), own_identity, own_identity)
+    _set_running(job_queue, unclaimed_id, None, None, f'{os.getpid()}:old-boot:0')
+    _set_running(job_queue, claiming_id, None, None, own_identity)
+    job_queue.start()
+    job_queue.stop()
+    assert job_queue.get(reused_id)['status'] == FAILED
+    assert job_queue.get(live_id)['status'] == RUNNING
+    assert job_queue.get(unclaimed_id)['status'] == FAILED
+    assert job_queue.get(claiming_id)['status'] == RUNNING
+
+def test_cancel_does_not_signal_reused_pid(job_queue):
+    train_ids = _queue(job_queue, 'train', 1)
+    process = subprocess.Popen(['sleep', '30'], start_new_session=True)
+    try:
+        _set_running(job_queue, train_ids[0], process.pid, f'{process.pid}:old-boot:0', None)
+        assert job_queue.cancel(train_ids[0])['status'] == CANCELLED
+        assert process.poll() is None
+    finally:
+        process.kill()
+        process.wait()
+
+def test_cancel_terminates_job_process(job_queue):
+    train_ids = _queue(job_queue, 'train', 1)
+    process = subprocess.Popen(['sleep', '30'], start_new_session=True)
+    _set_running(job_queue, train_ids[0], process.pid, _get_process_identity(process.pid), None)
+    job_queue.cancel(train_ids[0])
+    assert process.wait(timeout=10) != 0
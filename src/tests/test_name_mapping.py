@@ -0,0 +1,34 @@
+from utils.name_mapping import NameIndex, MappedNameIndex, build_name_index, get_name_key, get_match_key
+
+NAMES = ['Carlsen, Magnus', 'Nepomniachtchi, Ian', 'Ding, Liren', 'Caruana, Fabiano']
+
+def test_name_key_ignores_order_case_accents_and_commas():
+    assert get_name_key('Carlsen, Magnus') == get_name_key('magnus CARLSEN')
+    assert get_name_key('Mágnus Carlsen') == get_name_key('Magnus Carlsen')
+    assert get_name_key('Carlsen, Magnus') != get_name_key('Carlsen, Henrik')
+
+def test_match_key_ignores_order():
+    assert get_match_key('Ding, Liren') == get_match_key('Liren Ding')
+
+def test_name_index_resolves_by_key():
+    name_index = build_name_index(NAMES)
+    players = name_index.resolve(NAMES)
+    assert len(set(players)) == len(NAMES)
+    assert name_index.resolve(['magnus carlsen', 'Liren Ding', 'Unknown Player']) == [players[0], players[2], None]
+
+def test_mapped_name_index_matches_name_index(tmp_path):
+    name_index = build_name_index(NAMES)
+    path = f'{tmp_path}/mapped'
+    MappedNameIndex.from_name_index(name_index).save(path)
+    mapped = MappedNameIndex.load(path)
+    names = NAMES + ['CARUANA Fabiano', 'Nepomniachtchi Ian', 'Unknown Player', None]
+    assert mapped.resolve(names) == name_index.resolve(names)
+
+def test_extend_keeps_existing_players(tmp_path):
+    name_index = build_name_index(NAMES)
+    players = name_index.resolve(NAMES)
+    new_players = name_index.extend(['Gukesh, D', 'Magnus Carlsen'])
+    assert len(new_players) == 1
+    path = f'{tmp_path}/name_index.pickle'
+    name_index.save(path)
+    assert NameIndex.load(path).resolve(NAMES + ['Gukesh, D']) == players + new_players
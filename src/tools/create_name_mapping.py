@@ -1,28 +1,34 @@
 import os
-import pickle
 import argparse
-from configs.paths import SCORES_2014, SCORES_2020, TEST_DATA_PATH, TRAIN_DATA_PATH, MODEL_DIR
-from utils.name_mapping import create_name_mapping
+from configs.paths import SCORES_PATHS, TEST_DATA_PATH, TRAIN_DATA_PATH, MODEL_DIR, NAME_INDEX_PATH
+from configs.constants import FUZZY_MATCH_THRESHOLD
+from utils.name_mapping import build_name_index, extend_name_index
 from tournaments.data_cleaning import get_all_tournament_data
 from scores.data_cleaning import get_combined_scores
 
 if __name__ == '__main__':
       argparser  = argparse.ArgumentParser()
-      argparser.add_argument('--scores-2014', type=str, default=SCORES_2014, help='Path to ELO 2014 scores')
-      argparser.add_argument('--scores-2020', type=str, default=SCORES_2020, help='Path to ELO 2020 scores')
+      argparser.add_argument('--scores', type=str, nargs='+', default=list(SCORES_PATHS.values()), help='Paths to ELO score snapshots')
       argparser.add_argument('--tournament-train', type=str, default=TRAIN_DATA_PATH, help='Path to tournament training data')
       argparser.add_argument('--tournament-test', type=str, default=TEST_DATA_PATH, help='Path to tournament testing data')
+      argparser.add_argument('--fuzzy', action='store_true', help='Also merge players whose names differ only by spelling, spacing or name order')
+      argparser.add_argument('--threshold', type=float, default=FUZZY_MATCH_THRESHOLD, help='Minimum similarity of two names merged by --fuzzy')
+      argparser.add_argument('--incremental', action='store_true', help='Add new names to the existing mapping without renumbering players')
 
       args = argparser.parse_args()
 
-      scores = get_combined_scores(args.scores_2014, args.scores_2020)
+      scores = get_combined_scores({str(i): path for i, path in enumerate(args.scores)})
       tournaments_train = get_all_tournament_data(args.tournament_train, True)
       tournaments_test = get_all_tournament_data(args.tournament_test, True)
       names = tournaments_train.reindex(columns=['white', 'black']).stack().unique().tolist() \
             + tournaments_test.reindex(columns=['white', 'black']).stack().unique().tolist() \
             + scores.index.tolist()
-      name_mapping = create_name_mapping(names)
 
-      os.makedirs(MODEL_DIR, exist_ok=True)
-      with open(f'{MODEL_DIR}/name_mapping.pickle', 'wb') as f:
-            pickle.dump(name_mapping, f)
\ No newline at end of file
+      if args.incremental and os.path.isfile(NAME_INDEX_PATH):
+            new_players = extend_name_index(names, NAME_INDEX_PATH)
+            print(f'Added {len(new_players)} new players')
+      else:
+            name_index = build_name_index(names, args.fuzzy, args.threshold)
+            print(f'Mapped {len(name_index.names)} names to {len(name_index.players)} players')
+            os.makedirs(MODEL_DIR, exist_ok=True)
+            name_index.save(NAME_INDEX_PATH)
\ No newline at end of file
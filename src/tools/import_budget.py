@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+import socket
+import argparse
+import subprocess
+import urllib.error
+import urllib.request
+import pandas as pd
+
+from configs.constants import IMPORT_TIME_BUDGET_SECONDS, IMPORT_MODULE_BUDGET_SECONDS, DEFERRED_IMPORTS, FIRST_REQUEST_BUDGET_SECONDS
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_TIME_PREFIX = 'import time:'
+
+def measure_imports(module: str) -> pd.DataFrame:
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], capture_output=True, text=True, check=True, cwd=SRC_DIR)
+    rows = []
+    for line in process.stderr.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX) or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len(IMPORT_TIME_PREFIX):].split('|')
+        rows.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_seconds': int(self_us) / 1e6,
+            'cumulative_seconds': int(cumulative_us) / 1e6,
+        })
+    return pd.DataFrame(rows)
+
+def get_total(df: pd.DataFrame, module: str) -> float:
+    return df.loc[df['module'] == module, 'cumulative_seconds'].iloc[0]
+
+def _get_subtree(df: pd.DataFrame, module: str) -> pd.DataFrame:
+    root = df.index[df['module'] == module][0]
+    start = root
+    while start > 0 and df.at[start - 1, 'depth'] > df.at[root, 'depth']:
+        start -= 1
+    return df.loc[start:root]
+
+def get_breakdown(df: pd.DataFrame, module: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    df = _get_subtree(df, module)
+    root_depth = df['depth'].iloc[-1]
+    direct = df[df['depth'] == root_depth + 1].sort_values('cumulative_seconds', ascending=False)
+    packages = df.assign(package=df['module'].str.split('.').str[0]).groupby('package')['self_seconds'].sum()
+    return direct.reindex(columns=['module', 'cumulative_seconds']), packages.sort_values(ascending=False).rename('seconds').reset_index()
+
+def _get_free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def measure_first_request(timeout: float) -> dict[str, float]:
+    port = _get_free_port()
+    env = os.environ | {'HOST': '127.0.0.1', 'PORT': str(port), 'WORKERS': '1'}
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, f'{SRC_DIR}/api/app.py'], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    timings = {}
+    try:
+        while 'ready_seconds' not in timings and time.perf_counter() - start < timeout:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/ready', timeout=1)
+                timings.setdefault('first_request_seconds', time.perf_counter() - start)
+                timings['ready_seconds'] = time.perf_counter() - start
+            except urllib.error.HTTPError:
+                timings.setdefault('first_request_seconds', time.perf_counter() - start)
+            except urllib.error.URLError:
+                pass
+            time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait()
+    return timings
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--module', type=str, default='api.app', help='Module whose import time is measured')
+    argparser.add_argument('--budget', type=float, default=IMPORT_TIME_BUDGET_SECONDS, help='Maximum import time of the module in seconds')
+    argparser.add_argument('--module-budget', type=float, default=IMPORT_MODULE_BUDGET_SECONDS, help='Maximum import time of every direct import of the module in seconds')
+    argparser.add_argument('--first-request-budget', type=float, default=FIRST_REQUEST_BUDGET_SECONDS, help='Maximum time from starting the API until it answers GET /ready in seconds')
+    argparser.add_argument('--first-request', action='store_true', help='Also start the API and measure the time to its first response')
+    argparser.add_argument('--repeats', type=int, default=3, help='Number of measurements (the fastest is reported)')
+    argparser.add_argument('--top', type=int, default=15, help='Number of rows in the breakdowns')
+
+    args = argparser.parse_args()
+
+    runs = [measure_imports(args.module) for _ in range(args.repeats)]
+    df = min(runs, key=lambda run: get_total(run, args.module))
+    total = get_total(df, args.module)
+    direct, packages = get_breakdown(df, args.module)
+    print(f'Direct imports of {args.module}:')
+    print(direct.head(args.top).to_string(index=False))
+    print('\nSelf time per top-level package:')
+    print(packages.head(args.top).to_string(index=False))
+
+    failures = []
+    print(f'\nimport {args.module}: {total:.3f}s (budget {args.budget:.3f}s)')
+    if total > args.budget:
+        failures.append('import')
+    over_budget = direct[direct['cumulative_seconds'] > args.module_budget]
+    if not over_budget.empty:
+        print(f'direct imports over {args.module_budget:.3f}s: {", ".join(over_budget["module"])}')
+        failures.append('direct imports')
+    deferred = sorted(set(packages['package']) & set(DEFERRED_IMPORTS))
+    if deferred:
+        print(f'imported at start: {", ".join(deferred)}')
+        failures.append('deferred imports')
+    if args.first_request:
+        timings = measure_first_request(timeout=max(args.first_request_budget * 10, 60))
+        first_request = timings.get('first_request_seconds', float('inf'))
+        print(f'first request: {first_request:.3f}s (budget {args.first_request_budget:.3f}s), ready: {timings.get("ready_seconds", float("inf")):.3f}s')
+        if first_request > args.first_request_budget:
+            failures.append('first request')
+    if failures:
+        print(f'Over budget: {", ".join(failures)}')
+        sys.exit(1)
@@ -0,0 +1,17 @@
+import argparse
+from configs.paths import TRAIN_DATA_PATH, TRAIN_DATASET_PATH
+from tournaments.data_cleaning import GAME_ID_COLUMNS, get_all_tournament_data, get_game_ids
+from tournaments.dataset import DATASET_SCHEME, write_dataset, list_dataset_files
+
+if __name__ == '__main__':
+      argparser  = argparse.ArgumentParser()
+      argparser.add_argument('--data-path', type=str, default=TRAIN_DATA_PATH, help='Directory of tournament JSON files')
+      argparser.add_argument('--dataset-path', type=str, default=TRAIN_DATASET_PATH, help='Directory of the partitioned dataset, replaced if it exists')
+
+      args = argparser.parse_args()
+
+      df = get_all_tournament_data(args.data_path, True)
+      df[GAME_ID_COLUMNS] = get_game_ids(args.data_path).to_numpy()
+      write_dataset(df, args.dataset_path)
+      files = list_dataset_files(f'{DATASET_SCHEME}://{args.dataset_path}')
+      print(f"Wrote {df.shape[0]} games of {df['tournament_id'].nunique()} tournaments to {len(files)} partitions in {args.dataset_path}")
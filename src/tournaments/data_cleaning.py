@@ -1,71 +1,178 @@
 import os
+import re
+import orjson
+import numpy as np
 import pandas as pd
+from typing import Callable, Iterator, Optional
+from concurrent.futures import ProcessPoolExecutor
 
-def _extract_games_df(nested_games: pd.Series) -> pd.DataFrame:
-    df_games_raw = nested_games.explode().reset_index()
-    df_games = pd.concat([
-        df_games_raw['index'],
-        pd.DataFrame(df_games_raw['games'].tolist())
-    ], axis=1)
-    return df_games
-
-def _rename_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.rename(columns={
-        'index':'tour_id',
-        'name': 'tournament_id',
-        'tours': 'num_tours',
-        'id': 'game_id'
-    })
-    return df
+from configs.constants import LOADING_CHUNK_SIZE
+from tournaments.dataset import is_dataset_uri, read_dataset
+from utils.instrumentation import instrumented
+from utils.error_codes import JsonDirectoryRequiredException
 
-def _reindex_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.reindex(columns=[
-        'tournament_id', 'tour_id', 'game_id',
-        'start_date', 'end_date', 'date',
-        'time_control',
-        'white', 'black', 'result',
-        'num_tours'
-    ])
-    return df
+CLEAN_COLUMNS = [
+    'tournament_id', 'tour_id', 'game_id',
+    'start_date', 'end_date', 'date',
+    'time_control',
+    'white', 'black', 'result',
+    'num_tours'
+]
 
-def _clean_ids(df: pd.DataFrame) -> pd.DataFrame:
-    df['tournament_id'] = df['tournament_id'].str.strip('tournament_').str.strip('test_').astype(int)
-    df['tour_id'] = df['tour_id'].str.strip('tour_').astype(int)
-    df['game_id'] = df['game_id'].str.strip('tournament_').str.rsplit('_', 1).str[1].astype(int)
-    return df
+GAME_ID_COLUMNS = ['tournament', 'tour', 'id']
+SORT_ID_COLUMNS = ['tournament_id', 'tour_id', 'game_id']
 
-def _convert_dates(df: pd.DataFrame) -> pd.DataFrame:
-    df['start_date'] = df['start_date'].map(pd.to_datetime)
-    df['end_date'] = df['end_date'].map(pd.to_datetime)
-    df['date'] = df['date'].map(pd.to_datetime)
-    return df
+def _natural_sort_key(name: str) -> list[str | int]:
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)]
 
-def _clean_data(df: pd.DataFrame) -> pd.DataFrame:
-    df = _rename_columns(df)
-    df = _reindex_columns(df)
-    df = _clean_ids(df)
-    df = _convert_dates(df)
-    return df
+def list_tournament_files(data_path: str) -> list[str]:
+    if is_dataset_uri(data_path):
+        raise JsonDirectoryRequiredException
+    files = [file for file in os.listdir(data_path) if file.endswith('.json')]
+    files = sorted(files, key=_natural_sort_key)
+    return [f'{data_path}/{file}' for file in files]
+
+def _parse_id(text: str) -> int:
+    return int(text.rsplit('_', 1)[1])
+
+def _extract_games(tournament: dict) -> tuple[list[str], list[dict]]:
+    tour_names, games = [], []
+    for tour_name, tour_games in tournament['games'].items():
+        tour_names.extend([tour_name] * len(tour_games))
+        games.extend(tour_games)
+    return tour_names, games
 
-def _get_tournament_data(path: str, clean_data: bool) -> pd.DataFrame:
-    df_tournament = pd.read_json(path)
-    df_games = _extract_games_df(df_tournament['games'])
-    df = df_tournament.reset_index().merge(df_games, on='index')
+def _get_raw_columns(tournament: dict, tour_names: list[str], games: list[dict]) -> dict[str, np.ndarray]:
+    num_games = len(games)
+    columns = {'index': np.array(tour_names, dtype=object)}
+    for key in ['name', 'start_date', 'end_date', 'tours', 'time_control']:
+        columns[key] = np.full(num_games, tournament[key], dtype=object if isinstance(tournament[key], str) else None)
+    for key in dict.fromkeys(key for game in games for key in game):
+        columns[key] = np.array([game.get(key) for game in games], dtype=float if key == 'result' else object)
+    return columns
+
+def _get_clean_columns(tournament: dict, tour_names: list[str], games: list[dict]) -> dict[str, np.ndarray]:
+    num_games = len(games)
+    columns = {
+        'tournament_id': np.full(num_games, _parse_id(tournament['name']), dtype=np.int64),
+        'tour_id': np.array([_parse_id(tour_name) for tour_name in tour_names], dtype=np.int64),
+        'game_id': np.array([_parse_id(game['id']) for game in games], dtype=np.int64),
+        'start_date': np.full(num_games, np.datetime64(tournament['start_date'], 'ns')),
+        'end_date': np.full(num_games, np.datetime64(tournament['end_date'], 'ns')),
+        'date': np.array([game['date'] for game in games], dtype='datetime64[ns]'),
+        'time_control': np.full(num_games, tournament['time_control'], dtype=object),
+        'white': np.array([game['white'] for game in games], dtype=object),
+        'black': np.array([game['black'] for game in games], dtype=object),
+        'result': np.array([game.get('result', np.nan) for game in games], dtype=float),
+        'num_tours': np.full(num_games, tournament['tours'], dtype=np.int64),
+    }
+    return columns
+
+def read_tournament(path: str) -> dict:
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def _read_game_ids(path: str) -> dict[str, np.ndarray]:
+    tournament = read_tournament(path)
+    tour_names, games = _extract_games(tournament)
+    columns = {
+        'tournament': np.full(len(games), tournament['name'], dtype=object),
+        'tour': np.array(tour_names, dtype=object),
+        'id': np.array([game['id'] for game in games], dtype=object),
+    }
+    return columns
+
+def _read_tournament_columns(path: str, clean_data: bool) -> dict[str, np.ndarray]:
+    tournament = read_tournament(path)
+    tour_names, games = _extract_games(tournament)
     if clean_data:
-        df = _clean_data(df)
-    return df
+        return _get_clean_columns(tournament, tour_names, games)
+    return _get_raw_columns(tournament, tour_names, games)
+
+def _read_tournament_columns_clean(path: str) -> dict[str, np.ndarray]:
+    return _read_tournament_columns(path, True)
+
+def _read_tournament_columns_raw(path: str) -> dict[str, np.ndarray]:
+    return _read_tournament_columns(path, False)
+
+def _map_files(reader: Callable[[str], dict[str, np.ndarray]], paths: list[str], n_jobs: Optional[int] = None) -> Iterator[dict[str, np.ndarray]]:
+    n_jobs = min(n_jobs or os.cpu_count() or 1, max(len(paths) // LOADING_CHUNK_SIZE, 1))
+    if n_jobs == 1:
+        yield from map(reader, paths)
+        return
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        yield from executor.map(reader, paths, chunksize=LOADING_CHUNK_SIZE)
+
+def _iter_columns(paths: list[str], clean_data: bool, n_jobs: Optional[int] = None) -> Iterator[dict[str, np.ndarray]]:
+    reader = _read_tournament_columns_clean if clean_data else _read_tournament_columns_raw
+    yield from _map_files(reader, paths, n_jobs)
+
+def iter_tournament_columns(data_path: str, clean_data: bool, n_jobs: Optional[int] = None) -> Iterator[dict[str, np.ndarray]]:
+    yield from _iter_columns(list_tournament_files(data_path), clean_data, n_jobs)
+
+def iter_tournament_data(data_path: str, clean_data: bool, n_jobs: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    for columns in iter_tournament_columns(data_path, clean_data, n_jobs):
+        yield pd.DataFrame(columns)
+
+def _concat_columns(chunks: list[dict[str, np.ndarray]]) -> pd.DataFrame:
+    names = list(dict.fromkeys(name for chunk in chunks for name in chunk))
+    columns = {}
+    for name in names:
+        arrays = [chunk[name] if name in chunk else np.full(len(next(iter(chunk.values()))), np.nan) for chunk in chunks]
+        columns[name] = np.concatenate(arrays)
+    return pd.DataFrame(columns)
 
 def _sort_values(df: pd.DataFrame) -> pd.DataFrame:
     columns = ['tournament_id', 'tour_id', 'game_id', 'start_date', 'end_date', 'date', 'white', 'black']
     df = df.sort_values(columns).reset_index(drop=True)
     return df
 
-def get_all_tournament_data(data_path: str, clean_data: bool) -> pd.DataFrame:
-    data = []
-    for file in os.listdir(data_path):
-        df_tournament = _get_tournament_data(f'{data_path}/{file}', clean_data)
-        data.append(df_tournament)
-    df = pd.concat(data, axis=0) if len(data) > 1 else data
+@instrumented('get_tournament_data')
+def get_tournament_data(paths: list[str], clean_data: bool, n_jobs: Optional[int] = None,
+        source_column: Optional[str] = None) -> pd.DataFrame:
+    chunks = list(_iter_columns(paths, clean_data, n_jobs))
+    if source_column is not None:
+        for path, chunk in zip(paths, chunks):
+            chunk[source_column] = np.full(len(next(iter(chunk.values()))), os.path.basename(path), dtype=object)
+    df = _concat_columns(chunks)
     if clean_data:
+        df = df.reindex(columns=CLEAN_COLUMNS + ([source_column] if source_column is not None else []))
         df = _sort_values(df)
-    return df
\ No newline at end of file
+    return df
+
+def get_game_positions(tournaments: list[dict]) -> np.ndarray:
+    keys = np.array([
+        (_parse_id(tournament['name']), _parse_id(tour_name), _parse_id(game['id']))
+        for tournament in tournaments for tour_name, games in tournament['games'].items() for game in games
+    ], dtype=np.int64).reshape(-1, 3)
+    order = np.lexsort((keys[:, 2], keys[:, 1], keys[:, 0]))
+    positions = np.empty_like(order)
+    positions[order] = np.arange(order.shape[0])
+    return positions
+
+@instrumented('get_dataset_tournament_data')
+def get_dataset_tournament_data(uri: str) -> pd.DataFrame:
+    return _sort_values(read_dataset(uri, CLEAN_COLUMNS))
+
+@instrumented('get_all_tournament_data')
+def get_all_tournament_data(data_path: str, clean_data: bool, n_jobs: Optional[int] = None) -> pd.DataFrame:
+    if is_dataset_uri(data_path) and clean_data:
+        return get_dataset_tournament_data(data_path)
+    return get_tournament_data(list_tournament_files(data_path), clean_data, n_jobs)
+
+@instrumented('get_game_ids')
+def get_game_ids(data_path: str) -> pd.DataFrame:
+    if is_dataset_uri(data_path):
+        df = read_dataset(data_path, SORT_ID_COLUMNS + GAME_ID_COLUMNS)
+        df = df.sort_values(SORT_ID_COLUMNS, kind='stable').reset_index(drop=True)
+        return df[GAME_ID_COLUMNS]
+    df = _concat_columns(list(_map_files(_read_game_ids, list_tournament_files(data_path))))
+    if df.empty:
+        return pd.DataFrame(columns=GAME_ID_COLUMNS)
+    order = np.lexsort((
+        df['id'].map(_parse_id).to_numpy(),
+        df['tour'].map(_parse_id).to_numpy(),
+        df['tournament'].map(_parse_id).to_numpy(),
+    ))
+    df = df.iloc[order].reset_index(drop=True)
+    return df
@@ -0,0 +1,65 @@
+import os
+import shutil
+import operator
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from functools import reduce
+from typing import Optional
+from urllib.parse import urlsplit, parse_qs
+
+from configs.constants import DATASET_ROW_GROUP_SIZE
+from utils.error_codes import DatasetFilterException
+
+DATASET_SCHEME = 'dataset'
+PARTITIONING = ds.partitioning(pa.schema([('year', pa.int16()), ('time_control', pa.string())]), flavor='hive')
+FILTERS = ['date_from', 'date_to', 'time_control', 'tournament_id']
+SORT_COLUMNS = ['start_date', 'tournament_id', 'tour_id', 'game_id']
+
+def is_dataset_uri(data_path: str) -> bool:
+    return data_path.startswith(f'{DATASET_SCHEME}://')
+
+def parse_dataset_uri(uri: str) -> tuple[str, dict[str, list[str]]]:
+    parts = urlsplit(uri)
+    filters = {key: [value for text in texts for value in text.split(',') if value] for key, texts in parse_qs(parts.query).items()}
+    if any(key not in FILTERS for key in filters):
+        raise DatasetFilterException
+    return parts.netloc + parts.path, filters
+
+def get_filter_expression(filters: dict[str, list[str]]) -> Optional[ds.Expression]:
+    expressions = []
+    try:
+        if 'time_control' in filters:
+            expressions.append(ds.field('time_control').isin(filters['time_control']))
+        if 'tournament_id' in filters:
+            expressions.append(ds.field('tournament_id').isin([int(value) for value in filters['tournament_id']]))
+        for key, column, compare, select in [('date_from', 'start_date', operator.ge, max), ('date_to', 'end_date', operator.le, min)]:
+            if key in filters:
+                bound = select(pd.Timestamp(value) for value in filters[key])
+                expressions.append(compare(ds.field('year'), bound.year))
+                expressions.append(compare(ds.field(column), pa.scalar(bound.to_datetime64(), type=pa.timestamp('ns'))))
+    except ValueError as error:
+        raise DatasetFilterException from error
+    return reduce(operator.and_, expressions) if expressions else None
+
+def _open_dataset(path: str) -> ds.Dataset:
+    return ds.dataset(path, format='parquet', partitioning=PARTITIONING)
+
+def list_dataset_files(uri: str) -> list[str]:
+    path, filters = parse_dataset_uri(uri)
+    return sorted(fragment.path for fragment in _open_dataset(path).get_fragments(filter=get_filter_expression(filters)))
+
+def read_dataset(uri: str, columns: list[str]) -> pd.DataFrame:
+    path, filters = parse_dataset_uri(uri)
+    table = _open_dataset(path).to_table(columns=columns, filter=get_filter_expression(filters))
+    return table.to_pandas()
+
+def write_dataset(df: pd.DataFrame, path: str) -> None:
+    df = df.assign(year=df['start_date'].dt.year.astype(np.int16)).sort_values(SORT_COLUMNS, kind='stable')
+    path_tmp = f'{path}.{os.getpid()}.tmp'
+    shutil.rmtree(path_tmp, ignore_errors=True)
+    ds.write_dataset(pa.Table.from_pandas(df, preserve_index=False), path_tmp, format='parquet', partitioning=PARTITIONING,
+                     max_rows_per_group=DATASET_ROW_GROUP_SIZE, existing_data_behavior='error')
+    shutil.rmtree(path, ignore_errors=True)
+    os.rename(path_tmp, path)
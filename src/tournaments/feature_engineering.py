@@ -2,20 +2,21 @@ import numpy as np
 import pandas as pd
 from datetime import timedelta
 
-from utils.name_mapping import map_name_to_players, get_name_mapping
+from utils.name_mapping import MappedNameIndex, get_name_index
 from configs.constants import BLACK_WIN, DRAW, WHITE_WIN
-
-def _get_number_of_unique_players(df: pd.DataFrame) -> pd.DataFrame:
-    number = df.reindex(columns=['white','black']).stack().unique().shape[0]
-    return number
+from utils.instrumentation import instrumented
+from scores.rating_table import RatingTable, get_player_ids
 
 def _add_number_of_players(df: pd.DataFrame) -> pd.DataFrame:
     if 'num_players' in df.columns:
         df = df.drop(columns=['num_players'])
-    df = df.merge(df.groupby(['tournament_id', 'tour_id']).apply(_get_number_of_unique_players).rename('num_players'), 
-             on=['tournament_id', 'tour_id'],
-             how='outer'
-    )
+    keys = ['tournament_id', 'tour_id']
+    players = pd.concat([
+        df.reindex(columns=keys + ['white']).rename(columns={'white': 'player'}),
+        df.reindex(columns=keys + ['black']).rename(columns={'black': 'player'})
+    ], axis=0, ignore_index=True)
+    num_players = players.groupby(keys)['player'].transform('nunique')
+    df['num_players'] = num_players.iloc[:df.shape[0]].values
     return df
 
 def _convert_time_control(df: pd.DataFrame) -> pd.DataFrame:
@@ -25,23 +26,23 @@ def _convert_time_control(df: pd.DataFrame) -> pd.DataFrame:
     df = df.drop(columns=['time_control'])
     return df
 
-def _get_tournament_type(df: pd.DataFrame) -> str:
-    players = df.reindex(columns=['tour_id', 'num_players']).drop_duplicates()
-
-    value = np.nan
-    if players['num_players'].unique().shape[0] == 1:
-        starting_number = players[players['tour_id'] == 1]['num_players'].iloc[0]
-        if starting_number * (starting_number - 1) / 2 == players.shape[0]:
-            value = 'round_robin'
-        else:
-            value = 'swiss'
-    elif (players['num_players'].diff(1).fillna(-np.inf) < 0).all():
-        value = 'knockout'
-    return value
-
 def _get_all_tournament_types(df: pd.DataFrame) -> pd.DataFrame:
-    res = df.groupby('tournament_id').apply(_get_tournament_type).rename('tournament_type')
-    df = df.merge(res, on='tournament_id', how='outer')
+    tours = df.reindex(columns=['tournament_id', 'tour_id', 'num_players']).drop_duplicates()
+    grouped = tours.groupby('tournament_id')['num_players']
+    num_sizes = grouped.transform('nunique')
+    num_tours = grouped.transform('size')
+    starting_number = tours['num_players'].where(tours['tour_id'] == 1).groupby(tours['tournament_id']).transform('first')
+    is_decreasing = (grouped.diff(1).fillna(-np.inf) < 0).groupby(tours['tournament_id']).transform('all')
+
+    is_constant = num_sizes == 1
+    is_round_robin = is_constant & (starting_number * (starting_number - 1) / 2 == num_tours)
+    tournament_type = pd.Series(np.nan, index=tours.index, dtype=object)
+    tournament_type[~is_constant & is_decreasing] = 'knockout'
+    tournament_type[is_constant & ~is_round_robin] = 'swiss'
+    tournament_type[is_round_robin] = 'round_robin'
+
+    tournament_type = tournament_type.groupby(tours['tournament_id']).first()
+    df['tournament_type'] = df['tournament_id'].map(tournament_type)
     return df
 
 def _one_hot_tournament_type(df: pd.DataFrame) -> pd.DataFrame:
@@ -57,37 +58,20 @@ def _add_tournament_type(df: pd.DataFrame) -> pd.DataFrame:
     df = _one_hot_tournament_type(df)
     return df
 
-def _get_tournament_duration(df: pd.DataFrame) -> int:
-    duration = (df['end_date'] - df['start_date'] + timedelta(days=1)).dt.days
-    return duration
-
 def _add_tournament_duration(df: pd.DataFrame) -> pd.DataFrame:
-    duration = df.groupby('tournament_id').apply(_get_tournament_duration).reset_index(drop=True).rename('tournament_duration_days')
-    df = df.merge(duration, left_index=True, right_index=True, how='outer')
+    df['tournament_duration_days'] = (df['end_date'] - df['start_date'] + timedelta(days=1)).dt.days
     return df
 
-def _get_days_since_tournament_start(df: pd.DataFrame) -> pd.DataFrame:
-    days = (df['date'] - df['start_date']).dt.days
-    return days
-
 def _add_days_since_tournament_start(df: pd.DataFrame) -> pd.DataFrame:
-    days = df.groupby('tournament_id').apply(_get_days_since_tournament_start).reset_index(drop=True).rename('days_since_start')
-    df = df.merge(days, left_index=True, right_index=True, how='outer')
+    df['days_since_start'] = (df['date'] - df['start_date']).dt.days
     return df
 
-def add_scores(df: pd.DataFrame, df_scores: pd.DataFrame) -> pd.DataFrame:
-    df_scores = df_scores
-    df = df.merge(df_scores.rename(columns={'score_2014': 'white_score_2014', 'score_2020': 'white_score_2020'}),
-                   left_on='white',
-                   right_index=True,
-                   how='left')
-    df = df.merge(df_scores.rename(columns={'score_2014': 'black_score_2014', 'score_2020': 'black_score_2020'}),
-                   left_on='black',
-                   right_index=True,
-                   how='left')
-    df = df.sort_index()
-    score_columns = ['white_score_2014', 'white_score_2020', 'black_score_2014', 'black_score_2020']
-    df[score_columns] = df[score_columns].fillna(0).astype(int)
+@instrumented('add_scores')
+def add_scores(df: pd.DataFrame, rating_table: RatingTable) -> pd.DataFrame:
+    for color in ['white', 'black']:
+        ratings = rating_table.gather(get_player_ids(df[color]))
+        for i, column in enumerate(rating_table.columns):
+            df[f'{color}_{column}'] = ratings[:, i].astype(int)
     return df
 
 def _convert_tour_as_completion_percentage(df: pd.DataFrame) -> pd.DataFrame:
@@ -107,19 +91,25 @@ def _map_result(df: pd.DataFrame) -> pd.DataFrame:
     df['result'] = df['result'].map(result_map)
     return df
 
-def _map_names(df: pd.DataFrame, name_mapping: dict[str, str]) -> pd.DataFrame:
-    df['white'] = df['white'].map(map_name_to_players(df['white'].tolist(), name_mapping).set_index('orig_name')['mapped'].to_dict())
-    df['black'] = df['black'].map(map_name_to_players(df['black'].tolist(), name_mapping).set_index('orig_name')['mapped'].to_dict())
+def _map_names(df: pd.DataFrame, name_index: MappedNameIndex) -> pd.DataFrame:
+    players = name_index.resolve(pd.concat([df['white'], df['black']], ignore_index=True))
+    df['white'] = players[:df.shape[0]]
+    df['black'] = players[df.shape[0]:]
     return df
 
-def create_features_tournament(df_orig: pd.DataFrame) -> pd.DataFrame:
-    df = df_orig.copy()
+def create_structure_features(df: pd.DataFrame) -> pd.DataFrame:
     df = _add_number_of_players(df)
     df = _convert_time_control(df)
     df = _add_tournament_type(df)
     df = _convert_tour_as_completion_percentage(df)
     df = _convert_tournament_as_completion_percentage(df)
-    name_mapping = get_name_mapping()
-    df = _map_names(df, name_mapping)
+    return df
+
+@instrumented('create_features_tournament')
+def create_features_tournament(df_orig: pd.DataFrame) -> pd.DataFrame:
+    df = df_orig.copy()
+    df = create_structure_features(df)
+    name_index = get_name_index()
+    df = _map_names(df, name_index)
     df = _map_result(df)
     return df
\ No newline at end of file
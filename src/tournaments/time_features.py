@@ -0,0 +1,126 @@
+from __future__ import annotations
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+from configs.constants import BLACK_WIN, DRAW, WHITE_WIN, ELO_INITIAL, ELO_K_FACTOR, FORM_INITIAL, FORM_ALPHA
+from scores.rating_table import get_player_ids
+from utils.instrumentation import instrumented
+
+TIME_FEATURE_COLUMNS = [
+    'white_elo', 'black_elo',
+    'white_games_played', 'black_games_played',
+    'white_form', 'black_form',
+    'h2h_games', 'h2h_score',
+]
+WHITE_SCORES = {WHITE_WIN: 1.0, DRAW: 0.5, BLACK_WIN: 0.0}
+
+class TimeFeatureState:
+    def __init__(self) -> None:
+        self.elo = np.zeros(0)
+        self.games_played = np.zeros(0, dtype=np.int64)
+        self.form = np.zeros(0)
+        self.h2h: dict[tuple[int, int], list[float]] = {}
+        self.last_date: Optional[np.datetime64] = None
+        self.data_key: Optional[str] = None
+
+    def _reserve(self, n_players: int) -> None:
+        n_new = n_players - self.elo.shape[0]
+        if n_new > 0:
+            self.elo = np.concatenate([self.elo, np.full(n_new, ELO_INITIAL, dtype=float)])
+            self.games_played = np.concatenate([self.games_played, np.zeros(n_new, dtype=np.int64)])
+            self.form = np.concatenate([self.form, np.full(n_new, FORM_INITIAL, dtype=float)])
+
+    def _get_h2h(self, white: np.ndarray, black: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        games, score = np.zeros(white.shape[0]), np.zeros(white.shape[0])
+        for i, (w, b) in enumerate(zip(white.tolist(), black.tolist())):
+            record = self.h2h.get((w, b) if w < b else (b, w))
+            if record is not None:
+                games[i] = record[0]
+                score[i] = record[1] if w < b else record[0] - record[1]
+        return games, score
+
+    def _add_h2h(self, white: np.ndarray, black: np.ndarray, scores: np.ndarray) -> None:
+        for w, b, score in zip(white.tolist(), black.tolist(), scores.tolist()):
+            record = self.h2h.setdefault((w, b) if w < b else (b, w), [0.0, 0.0])
+            record[0] += 1
+            record[1] += score if w < b else 1 - score
+
+    def _get_features(self, white: np.ndarray, black: np.ndarray) -> np.ndarray:
+        known = (white >= 0) & (black >= 0)
+        w, b = np.where(white >= 0, white, 0), np.where(black >= 0, black, 0)
+        h2h_games, h2h_score = self._get_h2h(white[known], black[known])
+        features = np.column_stack([
+            np.where(white >= 0, self.elo[w], ELO_INITIAL), np.where(black >= 0, self.elo[b], ELO_INITIAL),
+            np.where(white >= 0, self.games_played[w], 0), np.where(black >= 0, self.games_played[b], 0),
+            np.where(white >= 0, self.form[w], FORM_INITIAL), np.where(black >= 0, self.form[b], FORM_INITIAL),
+            np.zeros(white.shape[0]), np.zeros(white.shape[0]),
+        ])
+        features[known, 6] = h2h_games
+        features[known, 7] = h2h_score
+        return features
+
+    def get_features(self, white: np.ndarray, black: np.ndarray) -> np.ndarray:
+        n_players = self.elo.shape[0]
+        return self._get_features(np.where(white < n_players, white, -1), np.where(black < n_players, black, -1))
+
+    def _update(self, white: np.ndarray, black: np.ndarray, scores: np.ndarray) -> None:
+        for player in [white, black]:
+            np.add.at(self.games_played, player[player >= 0], 1)
+        played = (white >= 0) & (black >= 0) & ~np.isnan(scores)
+        white, black, scores = white[played], black[played], scores[played]
+        expected = 1 / (1 + 10 ** ((self.elo[black] - self.elo[white]) / 400))
+        elo_delta = ELO_K_FACTOR * (scores - expected)
+        np.add.at(self.elo, white, elo_delta)
+        np.add.at(self.elo, black, -elo_delta)
+        self._update_form(np.concatenate([white, black]), np.concatenate([scores, 1 - scores]))
+        self._add_h2h(white, black, scores)
+
+    def _update_form(self, players: np.ndarray, scores: np.ndarray) -> None:
+        players, inverse = np.unique(players, return_inverse=True)
+        counts = np.bincount(inverse)
+        decay = (1 - FORM_ALPHA) ** counts
+        self.form[players] = decay * self.form[players] + (1 - decay) * np.bincount(inverse, weights=scores) / counts
+
+    def advance(self, dates: np.ndarray, white: np.ndarray, black: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        self._reserve(int(max(white.max(initial=-1), black.max(initial=-1))) + 1)
+        features = np.zeros([dates.shape[0], len(TIME_FEATURE_COLUMNS)])
+        boundaries = np.flatnonzero(dates[1:] != dates[:-1]) + 1
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, dates.shape[0]]):
+            features[start:end] = self._get_features(white[start:end], black[start:end])
+            self._update(white[start:end], black[start:end], scores[start:end])
+        if dates.shape[0]:
+            self.last_date = dates[-1]
+        return features
+
+    def is_before(self, dates: pd.Series) -> bool:
+        return self.last_date is None or dates.empty or dates.min() > self.last_date
+
+    def save(self, path: str) -> None:
+        path_tmp = f'{path}.{os.getpid()}.tmp'
+        with open(path_tmp, 'wb') as f:
+            pickle.dump(self.__dict__, f)
+        os.replace(path_tmp, path)
+
+    @staticmethod
+    def load(path: str) -> TimeFeatureState:
+        state = TimeFeatureState()
+        with open(path, 'rb') as f:
+            state.__dict__.update(pickle.load(f))
+        return state
+
+@instrumented('create_features_time')
+def create_features_time(df_orig: pd.DataFrame, state: Optional[TimeFeatureState] = None) -> pd.DataFrame:
+    df = df_orig.drop(columns=TIME_FEATURE_COLUMNS, errors='ignore')
+    state = state if state is not None else TimeFeatureState()
+    order = np.argsort(df['date'].to_numpy(), kind='stable')
+    dates = df['date'].to_numpy()[order]
+    white = get_player_ids(df['white'])[order]
+    black = get_player_ids(df['black'])[order]
+    scores = df['result'].map(WHITE_SCORES).to_numpy(dtype=float)[order]
+    features = np.empty([df.shape[0], len(TIME_FEATURE_COLUMNS)])
+    features[order] = state.advance(dates, white, black, scores)
+    df[TIME_FEATURE_COLUMNS] = features
+    return df
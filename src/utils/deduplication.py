@@ -0,0 +1,156 @@
+from __future__ import annotations
+import os
+import numpy as np
+from difflib import SequenceMatcher
+from functools import partial
+from typing import Callable, Iterable, Optional
+from concurrent.futures import ProcessPoolExecutor
+
+from configs.constants import RANDOM_SEED, FUZZY_NGRAM_SIZE, MINHASH_BANDS, MINHASH_ROWS, \
+                              FUZZY_MATCH_THRESHOLD, FUZZY_MAX_BUCKET_SIZE, FUZZY_CHUNK_SIZE
+from utils.instrumentation import instrumented
+
+CHAR_BASE = 0x110000
+CHAR_BUCKETS = 64
+BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+class UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i: int, j: int) -> None:
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    def union_pairs(self, pairs: Iterable[tuple[int, int]]) -> None:
+        for i, j in pairs:
+            self.union(i, j)
+
+    @property
+    def labels(self) -> np.ndarray:
+        parent = np.array(self.parent, dtype=np.int64)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                return parent
+            parent = grandparent
+
+def get_min_rotation(string: str) -> str:
+    return min((string[i:] + string[:i] for i in range(len(string))), default='')
+
+def _get_codepoints(strings: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    codepoints = np.frombuffer(''.join(strings).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    lengths = np.array([len(string) for string in strings], dtype=np.int64)
+    return codepoints, lengths
+
+def _get_shingles(strings: list[str], n: int = FUZZY_NGRAM_SIZE) -> tuple[np.ndarray, np.ndarray]:
+    codepoints, lengths = _get_codepoints([string.ljust(n) for string in strings])
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    string_starts, string_lengths = np.repeat(starts, lengths), np.repeat(lengths, lengths)
+    positions = np.arange(codepoints.shape[0]) - string_starts
+    shingles = np.zeros(codepoints.shape[0], dtype=np.uint64)
+    for k in range(n):
+        shingles += codepoints[string_starts + (positions + k) % string_lengths] * np.uint64(CHAR_BASE ** k)
+    return shingles, starts
+
+def _get_hash_params() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(RANDOM_SEED)
+    n_hashes = MINHASH_BANDS * MINHASH_ROWS
+    multipliers = rng.integers(1, 2 ** 63, n_hashes, dtype=np.uint64) | np.uint64(1)
+    increments = rng.integers(0, 2 ** 63, n_hashes, dtype=np.uint64)
+    return multipliers, increments
+
+def get_signatures(strings: list[str]) -> np.ndarray:
+    shingles, starts = _get_shingles(strings)
+    multipliers, increments = _get_hash_params()
+    hashes = (multipliers[:, None] * shingles[None, :] + increments[:, None]) >> np.uint64(32)
+    return np.minimum.reduceat(hashes, starts, axis=1).T.astype(np.uint32)
+
+def _get_band_keys(signatures: np.ndarray, band: int) -> np.ndarray:
+    keys = np.zeros(signatures.shape[0], dtype=np.uint64)
+    for row in range(band * MINHASH_ROWS, (band + 1) * MINHASH_ROWS):
+        keys = keys * BAND_MULTIPLIER + signatures[:, row].astype(np.uint64)
+    return keys
+
+def get_candidate_pairs(signatures: np.ndarray, max_bucket_size: int = FUZZY_MAX_BUCKET_SIZE) -> np.ndarray:
+    n = signatures.shape[0]
+    pairs = [np.zeros(0, dtype=np.int64)]
+    for band in range(MINHASH_BANDS):
+        keys = _get_band_keys(signatures, band)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        starts, ends = np.r_[0, boundaries], np.r_[boundaries, n]
+        bucket_ends = np.repeat(ends, ends - starts)
+        positions = np.flatnonzero(bucket_ends - np.arange(n) > 1)
+        for offset in range(1, max_bucket_size):
+            positions = positions[positions + offset < bucket_ends[positions]]
+            if not positions.size:
+                break
+            first, second = order[positions], order[positions + offset]
+            pairs.append(np.minimum(first, second) * n + np.maximum(first, second))
+    pairs = np.unique(np.concatenate(pairs))
+    return np.column_stack([pairs // n, pairs % n]) if n else np.zeros([0, 2], dtype=np.int64)
+
+def _get_char_counts(strings: list[str]) -> np.ndarray:
+    codepoints, lengths = _get_codepoints(strings)
+    cells = np.repeat(np.arange(len(strings)), lengths) * CHAR_BUCKETS + (codepoints % CHAR_BUCKETS).astype(np.int64)
+    return np.bincount(cells, minlength=len(strings) * CHAR_BUCKETS).reshape(len(strings), CHAR_BUCKETS).astype(np.int16)
+
+def get_similarity_bounds(strings: list[str], pairs: np.ndarray) -> np.ndarray:
+    counts = _get_char_counts(strings)
+    overlap = np.minimum(counts[pairs[:, 0]], counts[pairs[:, 1]]).sum(axis=1)
+    lengths = counts.sum(axis=1)
+    return 2 * overlap / np.maximum(lengths[pairs[:, 0]] + lengths[pairs[:, 1]], 1)
+
+def get_similarity(a: str, b: str, threshold: float = 0.0) -> float:
+    starts = {0} | {i for i in range(1, len(b)) if b[i] == a[:1]}
+    similarity = 0.0
+    for start in starts:
+        matcher = SequenceMatcher(None, a, b[start:] + b[:start], autojunk=False)
+        if matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold:
+            similarity = max(similarity, matcher.ratio())
+    return similarity
+
+def score_pairs(string_pairs: list[tuple[str, str]], threshold: float = FUZZY_MATCH_THRESHOLD) -> np.ndarray:
+    return np.array([get_similarity(a, b, threshold) for a, b in string_pairs], dtype=float)
+
+def _map_chunks(function: Callable, chunks: list, n_jobs: Optional[int]) -> list:
+    n_jobs = min(n_jobs or os.cpu_count() or 1, max(len(chunks), 1))
+    if n_jobs == 1:
+        return list(map(function, chunks))
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(function, chunks))
+
+def _split(items: list, chunk_size: int) -> list[list]:
+    return [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+
+@instrumented('find_duplicates')
+def find_duplicates(strings: list[str], threshold: float = FUZZY_MATCH_THRESHOLD, n_jobs: Optional[int] = None) -> np.ndarray:
+    uniques, inverse = np.unique(np.array(strings, dtype=object), return_inverse=True)
+    if threshold >= 1:
+        return inverse
+    uniques = uniques.tolist()
+    signatures = np.concatenate([np.zeros([0, MINHASH_BANDS * MINHASH_ROWS], dtype=np.uint32)]
+                                + _map_chunks(get_signatures, _split(uniques, FUZZY_CHUNK_SIZE), n_jobs))
+    pairs = get_candidate_pairs(signatures)
+    pairs = pairs[get_similarity_bounds(uniques, pairs) >= threshold]
+    string_pairs = [(uniques[i], uniques[j]) for i, j in pairs.tolist()]
+    similarities = np.concatenate([np.zeros(0)]
+                                  + _map_chunks(partial(score_pairs, threshold=threshold), _split(string_pairs, FUZZY_CHUNK_SIZE), n_jobs))
+    order = np.argsort(-similarities, kind='stable')
+    union_find = UnionFind(len(uniques))
+    for i, j in pairs[order[similarities[order] >= threshold]].tolist():
+        root_i, root_j = union_find.find(i), union_find.find(j)
+        if root_i != root_j and get_similarity(uniques[root_i], uniques[root_j], threshold) >= threshold:
+            union_find.union(root_i, root_j)
+    return union_find.labels[inverse]
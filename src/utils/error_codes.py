@@ -1,4 +1,39 @@
 class NoModelsFoundException(Exception):
     """Throw when no models can be found"""
     def __str__(self) -> str:
-        return "ETTCHS1000"
\ No newline at end of file
+        return "ETTCHS1000"
+
+class JobNotFoundException(Exception):
+    """Throw when a job id is unknown"""
+    def __str__(self) -> str:
+        return "ETTCHS1001"
+
+class JobNotFinishedException(Exception):
+    """Throw when the result of an unfinished job is requested"""
+    def __str__(self) -> str:
+        return "ETTCHS1002"
+
+class PredictionCountMismatchException(Exception):
+    """Throw when the number of predictions differs from the number of games"""
+    def __str__(self) -> str:
+        return "ETTCHS1003"
+
+class DatasetFilterException(Exception):
+    """Throw when a dataset URI contains an unknown or malformed filter"""
+    def __str__(self) -> str:
+        return "ETTCHS1004"
+
+class JsonDirectoryRequiredException(Exception):
+    """Throw when an operation needs the tournament JSON files but gets a dataset URI"""
+    def __str__(self) -> str:
+        return "ETTCHS1005"
+
+class UnsupportedParameterException(Exception):
+    """Throw when a model is created with a parameter value it does not support"""
+    def __str__(self) -> str:
+        return "ETTCHS1006"
+
+class TimeFeatureStateNotFoundException(Exception):
+    """Throw when time features are requested for prediction before they were built on training data"""
+    def __str__(self) -> str:
+        return "ETTCHS1007"
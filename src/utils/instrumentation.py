@@ -0,0 +1,117 @@
+import json
+import time
+import logging
+import resource
+import functools
+from threading import Lock
+from typing import Any, Callable, Iterator, Optional
+from contextlib import contextmanager
+
+from configs.constants import INSTRUMENTATION_ENABLED
+
+logger = logging.getLogger(__name__)
+
+METRICS = [
+    ('calls_total', 'counter', 'Number of completed calls of the stage'),
+    ('seconds_total', 'counter', 'Total wall time spent in the stage'),
+    ('rows_total', 'counter', 'Total number of rows returned by the stage'),
+    ('last_seconds', 'gauge', 'Wall time of the last call of the stage'),
+    ('last_rows', 'gauge', 'Number of rows returned by the last call of the stage'),
+    ('peak_rss_bytes', 'gauge', 'Peak resident memory of the process at the end of the last call of the stage'),
+]
+
+_enabled = INSTRUMENTATION_ENABLED
+_lock = Lock()
+_stats: dict[tuple[str, tuple[tuple[str, str], ...]], dict[str, float]] = {}
+
+def set_instrumentation(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+def configure_logging(level: int = logging.INFO) -> None:
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+def get_peak_rss_bytes() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def count_rows(result: Any) -> Optional[int]:
+    if isinstance(result, tuple) and result:
+        return count_rows(result[0])
+    if getattr(result, 'ndim', 0) > 0:
+        return result.shape[0]
+    if isinstance(result, list):
+        return len(result)
+    return None
+
+def _record(stage: str, labels: dict[str, str], seconds: float, rows: Optional[int]) -> None:
+    peak_rss = get_peak_rss_bytes()
+    key = (stage, tuple(sorted(labels.items())))
+    with _lock:
+        stats = _stats.setdefault(key, {'calls_total': 0, 'seconds_total': 0.0, 'rows_total': 0})
+        stats['calls_total'] += 1
+        stats['seconds_total'] += seconds
+        stats['rows_total'] += rows or 0
+        stats['last_seconds'] = seconds
+        stats['last_rows'] = rows or 0
+        stats['peak_rss_bytes'] = peak_rss
+    logger.info(json.dumps({
+        'event': 'stage',
+        'stage': stage,
+        **labels,
+        'seconds': round(seconds, 6),
+        'rows': rows,
+        'peak_rss_mb': round(peak_rss / 2 ** 20, 1),
+    }))
+
+class Stage:
+    def __init__(self, rows: Optional[int] = None) -> None:
+        self.rows = rows
+
+@contextmanager
+def stage(name: str, **labels: str) -> Iterator[Stage]:
+    current = Stage()
+    if not _enabled:
+        yield current
+        return
+    start = time.perf_counter()
+    yield current
+    _record(name, labels, time.perf_counter() - start, current.rows)
+
+def instrumented(name: str) -> Callable:
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(name) as current:
+                result = function(*args, **kwargs)
+                current.rows = count_rows(result)
+            return result
+        return wrapper
+    return decorator
+
+def get_stats() -> list[dict]:
+    with _lock:
+        return [{'stage': stage, **dict(labels), **stats} for (stage, labels), stats in _stats.items()]
+
+def _format_labels(stage: str, labels: tuple[tuple[str, str], ...]) -> str:
+    values = [('stage', stage)] + list(labels)
+    escaped = [(key, str(value).replace('\\', '\\\\').replace('"', '\\"')) for key, value in values]
+    return ','.join(f'{key}="{value}"' for key, value in escaped)
+
+def render_metrics(prefix: str = 'chess_stage') -> str:
+    with _lock:
+        stats = {key: dict(values) for key, values in _stats.items()}
+    lines = []
+    for metric, metric_type, description in METRICS:
+        lines.append(f'# HELP {prefix}_{metric} {description}')
+        lines.append(f'# TYPE {prefix}_{metric} {metric_type}')
+        for (stage, labels), values in sorted(stats.items()):
+            lines.append(f'{prefix}_{metric}{{{_format_labels(stage, labels)}}} {values[metric]}')
+    lines.append('# HELP chess_process_peak_rss_bytes Peak resident memory of the process')
+    lines.append('# TYPE chess_process_peak_rss_bytes gauge')
+    lines.append(f'chess_process_peak_rss_bytes {get_peak_rss_bytes()}')
+    return '\n'.join(lines) + '\n'
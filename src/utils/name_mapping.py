@@ -1,15 +1,26 @@
+from __future__ import annotations
+import os
+import json
+import uuid
+import shutil
 import pickle
-import pinyin
+import hashlib
 import unicodedata
+import numpy as np
 import pandas as pd
+from typing import Iterable, Optional
+from functools import lru_cache, cached_property
 from itertools import permutations
 
-from configs.paths import MODEL_DIR
+from configs.paths import NAME_INDEX_PATH, NAME_INDEX_MAPPED_DIR
+from configs.constants import NAME_CACHE_SIZE, FUZZY_MATCH_THRESHOLD
+from utils.deduplication import UnionFind, find_duplicates, get_min_rotation
 
 def is_english(text: str) -> bool:
     return text.isascii()
 
 def translate_chinese(text: str) -> str:
+    import pinyin
     translated = pinyin.get(text, format="strip", delimiter=" ")
     return translated
 
@@ -63,15 +74,205 @@ def create_name_mapping(names: list[str]) -> dict[str, str]:
     renamed_name_mapping = _rename_name_mapping(name_mapping)
     return renamed_name_mapping
 
-def get_name_mapping() -> dict[str, str]:
-    with open(f'{MODEL_DIR}/name_mapping.pickle', 'rb') as f:
-        name_mapping = pickle.load(f)
-        return name_mapping
-
 def map_name_to_players(names: list[str], name_mapping: dict[str, str]) -> dict[str, str]:
     df = pd.Series(names).rename('orig_name').to_frame()
     df_permutations = _get_clean_name_permutations(df)
     df_exploded_permutations = df_permutations.explode('clean_name_permutations')
     df_exploded_permutations['mapped'] = df_exploded_permutations['clean_name_permutations'].map(name_mapping)
     df_map = df_exploded_permutations.reindex(columns=['orig_name', 'mapped']).drop_duplicates()
-    return df_map
\ No newline at end of file
+    return df_map
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def get_clean_name(name: str) -> str:
+    clean_name = strip_accents(name.strip().lower())
+    if not is_english(clean_name):
+        clean_name = translate_chinese(clean_name)
+    clean_name = clean_name.replace(',', '')
+    return clean_name
+
+def get_name_key(name: str) -> str:
+    tokens = get_clean_name(name).split(' ')
+    return ''.join(sorted(tokens))
+
+class NameIndex:
+    def __init__(self, names: dict[str, str], keys: dict[str, str], lineage: Optional[str] = None) -> None:
+        self.names = names
+        self.keys = keys
+        self.lineage = lineage
+
+    @property
+    def players(self) -> list[str]:
+        players = set(self.names.values()) | set(self.keys.values())
+        return sorted(players, key=lambda player: int(player.rsplit('_', 1)[1]))
+
+    def _resolve_name(self, name: str) -> Optional[str]:
+        if name in self.names:
+            return self.names[name]
+        if not isinstance(name, str):
+            return None
+        return self.keys.get(get_name_key(name))
+
+    def resolve(self, names: Iterable[str]) -> list[Optional[str]]:
+        names = list(names)
+        resolved = {name: self._resolve_name(name) for name in dict.fromkeys(names)}
+        return [resolved[name] for name in names]
+
+    def extend(self, names: Iterable[str]) -> list[str]:
+        players = self.players
+        next_number = int(players[-1].rsplit('_', 1)[1]) + 1 if players else 0
+        new_players = []
+        for name in dict.fromkeys(names):
+            if not isinstance(name, str) or name in self.names:
+                continue
+            key = get_name_key(name)
+            if key not in self.keys:
+                self.keys[key] = f'player_{next_number}'
+                new_players.append(self.keys[key])
+                next_number += 1
+            self.names[name] = self.keys[key]
+        return new_players
+
+    def save(self, path: str) -> None:
+        path_tmp = f'{path}.{os.getpid()}.tmp'
+        with open(path_tmp, 'wb') as f:
+            pickle.dump({'names': self.names, 'keys': self.keys, 'lineage': self.lineage}, f)
+        os.replace(path_tmp, path)
+
+    @staticmethod
+    def load(path: str) -> NameIndex:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        return NameIndex(data['names'], data['keys'], data.get('lineage'))
+
+def _hash_names(names: list[bytes]) -> np.ndarray:
+    return np.array([int.from_bytes(hashlib.blake2b(name, digest_size=8).digest(), 'little') for name in names], dtype=np.uint64)
+
+class MappedNameTable:
+    ARRAY_NAMES = ['hashes', 'offsets', 'blob', 'players']
+
+    def __init__(self, hashes: np.ndarray, offsets: np.ndarray, blob: np.ndarray, players: np.ndarray) -> None:
+        self.hashes = hashes
+        self.offsets = offsets
+        self.blob = blob
+        self.players = players
+
+    @staticmethod
+    def from_dict(mapping: dict[str, str]) -> MappedNameTable:
+        names = [name.encode('utf-8') for name in mapping]
+        hashes = _hash_names(names)
+        order = np.argsort(hashes, kind='stable')
+        names = [names[i] for i in order]
+        offsets = np.concatenate([[0], np.cumsum([len(name) for name in names])]).astype(np.int64)
+        blob = np.frombuffer(b''.join(names), dtype=np.uint8)
+        players = np.array([int(player.rsplit('_', 1)[1]) for player in mapping.values()], dtype=np.int64)
+        return MappedNameTable(hashes[order], offsets, blob, players[order])
+
+    def get(self, names: list[str]) -> list[Optional[int]]:
+        names = [name.encode('utf-8') for name in names]
+        hashes = _hash_names(names)
+        starts = np.searchsorted(self.hashes, hashes, side='left').tolist()
+        ends = np.searchsorted(self.hashes, hashes, side='right').tolist()
+        players = [None] * len(names)
+        for i, (name, start, end) in enumerate(zip(names, starts, ends)):
+            for position in range(start, end):
+                if self.blob[self.offsets[position]:self.offsets[position + 1]].tobytes() == name:
+                    players[i] = int(self.players[position])
+                    break
+        return players
+
+    def save(self, path: str, prefix: str) -> None:
+        for name in self.ARRAY_NAMES:
+            np.save(f'{path}/{prefix}_{name}.npy', getattr(self, name), allow_pickle=False)
+
+    @staticmethod
+    def load(path: str, prefix: str) -> MappedNameTable:
+        return MappedNameTable(*[np.load(f'{path}/{prefix}_{name}.npy', mmap_mode='r', allow_pickle=False) for name in MappedNameTable.ARRAY_NAMES])
+
+class MappedNameIndex:
+    def __init__(self, names: MappedNameTable, keys: MappedNameTable, lineage: Optional[str] = None) -> None:
+        self.names = names
+        self.keys = keys
+        self.lineage = lineage
+
+    @staticmethod
+    def from_name_index(name_index: NameIndex) -> MappedNameIndex:
+        return MappedNameIndex(MappedNameTable.from_dict(name_index.names), MappedNameTable.from_dict(name_index.keys), name_index.lineage)
+
+    @cached_property
+    def players(self) -> list[str]:
+        numbers = np.unique(np.concatenate([self.names.players, self.keys.players]))
+        return [f'player_{number}' for number in numbers.tolist()]
+
+    def resolve(self, names: Iterable[str]) -> list[Optional[str]]:
+        names = list(names)
+        unique_names = [name for name in dict.fromkeys(names) if isinstance(name, str)]
+        resolved = dict(zip(unique_names, self.names.get(unique_names)))
+        missing = [name for name, player in resolved.items() if player is None]
+        resolved.update(zip(missing, self.keys.get([get_name_key(name) for name in missing])))
+        return [f'player_{resolved[name]}' if resolved.get(name) is not None else None for name in names]
+
+    def save(self, path: str) -> None:
+        path_tmp = f'{path}.{os.getpid()}.tmp'
+        shutil.rmtree(path_tmp, ignore_errors=True)
+        os.makedirs(path_tmp)
+        self.names.save(path_tmp, 'names')
+        self.keys.save(path_tmp, 'keys')
+        with open(f'{path_tmp}/lineage.json', 'w', encoding='utf-8') as f:
+            json.dump(self.lineage, f)
+        try:
+            os.rename(path_tmp, path)
+        except OSError:
+            shutil.rmtree(path_tmp, ignore_errors=True)
+
+    @staticmethod
+    def load(path: str) -> MappedNameIndex:
+        with open(f'{path}/lineage.json', 'r', encoding='utf-8') as f:
+            lineage = json.load(f)
+        return MappedNameIndex(MappedNameTable.load(path, 'names'), MappedNameTable.load(path, 'keys'), lineage)
+
+def get_match_key(name: str) -> str:
+    return get_min_rotation(''.join(get_clean_name(name).split()))
+
+def merge_similar_players(mapping: dict[str, str], threshold: float = FUZZY_MATCH_THRESHOLD, n_jobs: Optional[int] = None) -> dict[str, str]:
+    numbers = np.array([int(player.rsplit('_', 1)[1]) for player in mapping.values()], dtype=np.int64)
+    labels = find_duplicates([get_match_key(name) for name in mapping], threshold, n_jobs)
+    first_numbers = pd.Series(numbers).groupby(labels).transform('first').to_numpy()
+    union_find = UnionFind(int(numbers.max(initial=-1)) + 1)
+    union_find.union_pairs(zip(numbers.tolist(), first_numbers.tolist()))
+    _, merged = np.unique(union_find.labels[numbers], return_inverse=True)
+    return {name: f'player_{number}' for name, number in zip(mapping, merged.tolist())}
+
+def build_name_index(names: list[str], fuzzy: bool = False, threshold: float = FUZZY_MATCH_THRESHOLD) -> NameIndex:
+    name_mapping = create_name_mapping(names)
+    df_map = map_name_to_players(list(dict.fromkeys(names)), name_mapping).dropna().drop_duplicates('orig_name', keep='last')
+    exact = df_map.set_index('orig_name')['mapped'].to_dict()
+    if fuzzy:
+        exact = merge_similar_players(exact, threshold)
+    keys = {get_name_key(name): player for name, player in exact.items()}
+    return NameIndex(exact, keys, uuid.uuid4().hex)
+
+def _prune_name_indexes(key: str) -> None:
+    for entry in os.listdir(NAME_INDEX_MAPPED_DIR):
+        if entry != key and not entry.endswith('.tmp'):
+            shutil.rmtree(f'{NAME_INDEX_MAPPED_DIR}/{entry}', ignore_errors=True)
+
+@lru_cache(maxsize=1)
+def _load_name_index(path: str, mtime_ns: int, size: int) -> MappedNameIndex:
+    key = hashlib.blake2b(json.dumps([path, mtime_ns, size]).encode(), digest_size=16).hexdigest()
+    mapped_path = f'{NAME_INDEX_MAPPED_DIR}/{key}'
+    if not os.path.isdir(mapped_path):
+        os.makedirs(NAME_INDEX_MAPPED_DIR, exist_ok=True)
+        MappedNameIndex.from_name_index(NameIndex.load(path)).save(mapped_path)
+        _prune_name_indexes(key)
+    return MappedNameIndex.load(mapped_path)
+
+def get_name_index() -> MappedNameIndex:
+    stat = os.stat(NAME_INDEX_PATH)
+    return _load_name_index(NAME_INDEX_PATH, stat.st_mtime_ns, stat.st_size)
+
+def extend_name_index(names: Iterable[str], path: str = NAME_INDEX_PATH) -> list[str]:
+    name_index = NameIndex.load(path)
+    new_players = name_index.extend(names)
+    if new_players:
+        name_index.save(path)
+    return new_players
\ No newline at end of file
@@ -0,0 +1,15 @@
+from tqdm import tqdm
+from typing import Callable, Optional
+
+_callback: Optional[Callable[[str, int, Optional[int]], None]] = None
+
+def set_progress_callback(callback: Optional[Callable[[str, int, Optional[int]], None]]) -> None:
+    global _callback
+    _callback = callback
+
+class ProgressBar(tqdm):
+    def __iter__(self):
+        for n, item in enumerate(super().__iter__(), 1):
+            yield item
+            if _callback is not None:
+                _callback(self.desc, n, self.total)